@@ -4,7 +4,9 @@ from flask import Flask, redirect, request, jsonify
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required
 from flasgger import Swagger
 import json
+import os
 from site_embrapa import SiteEmbrapa
+from site_embrapa.site_embrapa import URL_SITE_EMBRAPA
 from modelo_dados.processamento import EnumTipoUva_proc
 from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
 
@@ -81,7 +83,21 @@ Swagger(app, config=swagger_config, template=swagger_template)
 
 # Instacia da classe que realiza toda a busca e controle das informações
 # classe definida no pacote fiap_lib-grupo56
-siteEmbrapa = SiteEmbrapa()
+# Pasta opcional do cache em disco das páginas obtidas do site da Embrapa.  Com ela, as páginas já obtidas são recarregadas
+# no início da aplicação, sem acessar o site, e revalidadas com GETs condicionais nas consultas seguintes.
+PASTA_CACHE_HTML = os.environ.get("VITIBRASIL_CACHE_HTML")
+# Url base opcional das páginas do site (p.ex. servidor local com páginas gravadas, para testes e benchmarks)
+URL_SITE = os.environ.get("VITIBRASIL_URL_SITE", URL_SITE_EMBRAPA)
+# Banco SQLite opcional em que os dados obtidos do site são persistidos: sobrevivem a reinícios e são compartilhados pelos
+# workers da API na mesma máquina
+CAMINHO_SQLITE = os.environ.get("VITIBRASIL_SQLITE")
+# Limite opcional (em MB) da memória ocupada pelos dados obtidos do site: acima dele, os dados usados há mais tempo são
+# descartados da memória (e obtidos novamente, do banco SQLite ou do site, se voltarem a ser consultados)
+LIMITE_MEMORIA_MB = os.environ.get("VITIBRASIL_LIMITE_MEMORIA_MB")
+siteEmbrapa = SiteEmbrapa(pasta_cache_html=PASTA_CACHE_HTML, url_site=URL_SITE, caminho_sqlite=CAMINHO_SQLITE,
+                          limite_memoria=int(float(LIMITE_MEMORIA_MB) * 1024 * 1024) if LIMITE_MEMORIA_MB else None)
+if PASTA_CACHE_HTML:
+    siteEmbrapa.carregaRepositoriosFromCacheHtml()
 
 def json_response_msg_erro(data, status=200):
     """
@@ -168,7 +184,7 @@ def carrega_csv():
         description: Falha de autenticação devido à falta ou invalidez do token JWT.
     """
     try:
-        siteEmbrapa.carregaRepositoriosFromArquivosCSV()
+        siteEmbrapa.carregaRepositoriosFromSnapshot()
         return jsonify({"result": "ok"}), 200
     except Exception as e:
         return json_response_msg_erro({"error": str(e)}, 500)
@@ -195,10 +211,53 @@ def limpa_cache():
     """
     try:
         siteEmbrapa.inicializa_repositorios()
+        if siteEmbrapa.armazenamento is not None:
+            siteEmbrapa.armazenamento.limpar()
         return jsonify({"result": "ok"}), 200
     except Exception as e:
         return json_response_msg_erro({"error": str(e)}, 500)
 
+@app.route('/vitibrasil/metricas', methods=['GET'])
+@jwt_required()
+def metricas():
+    """
+    Métricas do webscraping no site da Embrapa: requisições, falhas (timeouts e erros), latência média e reuso das conexões HTTP.
+    ---
+    tags:
+      - Configuração
+    parameters:
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: Token JWT para autenticação no formato "Bearer <token>"
+    responses:
+      200:
+        description: Métricas do webscraping desde o início da aplicação.
+        examples:
+          application/json: |
+            {
+              "http": {
+                "requisicoes": 12,
+                "timeouts": 0,
+                "erros": 1,
+                "latencia_media_ms": 310.5,
+                "conexoes_abertas": 1,
+                "conexoes_reutilizadas": 10,
+                "taxa_reuso_conexoes": 0.909,
+                "timeout_conexao": 5.0,
+                "timeout_leitura": 30.0,
+                "conexoes_por_host": 10
+              }
+            }
+      401:
+        description: Falha de autenticação devido à falta ou invalidez do token JWT.
+    """
+    try:
+        return jsonify(siteEmbrapa.obterMetricas()), 200
+    except Exception as e:
+        return json_response_msg_erro({"error": str(e)}, 500)
+
 @app.route('/vitibrasil/producao', methods=['GET'])
 @jwt_required()
 def producao():
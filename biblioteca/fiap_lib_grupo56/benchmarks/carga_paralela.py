@@ -0,0 +1,63 @@
+"""
+Compara o tempo de carga dos repositórios a partir dos arquivos .CSV lidos um após o outro e lidos em paralelo
+(carregaRepositoriosFromArquivosCSV com paralelismo de threads ou de processos), para diferentes tamanhos de pool.
+
+Cada medição roda em um processo Python novo.  Mede a leitura dos arquivos (leitor_csv.ler_todas_linhas) e a carga
+completa, que inclui a aplicação das linhas aos repositórios (sempre sequencial).  O ganho com processos depende do
+número de núcleos da máquina, informado no início do relatório; com um único núcleo o paralelismo só acrescenta custo.
+
+Uso (na pasta da biblioteca, a que contém o setup.py):
+    python benchmarks/carga_paralela.py [repeticoes]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+PASTA_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+MEDICAO = """
+import time
+from site_embrapa import SiteEmbrapa
+import site_embrapa.leitor_csv as leitor_csv
+site = SiteEmbrapa()
+inicio = time.perf_counter()
+{comando}
+print(time.perf_counter() - inicio)
+"""
+
+WORKERS = [2, 4, os.cpu_count() or 1]
+
+
+def comandos() -> dict:
+    resultado = {
+        "leitura sequencial": "leitor_csv.ler_todas_linhas()",
+        "carga sequencial": "site.carregaRepositoriosFromArquivosCSV()",
+    }
+    for paralelismo in ("threads", "processos"):
+        for workers in sorted(set(WORKERS)):
+            resultado[f"leitura {paralelismo} x{workers}"] = f"leitor_csv.ler_todas_linhas('{paralelismo}', {workers})"
+            resultado[f"carga {paralelismo} x{workers}"] = \
+                f"site.carregaRepositoriosFromArquivosCSV(paralelismo='{paralelismo}', max_workers={workers})"
+    return resultado
+
+
+def medir(comando: str) -> float:
+    saida = subprocess.run([sys.executable, "-c", MEDICAO.format(comando=comando)], cwd=PASTA_SRC,
+                           capture_output=True, text=True, check=True).stdout
+    return float(saida)
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{os.cpu_count()} núcleos; {repeticoes} processos novos por medição (mediana / mínimo / ganho sobre o sequencial)")
+    medianas = {}
+    for nome, comando in comandos().items():
+        tempos = [medir(comando) for _ in range(repeticoes)]
+        medianas[nome] = statistics.median(tempos)
+        base = medianas[f"{nome.split()[0]} sequencial"]
+        print(f"    {nome:<24}: {medianas[nome] * 1000:8.1f} ms / {min(tempos) * 1000:8.1f} ms / {base / medianas[nome]:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
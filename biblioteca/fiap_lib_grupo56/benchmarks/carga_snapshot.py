@@ -0,0 +1,55 @@
+"""
+Compara o tempo de carga "a frio" dos repositórios a partir dos arquivos .CSV (carregaRepositoriosFromArquivosCSV)
+e a partir do snapshot binário (carregaRepositoriosFromSnapshot).
+
+Cada medição roda em um processo Python novo, como em uma instância recém-criada no Vercel.  Também mede isoladamente
+a leitura dos dados (parse dos .CSV x descompactação do snapshot), sem a montagem dos repositórios.
+
+Uso (na pasta da biblioteca, a que contém o setup.py):
+    python benchmarks/carga_snapshot.py [repeticoes]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+PASTA_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+MEDICAO = """
+import time
+from site_embrapa import SiteEmbrapa
+import site_embrapa.snapshot as snapshot
+site = SiteEmbrapa()
+inicio = time.perf_counter()
+{comando}
+print(time.perf_counter() - inicio)
+"""
+
+COMANDOS = {
+    "csv: parse dos arquivos": "snapshot.gerar_conteudo()",
+    "snapshot: leitura do arquivo": "snapshot.ler_snapshot()",
+    "csv: carga completa": "site.carregaRepositoriosFromArquivosCSV()",
+    "snapshot: carga completa": "site.carregaRepositoriosFromSnapshot()",
+}
+
+
+def medir(comando: str) -> float:
+    saida = subprocess.run([sys.executable, "-c", MEDICAO.format(comando=comando)], cwd=PASTA_SRC,
+                           capture_output=True, text=True, check=True).stdout
+    return float(saida)
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{repeticoes} processos novos por medição (mediana / mínimo)")
+    medianas = {}
+    for nome, comando in COMANDOS.items():
+        tempos = [medir(comando) for _ in range(repeticoes)]
+        medianas[nome] = statistics.median(tempos)
+        print(f"    {nome:<30}: {medianas[nome] * 1000:8.1f} ms / {min(tempos) * 1000:8.1f} ms")
+    print(f"leitura: snapshot {medianas['csv: parse dos arquivos'] / medianas['snapshot: leitura do arquivo']:.1f}x mais rápido")
+    print(f"carga completa: snapshot {medianas['csv: carga completa'] / medianas['snapshot: carga completa']:.1f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()
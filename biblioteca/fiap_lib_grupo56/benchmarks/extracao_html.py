@@ -0,0 +1,79 @@
+"""
+Compara o tempo de extração das linhas da tabela de dados das páginas do site da Embrapa pelos extratores de
+site_embrapa.extrator_html e pelo caminho antigo (BeautifulSoup do documento inteiro + select + find_all("td")).
+
+As páginas são lidas de uma pasta com páginas salvas do site (*.html, p.ex. um corpus de site_local.py), se informada.
+Sem pasta, são geradas páginas sintéticas a partir dos arquivos .CSV (ver site_embrapa.paginas_sinteticas), com a tabela de
+dados no mesmo formato do site (tb_item / tb_subitem, números com separador de milhar) e um cabeçalho e menu de tamanho
+semelhante ao das páginas reais.  Também confere se todos os extratores produzem exatamente as mesmas linhas que o caminho antigo.
+
+Uso (na pasta da biblioteca, a que contém o setup.py):
+    python benchmarks/extracao_html.py [pasta_com_paginas_html] [repeticoes]
+"""
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bs4 import BeautifulSoup
+from site_embrapa import extrator_html
+from site_embrapa.opcoes import PAGINAS_SITE
+from site_embrapa.paginas_sinteticas import pagina_sintetica
+
+ANOS_SINTETICOS = (1975, 1990, 2005, 2020)
+
+def carregar_paginas(pasta: str = None) -> list:
+    if pasta:
+        paginas = []
+        for caminho in sorted(glob.glob(os.path.join(pasta, "*.html"))):
+            with open(caminho, mode="rb") as file:
+                paginas.append(file.read())
+        return paginas
+    return [pagina_sintetica(opcao, subopcao, ano) for ano in ANOS_SINTETICOS for opcao, subopcao in PAGINAS_SITE]
+
+def extrair_linhas_documento_inteiro(conteudo: bytes) -> list:
+    """
+    Caminho antigo do webscraping: árvore do documento inteiro, select da tabela e find_all das células de cada linha.
+    """
+    linhas = []
+    for tr in BeautifulSoup(conteudo, "html.parser").select("table.tb_base.tb_dados tbody tr"):
+        celulas = tr.find_all("td")
+        classe = " ".join(celulas[0].get("class", [])) if celulas else ""
+        linhas.append((classe, *(celula.text.strip() for celula in celulas)))
+    return linhas
+
+def medir(extrator, paginas: list, repeticoes: int) -> float:
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for pagina in paginas:
+            extrator(pagina)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor
+
+def main():
+    pasta = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].isdigit() else None
+    repeticoes = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 3
+    paginas = carregar_paginas(pasta)
+    if not paginas:
+        print("Nenhuma página encontrada.")
+        return
+    tamanho_medio = sum(len(pagina) for pagina in paginas) / len(paginas) / 1024
+    print(f"{len(paginas)} páginas ({'salvas em ' + pasta if pasta else 'sintéticas'}, {tamanho_medio:.1f} KiB em média); "
+          f"melhor de {repeticoes} execuções (ms por página / ganho sobre o documento inteiro / linhas iguais)")
+    referencia = [extrair_linhas_documento_inteiro(pagina) for pagina in paginas]
+    extratores = {"bs4 documento inteiro": extrair_linhas_documento_inteiro}
+    extratores.update(extrator_html.EXTRATORES)
+    tempo_referencia = None
+    for nome, extrator in extratores.items():
+        tempo = medir(extrator, paginas, repeticoes)
+        tempo_referencia = tempo_referencia or tempo
+        iguais = all(extrator(pagina) == linhas for pagina, linhas in zip(paginas, referencia))
+        print(f"    {nome:<22}: {tempo / len(paginas) * 1000:7.2f} ms / {tempo_referencia / tempo:5.1f}x / {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Mede o consumo de memória dos repositórios após uma carga completa dos arquivos .CSV (carregaRepositoriosFromArquivosCSV).
+
+Uso (na pasta da biblioteca, a que contém o setup.py):
+    python benchmarks/memoria_registros.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from site_embrapa import SiteEmbrapa
+from site_embrapa.gerenciador_cache import BYTES_POR_REGISTRO
+
+
+def contar_registros(site: SiteEmbrapa) -> int:
+    return (len(site.repositorio_produtividades.listar_produtividades())
+            + len(site.repositorio_processamentos.listar_processamentos())
+            + len(site.repositorio_comercializacoes.listar_comercializacoes())
+            + len(site.repositorio_importacoes.listar_importacoes())
+            + len(site.repositorio_exportacoes.listar_exportacoes()))
+
+
+def tamanho_instancia(obj) -> int:
+    tamanho = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        tamanho += sys.getsizeof(obj.__dict__)
+    return tamanho
+
+
+def medir_carga_completa():
+    """
+    Carrega os arquivos .CSV em um SiteEmbrapa novo, medindo com tracemalloc.  Retorna (site, bytes alocados, segundos).
+    """
+    site = SiteEmbrapa()
+    gc.collect()
+    tracemalloc.start()
+    inicio_memoria = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    site.carregaRepositoriosFromArquivosCSV()
+    duracao = time.perf_counter() - inicio
+    gc.collect()
+    total_bytes = tracemalloc.get_traced_memory()[0] - inicio_memoria
+    tracemalloc.stop()
+    return site, total_bytes, duracao
+
+
+def main():
+    site, total_bytes, duracao = medir_carga_completa()
+    registros = contar_registros(site)
+    bytes_por_registro = total_bytes / registros
+    print(f"registros anuais carregados : {registros}")
+    print(f"memória total dos repositórios: {total_bytes / 1024 / 1024:.2f} MiB")
+    print(f"bytes por registro           : {bytes_por_registro:.1f} "
+          f"(gerenciador_cache.BYTES_POR_REGISTRO: {BYTES_POR_REGISTRO}, {bytes_por_registro / BYTES_POR_REGISTRO - 1:+.1%})")
+    print(f"tempo de carga (tracemalloc) : {duracao:.2f} s")
+    print("tamanho de uma instância (objeto + __dict__, quando houver):")
+    exemplos = {
+        "ProdutividadeAnual": site.repositorio_produtividades.listar_produtividades()[0],
+        "ProcessamentoAnual": site.repositorio_processamentos.listar_processamentos()[0],
+        "ComercializacaoAnual": site.repositorio_comercializacoes.listar_comercializacoes()[0],
+        "ImportacaoAnual": site.repositorio_importacoes.listar_importacoes()[0],
+        "ExportacaoAnual": site.repositorio_exportacoes.listar_exportacoes()[0],
+        "Produto_prod": site.repositorio_produtos_prod.listar_produtos()[0],
+        "Cultivar_proc": site.repositorio_cultivares_proc.listar_cultivares()[0],
+        "Pais": site.repositorio_paises.listar_paises()[0],
+    }
+    for nome, obj in exemplos.items():
+        print(f"    {nome:<22}: {tamanho_instancia(obj)} bytes")
+
+
+if __name__ == "__main__":
+    main()
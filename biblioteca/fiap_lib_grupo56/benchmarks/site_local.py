@@ -0,0 +1,193 @@
+"""
+Substituto local do site da Embrapa, para testes e benchmarks do webscraping sem acesso à rede.
+
+O corpus de páginas é uma pasta no formato do cache de páginas em disco (site_embrapa.cache_html): um .html e um .json por
+página (opcao, subopcao, ano).  Ele pode ser:
+    - gravado do site real, pelo aquecimento com cache de páginas:
+          python -m site_embrapa.aquecimento --cache-html pasta_corpus
+    - gerado a partir dos arquivos .CSV da biblioteca (páginas sintéticas, ver site_embrapa.paginas_sinteticas):
+          python benchmarks/site_local.py gerar pasta_corpus [--ano-inicial 1970] [--ano-final 2023]
+
+O ServidorSiteLocal responde às mesmas urls do site (index.php?ano=...&opcao=...&subopcao=...) com as páginas do corpus,
+com latência, taxa de erros (503) e limite de requisições por segundo (429) configuráveis, e responde 304 aos GETs
+condicionais (ETag).  Para usá-lo, basta apontar o webscraping para a sua url:
+    SiteEmbrapa(url_site=servidor.url_base)
+
+Uso como servidor (na pasta da biblioteca, a que contém o setup.py):
+    python benchmarks/site_local.py servir pasta_corpus [--porta 8765] [--latencia 0.2] [--erros 0.1] [--limite 5]
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from site_embrapa.cache_html import CacheHtml
+from site_embrapa.opcoes import PAGINAS_SITE, ANO_INICIAL_SITE, ANO_FINAL_SITE
+from site_embrapa.paginas_sinteticas import pagina_sintetica
+
+def gerar_corpus(pasta: str, ano_inicial: int = ANO_INICIAL_SITE, ano_final: int = ANO_FINAL_SITE) -> int:
+    """
+    Grava na pasta as páginas sintéticas de todas as opções e subopções do site dos anos informados.  Retorna a quantidade de páginas.
+    """
+    cache = CacheHtml(pasta)
+    paginas = 0
+    for ano in range(ano_inicial, ano_final + 1):
+        for opcao, subopcao in PAGINAS_SITE:
+            conteudo = pagina_sintetica(opcao, subopcao, ano)
+            cache.gravar(opcao, subopcao, ano, conteudo, etag='"' + hashlib.md5(conteudo).hexdigest() + '"')
+            paginas += 1
+    return paginas
+
+class ManipuladorSiteLocal(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como o site real
+    disable_nagle_algorithm = True  # cabeçalhos e corpo em escritas separadas: sem isso, cada resposta espera o ACK atrasado do cliente
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        site = self.server.site_local
+        consulta = parse_qs(urlparse(self.path).query)
+        try:
+            pagina = (consulta["opcao"][0], consulta.get("subopcao", [None])[0], int(consulta["ano"][0]))
+        except (KeyError, ValueError):
+            pagina = None
+        status = site.registrarRequisicao()
+        if status is None and site.latencia:
+            time.sleep(site.latencia)
+        entrada = site.corpus.ler(*pagina) if status is None and pagina else None
+        if status is None and entrada is None:
+            status = 404
+        if status is not None:
+            self.responder(status)
+            return
+        etag = entrada.etag or '"' + hashlib.md5(entrada.conteudo).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            site.contar("nao_modificadas")
+            self.responder(304, etag=etag)
+            return
+        self.responder(200, entrada.conteudo, etag)
+
+    def responder(self, status: int, conteudo: bytes = b"", etag: str = None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(conteudo)
+
+class ServidorSiteLocal:
+    """
+    Servidor HTTP local (thread de segundo plano) que responde com as páginas do corpus.
+
+    Atributos:
+        corpus (CacheHtml): Páginas do corpus.
+        latencia (float): Segundos de espera antes de cada resposta com página.
+        taxa_erros (float): Fração (0 a 1) das requisições respondidas com erro 503.
+        requisicoes_por_segundo (float): Limite de requisições por segundo; as que excederem recebem 429.  None: sem limite.
+        porta (int): Porta TCP do servidor (0: escolhida pelo sistema, disponível após iniciar).
+        contadores (dict): Requisições recebidas, erros, limitadas (429) e não modificadas (304).
+    """
+    def __init__(self, pasta_corpus: str, latencia: float = 0.0, taxa_erros: float = 0.0,
+                 requisicoes_por_segundo: float = None, porta: int = 0, semente: int = 0):
+        self.corpus = CacheHtml(pasta_corpus)
+        self.latencia = latencia
+        self.taxa_erros = taxa_erros
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.porta = porta
+        self.aleatorio = random.Random(semente)
+        self.trava = threading.Lock()
+        self.contadores = {"requisicoes": 0, "erros": 0, "limitadas": 0, "nao_modificadas": 0}
+        self.fichas = requisicoes_por_segundo or 0.0
+        self.atualizado_em = time.monotonic()
+        self.servidor = None
+
+    @property
+    def url_base(self) -> str:
+        return f"http://127.0.0.1:{self.porta}/index.php"
+
+    def contar(self, contador: str):
+        with self.trava:
+            self.contadores[contador] += 1
+
+    def registrarRequisicao(self) -> int:
+        """
+        Conta a requisição e decide se ela será recusada: 429 se o limite de requisições por segundo foi excedido, 503 pela
+        taxa de erros; None se deve ser atendida.
+        """
+        with self.trava:
+            self.contadores["requisicoes"] += 1
+            if self.requisicoes_por_segundo:
+                agora = time.monotonic()
+                self.fichas = min(self.requisicoes_por_segundo, self.fichas + (agora - self.atualizado_em) * self.requisicoes_por_segundo)
+                self.atualizado_em = agora
+                if self.fichas < 1:
+                    self.contadores["limitadas"] += 1
+                    return 429
+                self.fichas -= 1
+            if self.taxa_erros and self.aleatorio.random() < self.taxa_erros:
+                self.contadores["erros"] += 1
+                return 503
+        return None
+
+    def iniciar(self) -> "ServidorSiteLocal":
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", self.porta), ManipuladorSiteLocal)
+        self.servidor.daemon_threads = True
+        self.servidor.site_local = self
+        self.porta = self.servidor.server_address[1]
+        threading.Thread(target=self.servidor.serve_forever, name="site-local", daemon=True).start()
+        return self
+
+    def parar(self):
+        if self.servidor is not None:
+            self.servidor.shutdown()
+            self.servidor.server_close()
+            self.servidor = None
+
+    def __enter__(self) -> "ServidorSiteLocal":
+        return self.iniciar()
+
+    def __exit__(self, *excecao):
+        self.parar()
+
+def main(argumentos: list = None):
+    parser = argparse.ArgumentParser(prog="python benchmarks/site_local.py", description="Substituto local do site da Embrapa.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    gerar = comandos.add_parser("gerar", help="gera o corpus de páginas sintéticas a partir dos arquivos .CSV")
+    gerar.add_argument("pasta")
+    gerar.add_argument("--ano-inicial", type=int, default=ANO_INICIAL_SITE)
+    gerar.add_argument("--ano-final", type=int, default=ANO_FINAL_SITE)
+    servir = comandos.add_parser("servir", help="responde com as páginas do corpus")
+    servir.add_argument("pasta")
+    servir.add_argument("--porta", type=int, default=8765)
+    servir.add_argument("--latencia", type=float, default=0.0, help="segundos de espera por resposta")
+    servir.add_argument("--erros", type=float, default=0.0, help="fração das requisições respondidas com 503")
+    servir.add_argument("--limite", type=float, default=None, help="requisições por segundo (excedentes recebem 429)")
+    args = parser.parse_args(argumentos)
+
+    if args.comando == "gerar":
+        inicio = time.perf_counter()
+        paginas = gerar_corpus(args.pasta, args.ano_inicial, args.ano_final)
+        print(f"{paginas} páginas gravadas em {args.pasta} ({time.perf_counter() - inicio:.1f} s)")
+        return
+    servidor = ServidorSiteLocal(args.pasta, args.latencia, args.erros, args.limite, args.porta).iniciar()
+    print(f"Servindo {len(servidor.corpus.listar())} páginas em {servidor.url_base} (Ctrl+C para encerrar)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        servidor.parar()
+
+
+if __name__ == "__main__":
+    main()
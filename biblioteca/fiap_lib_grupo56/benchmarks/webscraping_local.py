@@ -0,0 +1,77 @@
+"""
+Mede a vazão do webscraping e o comportamento do fallback para os arquivos .CSV contra o substituto local do site da
+Embrapa (site_local.ServidorSiteLocal), sem acesso à rede e de forma reprodutível.
+
+Para cada cenário (latência do servidor, taxa de erros 503, limite de requisições por segundo do servidor e do cliente,
+downloads simultâneos) um SiteEmbrapa novo carrega todas as páginas dos anos do corpus pelo SiteEmbrapaAsync e são
+informados o tempo, as páginas por segundo, as respostas de erro do servidor, quantas páginas vieram do site e quantas
+do fallback e o estado final do disjuntor.
+
+O corpus é gerado a partir dos arquivos .CSV em uma pasta temporária, se não for informada uma pasta de corpus (gravada do
+site real ou gerada por site_local.py).
+
+Uso (na pasta da biblioteca, a que contém o setup.py):
+    python benchmarks/webscraping_local.py [pasta_corpus] [quantidade_anos]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from modelo_dados.origemDados import EnumOrigemDados
+from site_embrapa import SiteEmbrapa, SiteEmbrapaAsync
+from site_embrapa.limitador import LimitadorRequisicoes
+from site_embrapa.opcoes import PAGINAS_SITE
+from site_local import ServidorSiteLocal, gerar_corpus
+
+ANO_FINAL = 2023
+SEM_LIMITE = 10 ** 9
+
+# nome: (latência do servidor, taxa de erros, limite do servidor por segundo, downloads simultâneos, limite do cliente por segundo)
+CENARIOS = {
+    "sem latência, serial": (0.0, 0.0, None, 1, None),
+    "sem latência, 8 simultâneos": (0.0, 0.0, None, 8, None),
+    "latência 50 ms, serial": (0.05, 0.0, None, 1, None),
+    "latência 50 ms, 8 simultâneos": (0.05, 0.0, None, 8, None),
+    "20% de erros 503": (0.0, 0.2, None, 8, None),
+    "servidor 20/s, cliente sem limite": (0.0, 0.0, 20, 8, None),
+    "servidor 20/s, cliente 15/s": (0.0, 0.0, 20, 8, 15),
+}
+
+def medir(pasta_corpus: str, paginas: list, latencia: float, taxa_erros: float, limite_servidor: float,
+          concorrencia: int, limite_cliente: float) -> dict:
+    with ServidorSiteLocal(pasta_corpus, latencia, taxa_erros, limite_servidor) as servidor:
+        site = SiteEmbrapa(tempo_validade=None, url_site=servidor.url_base)
+        taxa = limite_cliente or SEM_LIMITE
+        site.webscraping.limitador = LimitadorRequisicoes(taxa, int(taxa))
+        inicio = time.perf_counter()
+        registros = asyncio.run(SiteEmbrapaAsync(site, concorrencia).carregaPaginas(paginas))
+        decorrido = time.perf_counter() - inicio
+        do_site = sum(1 for lista in registros.values() if lista and lista[0].origem == EnumOrigemDados.WEBSCRAPING)
+        return {"tempo": decorrido, "paginas_por_segundo": len(paginas) / decorrido, "do_site": do_site,
+                "do_csv": len(paginas) - do_site, "contadores": dict(servidor.contadores),
+                "disjuntor": site.webscraping.disjuntor.estado}
+
+def main():
+    pasta = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].isdigit() else None
+    quantidade_anos = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 2
+    anos = range(ANO_FINAL - quantidade_anos + 1, ANO_FINAL + 1)
+    paginas = [(opcao, subopcao, ano) for ano in anos for opcao, subopcao in PAGINAS_SITE]
+    with tempfile.TemporaryDirectory() as temporaria:
+        if pasta is None:
+            pasta = temporaria
+            gerar_corpus(pasta, anos.start, anos.stop - 1)
+        print(f"{len(paginas)} páginas ({anos.start} a {anos.stop - 1}); corpus em {pasta}")
+        print(f"    {'cenário':<34} {'tempo':>8} {'pág/s':>7} {'503':>4} {'429':>4} {'site':>5} {'.CSV':>5}  disjuntor")
+        for nome, parametros in CENARIOS.items():
+            resultado = medir(pasta, paginas, *parametros)
+            contadores = resultado["contadores"]
+            print(f"    {nome:<34} {resultado['tempo']:7.2f}s {resultado['paginas_por_segundo']:7.1f} {contadores['erros']:4} "
+                  f"{contadores['limitadas']:4} {resultado['do_site']:5} {resultado['do_csv']:5}  {resultado['disjuntor']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Gera o snapshot binário dos arquivos .CSV (src/site_embrapa/arquivos_csv/repositorios.snapshot).
+
+Deve ser executado sempre que algum .CSV for alterado, antes de gerar os pacotes (ver anotacoes.txt).
+
+Uso (na pasta da biblioteca, a que contém o setup.py):
+    python gerar_snapshot.py [caminho_destino]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from site_embrapa import snapshot
+
+
+def main():
+    destino = snapshot.gravar_snapshot(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"snapshot gravado em {destino} ({os.path.getsize(destino)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
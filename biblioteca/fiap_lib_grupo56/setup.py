@@ -2,7 +2,7 @@ from setuptools import setup, find_packages, find_namespace_packages
 
 setup(
    name='fiap_lib_grupo56',
-   version='0.3.28',
+   version='0.3.29',
    package_dir={"" : "src"},
    packages=find_namespace_packages(
         where='src',
@@ -1,2 +1,3 @@
 from .producao import RepositorioCategorias_prod, RepositorioProdutividadesAnuais, RepositorioProdutos_prod, Categoria_prod, ProdutividadeAnual, Produto_prod
-from .processamento import RepositorioCategorias_proc, RepositorioCultivar_proc, RepositorioProcessamentosAnuais, Categoria_proc, ProcessamentoAnual, Cultivar_proc
\ No newline at end of file
+from .processamento import RepositorioCategorias_proc, RepositorioCultivar_proc, RepositorioProcessamentosAnuais, Categoria_proc, ProcessamentoAnual, Cultivar_proc
+from .origemDados import EnumOrigemDados
\ No newline at end of file
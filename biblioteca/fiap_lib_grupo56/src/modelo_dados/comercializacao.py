@@ -1,5 +1,9 @@
 import re
-from typing import List
+import sys
+from typing import Dict, Iterable, List, Set
+from .indices import indexar, desindexar, primeiro_indexado
+from .seriesAnuais import Celula, TabelaSeriesAnuais, TotaisAnuais, internar_ano
+from .origemDados import EnumOrigemDados
 
 class Categoria_com:
     """
@@ -7,18 +11,19 @@ class Categoria_com:
     
     Atributos:
         nome (str): Nome da categoria.
-        produtos (list[Produto]): Lista de produtos que pertencem a esta categoria.
+        produtos (dict[Produto, None]): Conjunto ordenado (dict) dos produtos que pertencem a esta categoria.
     """
+    __slots__ = ('nome', 'produtos')
+
     def __init__(self, nome: str):
-        self.nome = nome
-        self.produtos = []
+        self.nome = sys.intern(nome)
+        self.produtos = {}
 
     def adicionar_produto(self, produto: 'Produto_com'):
         """
         Associa um produto a esta categoria.
         """
-        if produto not in self.produtos:
-            self.produtos.append(produto)
+        self.produtos[produto] = None
 
 
 class Produto_com:
@@ -28,12 +33,12 @@ class Produto_com:
     Atributos:
         nome (str): Nome do produto.
         categoria (Categoria): Referência à categoria à qual o produto pertence.
-        comercializacoes (list[ComercializacaoAnual]): Registros de comercializações anuais deste produto.
     """
+    __slots__ = ('nome', 'categoria')
+
     def __init__(self, nome: str, categoria: Categoria_com = None):
-        self.nome = nome
+        self.nome = sys.intern(nome)
         self.categoria = None
-        self.comercializacoes = []
 
         if categoria:
             self.set_categoria(categoria)
@@ -45,13 +50,6 @@ class Produto_com:
         self.categoria = categoria
         categoria.adicionar_produto(self)
 
-    def adicionar_comercializacao(self, comercializacao_anual: 'ComercializacaoAnual'):
-        """
-        Associa um objeto ProdutividadeAnual a este produto.
-        """
-        if comercializacao_anual not in self.comercializacoes:
-            self.comercializacoes.append(comercializacao_anual)
-
 
 class ComercializacaoAnual:
     """
@@ -61,15 +59,24 @@ class ComercializacaoAnual:
         ano (int): Ano de referência.
         quantidade (int): Quantidade produzida.
         produto (Produto): Referência ao produto associado.
+        origem (EnumOrigemDados): Origem do registro (webscraping ou arquivo .CSV), se informada.
+        carregado_em (float): Momento da carga do registro (time.time()), se informado.
     """
-    def __init__(self, ano: int, quantidade: int, produto: Produto_com = None):
-        self.ano = ano
-        apenasNumericos = re.sub(r'\D', '', quantidade) # retira caracteres não numéricos
-        if apenasNumericos == "":
-            self.quantidade = 0
+    __slots__ = ('ano', 'quantidade', 'produto', 'origem', 'carregado_em')
+
+    def __init__(self, ano: int, quantidade: int, produto: Produto_com = None, origem: EnumOrigemDados = None, carregado_em: float = None):
+        self.ano = internar_ano(ano)
+        if isinstance(quantidade, int):
+            self.quantidade = quantidade # já convertido (p.ex. lido do snapshot)
         else:
-            self.quantidade = int(apenasNumericos)
+            apenasNumericos = re.sub(r'\D', '', quantidade) # retira caracteres não numéricos
+            if apenasNumericos == "":
+                self.quantidade = 0
+            else:
+                self.quantidade = int(apenasNumericos)
         self.produto = None
+        self.origem = origem
+        self.carregado_em = carregado_em
         if produto:
             self.set_produto(produto)
 
@@ -78,7 +85,6 @@ class ComercializacaoAnual:
         Associa esta comercializacao anual a um produto específico.
         """
         self.produto = produto
-        produto.adicionar_comercializacao(self)
 
 
 class RepositorioProdutos_com:
@@ -86,39 +92,54 @@ class RepositorioProdutos_com:
     Comercialização - Armazena e gerencia a lista de produtos criados no sistema.
     
     Atributos:
-        produtos (list[Produto]): Lista de todos os produtos cadastrados.
+        produtos (dict[Produto, None]): Conjunto ordenado (dict) de todos os produtos cadastrados.
+        indice_nome_categoria (dict): Produtos indexados por (nome, categoria).
     """
     def __init__(self):
-        self.produtos = []
+        self.produtos = {}
+        self.indice_nome_categoria = {}
 
     def adicionar_produto(self, produto: Produto_com):
         """
         Adiciona um produto ao repositório, caso ainda não exista.
         """
-        if produto not in self.produtos:
-            self.produtos.append(produto)
+        if produto not in self.indice_nome_categoria.get((produto.nome, produto.categoria), ()):
+            self.produtos[produto] = None
+            indexar(self.indice_nome_categoria, (produto.nome, produto.categoria), produto)
+
+    def adicionar_lote(self, produtos: Iterable[Produto_com]) -> List[Produto_com]:
+        """
+        Adiciona um lote de produtos ao repositório, descartando os que tenham (nome, categoria) já cadastrados.  Retorna os produtos aceitos.
+        """
+        aceitos = []
+        for produto in produtos:
+            chave = (produto.nome, produto.categoria)
+            if chave in self.indice_nome_categoria:
+                continue
+            self.indice_nome_categoria[chave] = [produto]
+            aceitos.append(produto)
+        self.produtos.update(dict.fromkeys(aceitos))
+        return aceitos
 
     def remover_produto(self, produto: Produto_com):
         """
         Remove um produto do repositório, caso exista.
         """
         if produto in self.produtos:
-            self.produtos.remove(produto)
+            del self.produtos[produto]
+            desindexar(self.indice_nome_categoria, (produto.nome, produto.categoria), produto)
 
     def buscar_produto_por_nome_categoria(self, nome: str, categoria: Categoria_com) -> Produto_com:
         """
         Retorna o primeiro produto que corresponda aos parametros informados, ou None se não encontrado.
         """
-        for p in self.produtos:
-            if (p.nome == nome) and (p.categoria == categoria):
-                return p
-        return None
+        return primeiro_indexado(self.indice_nome_categoria, (nome, categoria))
 
     def listar_produtos(self) -> List[Produto_com]:
         """
         Retorna a lista completa de produtos cadastrados.
         """
-        return self.produtos
+        return list(self.produtos)
 
 
 class RepositorioCategorias_com:
@@ -126,101 +147,160 @@ class RepositorioCategorias_com:
     Comercialização - Armazena e gerencia a lista de categorias de produtos comercializados cadastradas no sistema.
     
     Atributos:
-        categorias (list[Categoria_prod]): Lista de todas as categorias cadastradas.
+        categorias (dict[Categoria_prod, None]): Conjunto ordenado (dict) de todas as categorias cadastradas.
+        indice_nome (dict): Categorias indexadas por nome.
     """
     def __init__(self):
-        self.categorias = []
+        self.categorias = {}
+        self.indice_nome = {}
 
     def adicionar_categoria(self, categoria: Categoria_com):
         """
         Adiciona uma categoria ao repositório, caso ainda não exista.
         """
-        if categoria not in self.categorias:
-            self.categorias.append(categoria)
+        if categoria not in self.indice_nome.get(categoria.nome, ()):
+            self.categorias[categoria] = None
+            indexar(self.indice_nome, categoria.nome, categoria)
+
+    def adicionar_lote(self, categorias: Iterable[Categoria_com]) -> List[Categoria_com]:
+        """
+        Adiciona um lote de categorias ao repositório, descartando as que tenham nome já cadastrado.  Retorna as categorias aceitas.
+        """
+        aceitas = []
+        for categoria in categorias:
+            if categoria.nome in self.indice_nome:
+                continue
+            self.indice_nome[categoria.nome] = [categoria]
+            aceitas.append(categoria)
+        self.categorias.update(dict.fromkeys(aceitas))
+        return aceitas
 
     def remover_categoria(self, categoria: Categoria_com):
         """
         Remove uma categoria do repositório, caso exista.
         """
         if categoria in self.categorias:
-            self.categorias.remove(categoria)
+            del self.categorias[categoria]
+            desindexar(self.indice_nome, categoria.nome, categoria)
 
     def buscar_categoria_por_nome(self, nome: str) -> Categoria_com:
         """
         Retorna a primeira categoria que corresponda ao nome informado, ou None se não encontrado.
         """
-        for c in self.categorias:
-            if c.nome == nome:
-                return c
-        return None
+        return primeiro_indexado(self.indice_nome, nome)
 
     def listar_categorias(self) -> List[Categoria_com]:
         """
         Retorna a lista completa de categorias cadastradas.
         """
-        return self.categorias
+        return list(self.categorias)
 
 
 class RepositorioComercializacoesAnuais:
     """
-    Comercialização - Armazena e gerencia a lista de registros de comercializacao anual cadastrados no sistema.
+    Comercialização - Armazena e gerencia os registros de comercialização anual cadastrados no sistema.  As quantidades ficam em uma
+    tabela colunar (uma linha por produto e uma coluna por ano); os objetos ComercializacaoAnual são montados a cada consulta.
     
     Atributos:
-        comercializacoes (list[ComercializacaoAnual]): Lista de todos os registros de comercializacao.
+        tabela (TabelaSeriesAnuais): Quantidade, origem e momento da carga de cada (produto, ano).
+        totais (TotaisAnuais): Quantidades totais por categoria do produto.
     """
     def __init__(self):
-        self.comercializacoes = []
+        self.tabela = TabelaSeriesAnuais()
+        self.totais = TotaisAnuais()
+
+    def montar_comercializacao(self, celula: Celula) -> ComercializacaoAnual:
+        produto, ano, (quantidade,), origem, carregado_em = celula
+        return ComercializacaoAnual(ano, quantidade, produto, origem, carregado_em)
 
     def adicionar_comercializacao(self, comercializacao: ComercializacaoAnual):
         """
         Adiciona um registro de comercialização ao repositório, caso ainda não exista.
         """
-        if comercializacao not in self.comercializacoes:
-            self.comercializacoes.append(comercializacao)
+        self.adicionar_lote((comercializacao,))
+
+    def adicionar_lote(self, comercializacoes: Iterable[ComercializacaoAnual]) -> List[ComercializacaoAnual]:
+        """
+        Adiciona um lote de registros de comercialização, descartando os que tenham (produto, ano) já cadastrados.  Retorna os registros aceitos.
+        """
+        aceitos = []
+        for comercializacao in comercializacoes:
+            valores = (comercializacao.quantidade,)
+            if self.tabela.registrar(comercializacao.produto, comercializacao.ano, valores, comercializacao.origem, comercializacao.carregado_em):
+                self.totais.somar(comercializacao.produto.categoria, comercializacao.ano, valores)
+                aceitos.append(comercializacao)
+        return aceitos
 
     def remover_comercializacao(self, comercializacao: ComercializacaoAnual):
         """
-        Remove um registro de produtividade do repositório, caso exista.
+        Remove o registro de comercialização do (produto, ano) informado do repositório, caso exista.
+        """
+        self.remover_lote((comercializacao,))
+
+    def remover_lote(self, comercializacoes: Iterable[ComercializacaoAnual]):
+        """
+        Remove um lote de registros do repositório (p.ex. todos os de uma página do site em um ano), pelo (produto, ano) de cada um, ignorando os não cadastrados.
         """
-        if comercializacao in self.comercializacoes:
-            self.comercializacoes.remove(comercializacao)
+        for comercializacao in comercializacoes:
+            valores = self.tabela.remover(comercializacao.produto, comercializacao.ano)
+            if valores is not None:
+                self.totais.subtrair(comercializacao.produto.categoria, comercializacao.ano, valores)
 
     def buscar_comercializacao(self, produto: Produto_com, ano: int) -> ComercializacaoAnual:
         """
         Retorna a comercializacao para determinado produto e ano, ou None se não encontrado.
         """
-        for p in self.comercializacoes:
-            if p.produto == produto and p.ano == ano:
-                return p
-        return None
+        celula = self.tabela.celula(produto, ano)
+        return self.montar_comercializacao(celula) if celula else None
 
     def buscar_comercializacoesPorAno(self, ano: int) -> List[ComercializacaoAnual]:
         """
         Retorna as comercializações de todos os produtos para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for p in self.comercializacoes:
-            if p.ano == ano:
-                retorno.append(p)
-        return retorno
+        return [self.montar_comercializacao(celula) for celula in self.tabela.celulas_do_ano(ano)]
 
     def buscarComercializacaoTotalDeCategoriaPorAno(self, categoria: Categoria_com, ano: int) -> int:
         """
         Retorna as comercializacoes de todos os produtos da categoria, para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno: int = 0
-        comercializacoesDoAno = self.buscar_comercializacoesPorAno(ano)
-        for p in comercializacoesDoAno:
-            if p.produto.categoria == categoria:
-                retorno = retorno + p.quantidade
-        return retorno
+        return self.totais.total_grupo(categoria, ano)
+
+    def buscarComercializacaoTotalDeCategoriaPorPeriodo(self, categoria: Categoria_com, ano_inicial: int, ano_final: int) -> Dict[int, int]:
+        """
+        Retorna {ano: quantidade total} dos produtos da categoria, para cada ano do período informado.
+        """
+        return self.totais.totais_por_ano(ano_inicial, ano_final, categoria)
 
+    def buscarComercializacaoTotalDeCategoriaPorDecada(self, categoria: Categoria_com, decada: int) -> int:
+        """
+        Retorna a quantidade total comercializada dos produtos da categoria na década informada (p.ex. 1990 para 1990-1999).
+        """
+        return self.totais.total_grupo_decada(categoria, decada)
+
+    def buscarComercializacaoTotalDeCategoria(self, categoria: Categoria_com) -> int:
+        """
+        Retorna a quantidade total comercializada dos produtos da categoria, somando todos os anos carregados.
+        """
+        return self.totais.total_grupo_geral(categoria)
+
+    def buscar_serieComercializacao(self, produto: Produto_com) -> Dict[int, int]:
+        """
+        Retorna a série histórica {ano: quantidade} de um produto, apenas com os anos carregados.
+        """
+        return self.tabela.serie(produto)
+
+
+    def listar_anos(self) -> Set[int]:
+        """
+        Retorna os anos que possuem ao menos uma comercialização cadastrada.
+        """
+        return self.tabela.listar_anos()
 
     def listar_comercializacoes(self) -> List[ComercializacaoAnual]:
         """
-        Retorna a lista completa de produtividades cadastradas.
+        Retorna a lista completa de comercializações cadastradas, por ano.
         """
-        return self.comercializacoes
+        return [self.montar_comercializacao(celula) for celula in self.tabela.celulas()]
 
 
 
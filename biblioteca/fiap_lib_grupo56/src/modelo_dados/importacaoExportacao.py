@@ -1,5 +1,9 @@
 import re
-from typing import List
+import sys
+from typing import Dict, Iterable, List, Set
+from .indices import indexar, desindexar, primeiro_indexado
+from .seriesAnuais import Celula, TabelaSeriesAnuais, TotaisAnuais, internar_ano
+from .origemDados import EnumOrigemDados
 from enum import Enum
 
 class EnumCategoria_im_ex(Enum):
@@ -15,26 +19,11 @@ class Pais:
     
     Atributos:
         nome (str): Nome da categoria.
-        importacoes (list[ImportacaoAnual]): Lista de importações anuais realizadas deste Pais
     """
-    def __init__(self, nome: str):
-        self.nome = nome
-        self.importacoes = []
-        self.exportacoes = []
-
-    def adicionar_importacao(self, importacao: 'ImportacaoAnual'):
-        """
-        Associa/registra um importação a este Pais.
-        """
-        if importacao not in self.importacoes:
-            self.importacoes.append(importacao)
+    __slots__ = ('nome',)
 
-    def adicionar_exportacao(self, exportacao: 'ExportacaoAnual'):
-        """
-        Associa/registra um exportação a este país
-        """
-        if exportacao not in self.exportacoes:
-            self.exportacoes.append(exportacao)
+    def __init__(self, nome: str):
+        self.nome = sys.intern(nome)
 
 
 class ImportacaoAnual:
@@ -47,19 +36,27 @@ class ImportacaoAnual:
         quantidade (int): Quantidade em Kg
         categoria (EnumCategoria_im_ex): Referência à categoria à qual a importação se refere
         pais (Pais): Referência ao Pais de qual foi realizada a importação
+        origem (EnumOrigemDados): Origem do registro (webscraping ou arquivo .CSV), se informada.
+        carregado_em (float): Momento da carga do registro (time.time()), se informado.
         
     """
-    def __init__(self, ano: int, valor: int, quantidade: int, categoria: EnumCategoria_im_ex, pais: Pais = None):
-        self.ano = ano
+    __slots__ = ('ano', 'valor', 'quantidade', 'categoria', 'pais', 'origem', 'carregado_em')
+
+    def __init__(self, ano: int, valor: int, quantidade: int, categoria: EnumCategoria_im_ex, pais: Pais = None, origem: EnumOrigemDados = None, carregado_em: float = None):
+        self.ano = internar_ano(ano)
         self.valor = self.filtra_valor_int(valor)
         self.quantidade = self.filtra_valor_int(quantidade)
-        self.categoria = categoria
-        self.Pais = None
+        self.categoria = EnumCategoria_im_ex(categoria) if categoria is not None else None
+        self.pais = None
+        self.origem = origem
+        self.carregado_em = carregado_em
 
         if pais:
             self.set_pais(pais)
 
     def filtra_valor_int(self, valor: int) -> int:
+        if isinstance(valor, int):
+            return valor # já convertido (p.ex. lido do snapshot)
         apenasNumericos = re.sub(r'\D', '', valor) # retira caracteres não numéricos
         if apenasNumericos == "":
             return  0
@@ -67,10 +64,9 @@ class ImportacaoAnual:
 
     def set_pais(self, pais: Pais):
         """
-        Atribui um pais ao registro de importação anual e registra a importação na lista de importações do pais.
+        Atribui um pais ao registro de importação anual.
         """
         self.pais = pais
-        pais.adicionar_importacao(self)
 
 class ExportacaoAnual:
     """
@@ -82,19 +78,27 @@ class ExportacaoAnual:
         quantidade (int): Quantidade em Kg
         categoria (EnumCategoria_im_ex): Referência à categoria à qual a exportação se refere
         pais (Pais): Referência ao Pais de qual foi realizada a exportação
+        origem (EnumOrigemDados): Origem do registro (webscraping ou arquivo .CSV), se informada.
+        carregado_em (float): Momento da carga do registro (time.time()), se informado.
         
     """
-    def __init__(self, ano: int, valor: int, quantidade: int, categoria: EnumCategoria_im_ex = None, pais: Pais = None):
-        self.ano = ano
+    __slots__ = ('ano', 'valor', 'quantidade', 'categoria', 'pais', 'origem', 'carregado_em')
+
+    def __init__(self, ano: int, valor: int, quantidade: int, categoria: EnumCategoria_im_ex = None, pais: Pais = None, origem: EnumOrigemDados = None, carregado_em: float = None):
+        self.ano = internar_ano(ano)
         self.valor = self.filtra_valor_int(valor)
         self.quantidade = self.filtra_valor_int(quantidade)
-        self.categoria = categoria
-        self.Pais = None
+        self.categoria = EnumCategoria_im_ex(categoria) if categoria is not None else None
+        self.pais = None
+        self.origem = origem
+        self.carregado_em = carregado_em
 
         if pais:
             self.set_pais(pais)
 
     def filtra_valor_int(self, valor: int) -> int:
+        if isinstance(valor, int):
+            return valor # já convertido (p.ex. lido do snapshot)
         apenasNumericos = re.sub(r'\D', '', valor) # retira caracteres não numéricos
         if apenasNumericos == "":
             return  0
@@ -102,187 +106,262 @@ class ExportacaoAnual:
 
     def set_pais(self, pais: Pais):
         """
-        Atribui um pais ao registro de exportação anual e registra a exportação na lista de exportações do pais.
+        Atribui um pais ao registro de exportação anual.
         """
         self.pais = pais
-        pais.adicionar_exportacao(self)
 
 class RepositorioPaises:
     """
     Importação e Exportação - Armazena e gerencia a lista de paises criados no sistema.
     
     Atributos:
-        paises (list[Pais]): Lista de todos os paises cadastrados.
+        paises (dict[Pais, None]): Conjunto ordenado (dict) de todos os paises cadastrados.
+        indice_nome (dict): Paises indexados por nome.
     """
     def __init__(self):
-        self.paises = []
+        self.paises = {}
+        self.indice_nome = {}
 
     def adicionar_pais(self, pais: Pais):
         """
         Adiciona um pais ao repositório, caso ainda não exista.
         """
-        if pais not in self.paises:
-            self.paises.append(pais)
+        if pais not in self.indice_nome.get(pais.nome, ()):
+            self.paises[pais] = None
+            indexar(self.indice_nome, pais.nome, pais)
+
+    def adicionar_lote(self, paises: Iterable[Pais]) -> List[Pais]:
+        """
+        Adiciona um lote de paises ao repositório, descartando os que tenham nome já cadastrado.  Retorna os paises aceitos.
+        """
+        aceitos = []
+        for pais in paises:
+            if pais.nome in self.indice_nome:
+                continue
+            self.indice_nome[pais.nome] = [pais]
+            aceitos.append(pais)
+        self.paises.update(dict.fromkeys(aceitos))
+        return aceitos
 
     def remover_pais(self, pais: Pais):
         """
         Remove um pais do repositório, caso exista.
         """
         if pais in self.paises:
-            self.paises.remove(pais)
+            del self.paises[pais]
+            desindexar(self.indice_nome, pais.nome, pais)
 
     def buscar_pais_por_nome(self, nome: str) -> Pais:
         """
         Retorna o primeiro Pais com o Nome informado, ou NONE se não encontrado.
         """
-        for p in self.paises:
-            if p.nome == nome:
-                return p
-        return None
+        return primeiro_indexado(self.indice_nome, nome)
 
     def listar_paises(self) -> List[Pais]:
         """
         Retorna a lista completa de paises cadastrados.
         """
-        return self.paises
+        return list(self.paises)
 
 class RepositorioImportacoesAnuais:
     """
-    Importação e Exportação - Armazena e gerencia a lista de registros de importação anual cadastrados no sistema.
+    Importação e Exportação - Armazena e gerencia os registros de importação anual cadastrados no sistema.  As quantidades
+    e os valores ficam em tabelas colunares, uma por categoria (uma linha por pais e uma coluna por ano); os objetos
+    ImportacaoAnual são montados a cada consulta.
     
     Atributos:
-        importacoes (list[ImportacaoAnual]): Lista de todos os registros de importacao.
+        tabelas (dict[EnumCategoria_im_ex, TabelaSeriesAnuais]): Quantidade, valor, origem e momento da carga de cada (pais, ano), por categoria.
+        totais (TotaisAnuais): Quantidades e valores totais por categoria.
     """
     def __init__(self):
-        self.importacoes = []
+        self.tabelas = {categoria: TabelaSeriesAnuais(("quantidade", "valor")) for categoria in EnumCategoria_im_ex}
+        self.totais = TotaisAnuais(("quantidade", "valor"))
+
+    def montar_importacao(self, categoria: EnumCategoria_im_ex, celula: Celula) -> ImportacaoAnual:
+        pais, ano, (quantidade, valor), origem, carregado_em = celula
+        return ImportacaoAnual(ano, valor, quantidade, categoria, pais, origem, carregado_em)
 
     def adicionar_importacao(self, importacao: ImportacaoAnual):
         """
-        Adiciona um registro de importacao ao repositório, caso ainda não exista.
+        Adiciona um registro de importação ao repositório, caso ainda não exista.
+        """
+        self.adicionar_lote((importacao,))
+
+    def adicionar_lote(self, importacoes: Iterable[ImportacaoAnual]) -> List[ImportacaoAnual]:
+        """
+        Adiciona um lote de registros de importação, descartando os que tenham (categoria, ano, pais) já cadastrados.  Retorna os registros aceitos.
         """
-        if importacao not in self.importacoes:
-            self.importacoes.append(importacao)
+        aceitos = []
+        for importacao in importacoes:
+            valores = (importacao.quantidade, importacao.valor)
+            if self.tabelas[importacao.categoria].registrar(importacao.pais, importacao.ano, valores, importacao.origem, importacao.carregado_em):
+                self.totais.somar(importacao.categoria, importacao.ano, valores)
+                aceitos.append(importacao)
+        return aceitos
 
     def remover_importacao(self, importacao: ImportacaoAnual):
         """
-        Remove um registro de importacao do repositório, caso exista.
+        Remove o registro de importação da (categoria, ano, pais) informada do repositório, caso exista.
         """
-        if importacao in self.importacoes:
-            self.importacoes.remove(importacao)
+        self.remover_lote((importacao,))
+
+    def remover_lote(self, importacoes: Iterable[ImportacaoAnual]):
+        """
+        Remove um lote de registros do repositório (p.ex. todos os de uma página do site em um ano), pela (categoria, ano, pais) de cada um, ignorando os não cadastrados.
+        """
+        for importacao in importacoes:
+            valores = self.tabelas[importacao.categoria].remover(importacao.pais, importacao.ano)
+            if valores is not None:
+                self.totais.subtrair(importacao.categoria, importacao.ano, valores)
 
     def buscar_importacao(self, categoria: EnumCategoria_im_ex, ano: int, pais: Pais) -> ImportacaoAnual:
         """
         Retorna a importação referente a determinada categoria ano e pais, ou None se não encontrado.
         """
-        for i in self.importacoes:
-            if i.categoria == categoria and i.ano == ano and i.pais == pais:
-                return i
-        return None
+        celula = self.tabelas[categoria].celula(pais, ano)
+        return self.montar_importacao(categoria, celula) if celula else None
 
     def buscar_importacoesPorAno(self, ano: int) -> List[ImportacaoAnual]:
         """
         Retorna as importacoes de todos as categorias para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for i in self.importacoes:
-            if i.ano == ano:
-                retorno.append(i)
-        return retorno
+        return [registro for categoria in EnumCategoria_im_ex for registro in self.buscar_importacoesPorAnoCategoria(ano, categoria)]
 
     def buscar_importacoesPorCategoria(self, categoria: EnumCategoria_im_ex) -> List[ImportacaoAnual]:
         """
         Retorna as importacoes de uma determinada categoria, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for i in self.importacoes:
-            if i.categoria == categoria:
-                retorno.append(i)
-        return retorno
+        return [self.montar_importacao(categoria, celula) for celula in self.tabelas[categoria].celulas()]
 
     def buscar_importacoesPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ImportacaoAnual]:
         """
         Retorna as importacoes de uma determinada categoria em um determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for i in self.importacoes:
-            if i.categoria == categoria and i.ano == ano:
-                retorno.append(i)
-        return retorno
+        return [self.montar_importacao(categoria, celula) for celula in self.tabelas[categoria].celulas_do_ano(ano)]
+
+    def buscarImportacaoTotalPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex, metrica: str = "quantidade") -> int:
+        """
+        Retorna a soma da métrica ('quantidade' ou 'valor') de todos os paises, para determinada categoria e ano.
+        """
+        return self.totais.total_grupo(categoria, ano, metrica)
+
+    def buscarImportacaoTotalDeCategoriaPorPeriodo(self, categoria: EnumCategoria_im_ex, ano_inicial: int, ano_final: int, metrica: str = "quantidade") -> Dict[int, int]:
+        """
+        Retorna {ano: total} da métrica ('quantidade' ou 'valor') de todos os paises da categoria, para cada ano do período informado.
+        """
+        return self.totais.totais_por_ano(ano_inicial, ano_final, categoria, metrica)
+
+    def listar_anosPorCategoria(self, categoria: EnumCategoria_im_ex) -> Set[int]:
+        """
+        Retorna os anos que possuem ao menos uma importação cadastrada para a categoria informada.
+        """
+        return self.tabelas[categoria].listar_anos()
 
     def listar_importacoes(self) -> List[ImportacaoAnual]:
         """
         Retorna a lista completa de importações cadastradas.
         """
-        return self.importacoes
+        return [registro for categoria in EnumCategoria_im_ex for registro in self.buscar_importacoesPorCategoria(categoria)]
 
 class RepositorioExportacoesAnuais:
     """
-    Importação e Exportação - Armazena e gerencia a lista de registros de exportação anual cadastrados no sistema.
+    Importação e Exportação - Armazena e gerencia os registros de exportação anual cadastrados no sistema.  As quantidades
+    e os valores ficam em tabelas colunares, uma por categoria (uma linha por pais e uma coluna por ano); os objetos
+    ExportacaoAnual são montados a cada consulta.
     
     Atributos:
-        exportacoes (list[ExportacaoAnual]): Lista de todos os registros de exportacao.
+        tabelas (dict[EnumCategoria_im_ex, TabelaSeriesAnuais]): Quantidade, valor, origem e momento da carga de cada (pais, ano), por categoria.
+        totais (TotaisAnuais): Quantidades e valores totais por categoria.
     """
     def __init__(self):
-        self.exportacoes = []
+        self.tabelas = {categoria: TabelaSeriesAnuais(("quantidade", "valor")) for categoria in EnumCategoria_im_ex}
+        self.totais = TotaisAnuais(("quantidade", "valor"))
+
+    def montar_exportacao(self, categoria: EnumCategoria_im_ex, celula: Celula) -> ExportacaoAnual:
+        pais, ano, (quantidade, valor), origem, carregado_em = celula
+        return ExportacaoAnual(ano, valor, quantidade, categoria, pais, origem, carregado_em)
 
     def adicionar_exportacao(self, exportacao: ExportacaoAnual):
         """
         Adiciona um registro de exportação ao repositório, caso ainda não exista.
         """
-        if exportacao not in self.exportacoes:
-            self.exportacoes.append(exportacao)
+        self.adicionar_lote((exportacao,))
+
+    def adicionar_lote(self, exportacoes: Iterable[ExportacaoAnual]) -> List[ExportacaoAnual]:
+        """
+        Adiciona um lote de registros de exportação, descartando os que tenham (categoria, ano, pais) já cadastrados.  Retorna os registros aceitos.
+        """
+        aceitos = []
+        for exportacao in exportacoes:
+            valores = (exportacao.quantidade, exportacao.valor)
+            if self.tabelas[exportacao.categoria].registrar(exportacao.pais, exportacao.ano, valores, exportacao.origem, exportacao.carregado_em):
+                self.totais.somar(exportacao.categoria, exportacao.ano, valores)
+                aceitos.append(exportacao)
+        return aceitos
 
     def remover_exportacao(self, exportacao: ExportacaoAnual):
         """
-        Remove um registro de exportação do repositório, caso exista.
+        Remove o registro de exportação da (categoria, ano, pais) informada do repositório, caso exista.
+        """
+        self.remover_lote((exportacao,))
+
+    def remover_lote(self, exportacoes: Iterable[ExportacaoAnual]):
+        """
+        Remove um lote de registros do repositório (p.ex. todos os de uma página do site em um ano), pela (categoria, ano, pais) de cada um, ignorando os não cadastrados.
         """
-        if exportacao in self.exportacoes:
-            self.exportacoes.remove(exportacao)
+        for exportacao in exportacoes:
+            valores = self.tabelas[exportacao.categoria].remover(exportacao.pais, exportacao.ano)
+            if valores is not None:
+                self.totais.subtrair(exportacao.categoria, exportacao.ano, valores)
 
     def buscar_exportacao(self, categoria: EnumCategoria_im_ex, ano: int, pais: Pais) -> ExportacaoAnual:
         """
         Retorna a exportação referente a determinada categoria, ano e pais, ou None se não encontrado.
         """
-        for i in self.exportacoes:
-            if i.categoria == categoria and i.ano == ano and i.pais == pais:
-                return i
-        return None
+        celula = self.tabelas[categoria].celula(pais, ano)
+        return self.montar_exportacao(categoria, celula) if celula else None
 
     def buscar_exportacoesPorAno(self, ano: int) -> List[ExportacaoAnual]:
         """
         Retorna as exportacoes de todos as categorias para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for i in self.exportacoes:
-            if i.ano == ano:
-                retorno.append(i)
-        return retorno
+        return [registro for categoria in EnumCategoria_im_ex for registro in self.buscar_exportacoesPorAnoCategoria(ano, categoria)]
 
     def buscar_exportacoesPorCategoria(self, categoria: EnumCategoria_im_ex) -> List[ExportacaoAnual]:
         """
         Retorna as exportacoes de todos as categorias de uma determinada categoria, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for i in self.exportacoes:
-            if i.categoria == categoria:
-                retorno.append(i)
-        return retorno
+        return [self.montar_exportacao(categoria, celula) for celula in self.tabelas[categoria].celulas()]
 
     def buscar_exportacoesPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ExportacaoAnual]:
         """
         Retorna as exportacoes de uma determinada categoria em um determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for i in self.exportacoes:
-            if i.categoria == categoria and i.ano == ano:
-                retorno.append(i)
-        return retorno
+        return [self.montar_exportacao(categoria, celula) for celula in self.tabelas[categoria].celulas_do_ano(ano)]
+
+    def buscarExportacaoTotalPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex, metrica: str = "quantidade") -> int:
+        """
+        Retorna a soma da métrica ('quantidade' ou 'valor') de todos os paises, para determinada categoria e ano.
+        """
+        return self.totais.total_grupo(categoria, ano, metrica)
+
+    def buscarExportacaoTotalDeCategoriaPorPeriodo(self, categoria: EnumCategoria_im_ex, ano_inicial: int, ano_final: int, metrica: str = "quantidade") -> Dict[int, int]:
+        """
+        Retorna {ano: total} da métrica ('quantidade' ou 'valor') de todos os paises da categoria, para cada ano do período informado.
+        """
+        return self.totais.totais_por_ano(ano_inicial, ano_final, categoria, metrica)
+
+    def listar_anosPorCategoria(self, categoria: EnumCategoria_im_ex) -> Set[int]:
+        """
+        Retorna os anos que possuem ao menos uma exportação cadastrada para a categoria informada.
+        """
+        return self.tabelas[categoria].listar_anos()
 
     def listar_exportacoes(self) -> List[ExportacaoAnual]:
         """
         Retorna a lista completa de exportações cadastradas.
         """
-        return self.exportacoes
+        return [registro for categoria in EnumCategoria_im_ex for registro in self.buscar_exportacoesPorCategoria(categoria)]
 
 
 
@@ -0,0 +1,31 @@
+from typing import Any, Hashable
+
+def indexar(indice: dict, chave: Hashable, item: Any):
+    """
+    Registra o item na lista do índice correspondente à chave informada.
+    """
+    itens = indice.get(chave)
+    if itens is None:
+        indice[chave] = [item]
+    else:
+        itens.append(item)
+
+def desindexar(indice: dict, chave: Hashable, item: Any):
+    """
+    Retira o item da lista do índice correspondente à chave informada.  Remove a chave quando a lista ficar vazia.
+    """
+    itens = indice.get(chave)
+    if itens is None or item not in itens:
+        return
+    itens.remove(item)
+    if len(itens) == 0:
+        del indice[chave]
+
+def primeiro_indexado(indice: dict, chave: Hashable) -> Any:
+    """
+    Retorna o primeiro item registrado para a chave, ou None se não houver.
+    """
+    itens = indice.get(chave)
+    if itens:
+        return next(iter(itens))
+    return None
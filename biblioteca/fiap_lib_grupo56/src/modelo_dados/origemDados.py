@@ -0,0 +1,8 @@
+from enum import Enum
+
+class EnumOrigemDados(Enum):
+    """
+    Origem de um registro anual carregado nos repositórios.
+    """
+    WEBSCRAPING = "Webscraping"
+    CSV = "CSV"
@@ -1,6 +1,10 @@
 import re
+import sys
 from enum import Enum
-from typing import List
+from typing import Dict, Iterable, List, Set
+from .indices import indexar, desindexar, primeiro_indexado
+from .seriesAnuais import Celula, TabelaSeriesAnuais, TotaisAnuais, internar_ano
+from .origemDados import EnumOrigemDados
 
 class Categoria_proc:
     """
@@ -8,18 +12,19 @@ class Categoria_proc:
     
     Atributos:
         nome (str): Nome da categoria.
-        cultivares (list[Cultivar_proc]): Lista de cultivares que pertencem a esta categoria.
+        cultivares (dict[Cultivar_proc, None]): Conjunto ordenado (dict) dos cultivares que pertencem a esta categoria.
     """
+    __slots__ = ('nome', 'cultivares')
+
     def __init__(self, nome: str):
-        self.nome = nome
-        self.cultivares = []
+        self.nome = sys.intern(nome)
+        self.cultivares = {}
 
     def adicionar_cultivar(self, cultivar: 'Cultivar_proc'):
         """
         Associa um cultivar a esta categoria.
         """
-        if cultivar not in self.cultivares:
-            self.cultivares.append(cultivar)
+        self.cultivares[cultivar] = None
             
 class EnumTipoUva_proc(Enum):
     VINIFERAS = "Viniferas"
@@ -34,13 +39,13 @@ class Cultivar_proc:
     Atributos:
         nome (str): Nome do cultivar.
         categoria (Categoria): Referência à categoria à qual o cultivar pertence.
-        processamentos (list[ProcessamentoAnual]): Registros de processaemnto anual deste cultivar.
     """
+    __slots__ = ('nome', 'categoria', 'TipoUva')
+
     def __init__(self, nome: str, categoria: Categoria_proc = None, tipo_uva: EnumTipoUva_proc = None):
-        self.nome = nome
+        self.nome = sys.intern(nome)
         self.categoria = None
-        self.TipoUva = tipo_uva
-        self.processamentos = []
+        self.TipoUva = EnumTipoUva_proc(tipo_uva) if tipo_uva is not None else None
 
         if categoria:
             self.set_categoria(categoria)
@@ -55,13 +60,6 @@ class Cultivar_proc:
         self.categoria = categoria
         categoria.adicionar_cultivar(self)
 
-    def adicionar_processamento(self, processamento_anual: 'ProcessamentoAnual'):
-        """
-        Associa um objeto ProcessamentoAnual a este cultivar.
-        """
-        if processamento_anual not in self.processamentos:
-            self.processamentos.append(processamento_anual)
-
 class ProcessamentoAnual:
     """
     Processamento - Representa o registro de processamento de um cultivar em um determinado ano.
@@ -70,11 +68,17 @@ class ProcessamentoAnual:
         ano (int): Ano de referência.
         quantidade (int): Quantidade processada.
         cultivar (Cultivar_proc): Referência ao cultivar associado.
+        origem (EnumOrigemDados): Origem do registro (webscraping ou arquivo .CSV), se informada.
+        carregado_em (float): Momento da carga do registro (time.time()), se informado.
     """
-    def __init__(self, ano: int, quantidade: int, cultivar: Cultivar_proc = None):
-        self.ano = ano
+    __slots__ = ('ano', 'quantidade', 'cultivar', 'origem', 'carregado_em')
+
+    def __init__(self, ano: int, quantidade: int, cultivar: Cultivar_proc = None, origem: EnumOrigemDados = None, carregado_em: float = None):
+        self.ano = internar_ano(ano)
         self.quantidade = self.filtra_valor_int(quantidade)
         self.cultivar = None
+        self.origem = origem
+        self.carregado_em = carregado_em
         if cultivar:
             self.set_cultivar(cultivar)
 
@@ -83,9 +87,10 @@ class ProcessamentoAnual:
         Associa este processamento anual a um cultivar específico.
         """
         self.cultivar = cultivar
-        cultivar.adicionar_processamento(self)
 
     def filtra_valor_int(self, valor: int) -> int:
+        if isinstance(valor, int):
+            return valor # já convertido (p.ex. lido do snapshot)
         apenasNumericos = re.sub(r'\D', '', valor) # retira caracteres não numéricos
         if apenasNumericos == "":
             return  0
@@ -98,131 +103,179 @@ class RepositorioCultivar_proc:
     Processamento - Armazena e gerencia a lista de cultivares criados no sistema.
     
     Atributos:
-        cultivares (list[Cultivar_proc]): Lista de todos os cultivares cadastrados.
+        cultivares (dict[Cultivar_proc, None]): Conjunto ordenado (dict) de todos os cultivares cadastrados.
+        indice_nome_categoria_tipo (dict): Cultivares indexados por (nome, categoria, TipoUva).
     """
     def __init__(self):
-        self.cultivares = []
+        self.cultivares = {}
+        self.indice_nome_categoria_tipo = {}
 
     def adicionar_cultivar(self, cultivar: Cultivar_proc):
         """
         Adiciona um cultivar ao repositório, caso ainda não exista.
         """
-        if cultivar not in self.cultivares:
-            self.cultivares.append(cultivar)
+        if cultivar not in self.indice_nome_categoria_tipo.get((cultivar.nome, cultivar.categoria, cultivar.TipoUva), ()):
+            self.cultivares[cultivar] = None
+            indexar(self.indice_nome_categoria_tipo, (cultivar.nome, cultivar.categoria, cultivar.TipoUva), cultivar)
+
+    def adicionar_lote(self, cultivares: Iterable[Cultivar_proc]) -> List[Cultivar_proc]:
+        """
+        Adiciona um lote de cultivares ao repositório, descartando os que tenham (nome, categoria, TipoUva) já cadastrados.  Retorna os cultivares aceitos.
+        """
+        aceitos = []
+        for cultivar in cultivares:
+            chave = (cultivar.nome, cultivar.categoria, cultivar.TipoUva)
+            if chave in self.indice_nome_categoria_tipo:
+                continue
+            self.indice_nome_categoria_tipo[chave] = [cultivar]
+            aceitos.append(cultivar)
+        self.cultivares.update(dict.fromkeys(aceitos))
+        return aceitos
 
     def remover_cultivar(self, cultivar: Cultivar_proc):
         """
         Remove um cultivar do repositório, caso exista.
         """
         if cultivar in self.cultivares:
-            self.cultivares.remove(cultivar)
+            del self.cultivares[cultivar]
+            desindexar(self.indice_nome_categoria_tipo, (cultivar.nome, cultivar.categoria, cultivar.TipoUva), cultivar)
 
     def buscar_cultivar_por_nome_categoria_tipo(self, nome: str, categoria: Categoria_proc, tipo_uva: EnumTipoUva_proc) -> Cultivar_proc:
         """
         Retorna o primeiro cultivar que corresponda aos parâmetros informados, ou None se não encontrado.
         """
-        for p in self.cultivares:
-            if (p.nome == nome) and (p.categoria == categoria) and (p.TipoUva == tipo_uva):
-                return p
-        return None
+        return primeiro_indexado(self.indice_nome_categoria_tipo, (nome, categoria, tipo_uva))
 
     def listar_cultivares(self) -> List[Cultivar_proc]:
         """
         Retorna a lista completa de cultivares cadastrados.
         """
-        return self.cultivares
+        return list(self.cultivares)
 
 class RepositorioCategorias_proc:
     """
     Processamento - Armazena e gerencia a lista de categorias de processamento cadastradas no sistema.
     
     Atributos:
-        categorias (list[Categoria_proc]): Lista de todas as categorias cadastradas.
+        categorias (dict[Categoria_proc, None]): Conjunto ordenado (dict) de todas as categorias cadastradas.
+        indice_nome (dict): Categorias indexadas por nome.
     """
     def __init__(self):
-        self.categorias = []
+        self.categorias = {}
+        self.indice_nome = {}
 
     def adicionar_categoria(self, categoria: Categoria_proc):
         """
         Adiciona uma categoria ao repositório, caso ainda não exista.
         """
-        if categoria not in self.categorias:
-            self.categorias.append(categoria)
+        if categoria not in self.indice_nome.get(categoria.nome, ()):
+            self.categorias[categoria] = None
+            indexar(self.indice_nome, categoria.nome, categoria)
+
+    def adicionar_lote(self, categorias: Iterable[Categoria_proc]) -> List[Categoria_proc]:
+        """
+        Adiciona um lote de categorias ao repositório, descartando as que tenham nome já cadastrado.  Retorna as categorias aceitas.
+        """
+        aceitas = []
+        for categoria in categorias:
+            if categoria.nome in self.indice_nome:
+                continue
+            self.indice_nome[categoria.nome] = [categoria]
+            aceitas.append(categoria)
+        self.categorias.update(dict.fromkeys(aceitas))
+        return aceitas
 
     def remover_categoria(self, categoria: Categoria_proc):
         """
         Remove uma categoria do repositório, caso exista.
         """
         if categoria in self.categorias:
-            self.categorias.remove(categoria)
+            del self.categorias[categoria]
+            desindexar(self.indice_nome, categoria.nome, categoria)
 
     def buscar_categoria_por_nome(self, nome: str) -> Categoria_proc:
         """
         Retorna a primeira categoria que corresponda ao nome informado, ou None se não encontrado.
         """
-        for c in self.categorias:
-            if c.nome == nome:
-                return c
-        return None
+        return primeiro_indexado(self.indice_nome, nome)
 
     def listar_categorias(self) -> List[Categoria_proc]:
         """
         Retorna a lista completa de categorias cadastradas.
         """
-        return self.categorias
+        return list(self.categorias)
 
 class RepositorioProcessamentosAnuais:
     """
-    Processamento - Armazena e gerencia a lista de registros de processamento anual cadastrados no sistema.
+    Processamento - Armazena e gerencia os registros de processamento anual cadastrados no sistema.  As quantidades ficam em
+    tabelas colunares, uma por TipoUva (uma linha por cultivar e uma coluna por ano); os objetos ProcessamentoAnual são
+    montados a cada consulta.
     
     Atributos:
-        processamentos (list[ProcessamentoAnual]): Lista de todos os registros de processamento.
+        tabelas (dict[EnumTipoUva_proc, TabelaSeriesAnuais]): Quantidade, origem e momento da carga de cada (cultivar, ano), por TipoUva do cultivar.
+        totais (TotaisAnuais): Quantidades totais por (categoria, TipoUva) do cultivar.
     """
     def __init__(self):
-        self.processamentos = []
+        self.tabelas = {tipo_uva: TabelaSeriesAnuais() for tipo_uva in EnumTipoUva_proc}
+        self.totais = TotaisAnuais()
+
+    def montar_processamento(self, celula: Celula) -> ProcessamentoAnual:
+        cultivar, ano, (quantidade,), origem, carregado_em = celula
+        return ProcessamentoAnual(ano, quantidade, cultivar, origem, carregado_em)
 
     def adicionar_processamento(self, processamento: ProcessamentoAnual):
         """
-        Adiciona um registro de produtividade ao repositório, caso ainda não exista.
+        Adiciona um registro de processamento ao repositório, caso ainda não exista.
         """
-        if processamento not in self.processamentos:
-            self.processamentos.append(processamento)
+        self.adicionar_lote((processamento,))
+
+    def adicionar_lote(self, processamentos: Iterable[ProcessamentoAnual]) -> List[ProcessamentoAnual]:
+        """
+        Adiciona um lote de registros de processamento, descartando os que tenham (cultivar, ano) já cadastrados.  Retorna os registros aceitos.
+        """
+        aceitos = []
+        for processamento in processamentos:
+            cultivar = processamento.cultivar
+            valores = (processamento.quantidade,)
+            if self.tabelas[cultivar.TipoUva].registrar(cultivar, processamento.ano, valores, processamento.origem, processamento.carregado_em):
+                self.totais.somar((cultivar.categoria, cultivar.TipoUva), processamento.ano, valores)
+                aceitos.append(processamento)
+        return aceitos
 
     def remover_processamento(self, processamento: ProcessamentoAnual):
         """
-        Remove um registro de produtividade do repositório, caso exista.
+        Remove o registro de processamento do (cultivar, ano) informado do repositório, caso exista.
+        """
+        self.remover_lote((processamento,))
+
+    def remover_lote(self, processamentos: Iterable[ProcessamentoAnual]):
+        """
+        Remove um lote de registros do repositório (p.ex. todos os de uma página do site em um ano), pelo (cultivar, ano) de cada um, ignorando os não cadastrados.
         """
-        if processamento in self.processamentos:
-            self.processamentos.remove(processamento)
+        for processamento in processamentos:
+            cultivar = processamento.cultivar
+            valores = self.tabelas[cultivar.TipoUva].remover(cultivar, processamento.ano)
+            if valores is not None:
+                self.totais.subtrair((cultivar.categoria, cultivar.TipoUva), processamento.ano, valores)
 
     def buscar_processamento(self, cultivar: Cultivar_proc, ano: int) -> ProcessamentoAnual:
         """
         Retorna o processamento para determinado cultivar e ano, ou None se não encontrado.
         """
-        for p in self.processamentos:
-            if p.cultivar == cultivar and p.ano == ano:
-                return p
-        return None
+        celula = self.tabelas[cultivar.TipoUva].celula(cultivar, ano)
+        return self.montar_processamento(celula) if celula else None
 
     def buscar_processamentosPorAno(self, ano: int) -> List[ProcessamentoAnual]:
         """
         Retorna os processamentos de todos os cultivares para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for p in self.processamentos:
-            if p.ano == ano:
-                retorno.append(p)
-        return retorno
+        return [registro for tipo_uva in EnumTipoUva_proc for registro in self.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)]
 
     def buscar_processamentosPorAno_TipoUva(self, ano: int, tipo_uva: EnumTipoUva_proc) -> List[ProcessamentoAnual]:
         """
         Retorna os processamentos de todos os cultivares para determinado ano e TipoUva, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for p in self.processamentos:
-            if (p.ano == ano) and (p.cultivar.TipoUva == tipo_uva):
-                retorno.append(p)
-        return retorno
+        return [self.montar_processamento(celula) for celula in self.tabelas[tipo_uva].celulas_do_ano(ano)]
 
 
 
@@ -230,17 +283,42 @@ class RepositorioProcessamentosAnuais:
         """
         Retorna a quantidade total de processamento de todos os cultivares para determinado ano, categoria e tipo uva, ou uma lista vazia, se não encontrado.
         """
-        retorno: int = 0
-        processamentosDoAno = self.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)
-        for p in processamentosDoAno:
-            if p.cultivar.categoria == categoria:
-                retorno = retorno + p.quantidade
-        return retorno
+        return self.totais.total_grupo((categoria, tipo_uva), ano)
+
+    def buscarProcessamentoTotalDeCategoriaPorPeriodo_TipoUva(self, categoria: Categoria_proc, ano_inicial: int, ano_final: int, tipo_uva: EnumTipoUva_proc) -> Dict[int, int]:
+        """
+        Retorna {ano: quantidade total} dos cultivares da categoria e TipoUva, para cada ano do período informado.
+        """
+        return self.totais.totais_por_ano(ano_inicial, ano_final, (categoria, tipo_uva))
 
+    def buscarProcessamentoTotalDeCategoriaPorDecada_TipoUva(self, categoria: Categoria_proc, decada: int, tipo_uva: EnumTipoUva_proc) -> int:
+        """
+        Retorna a quantidade total processada dos cultivares da categoria e TipoUva na década informada (p.ex. 1990 para 1990-1999).
+        """
+        return self.totais.total_grupo_decada((categoria, tipo_uva), decada)
+
+    def buscarProcessamentoTotalDeCategoria_TipoUva(self, categoria: Categoria_proc, tipo_uva: EnumTipoUva_proc) -> int:
+        """
+        Retorna a quantidade total processada dos cultivares da categoria e TipoUva, somando todos os anos carregados.
+        """
+        return self.totais.total_grupo_geral((categoria, tipo_uva))
+
+    def buscar_serieProcessamento(self, cultivar: Cultivar_proc) -> Dict[int, int]:
+        """
+        Retorna a série histórica {ano: quantidade} de um cultivar, apenas com os anos carregados.
+        """
+        return self.tabelas[cultivar.TipoUva].serie(cultivar)
+
+
+    def listar_anos_TipoUva(self, tipo_uva: EnumTipoUva_proc) -> Set[int]:
+        """
+        Retorna os anos que possuem ao menos um processamento cadastrado para o TipoUva informado.
+        """
+        return self.tabelas[tipo_uva].listar_anos()
 
     def listar_processamentos(self) -> List[ProcessamentoAnual]:
         """
-        Retorna a lista completa de produtividades cadastradas.
+        Retorna a lista completa de processamentos cadastrados, por TipoUva e ano.
         """
-        return self.processamentos
+        return [self.montar_processamento(celula) for tabela in self.tabelas.values() for celula in tabela.celulas()]
 
@@ -1,5 +1,9 @@
 import re
-from typing import List
+import sys
+from typing import Dict, Iterable, List, Set
+from .indices import indexar, desindexar, primeiro_indexado
+from .seriesAnuais import Celula, TabelaSeriesAnuais, TotaisAnuais, internar_ano
+from .origemDados import EnumOrigemDados
 
 class Categoria_prod:
     """
@@ -7,18 +11,19 @@ class Categoria_prod:
     
     Atributos:
         nome (str): Nome da categoria.
-        produtos (list[Produto]): Lista de produtos que pertencem a esta categoria.
+        produtos (dict[Produto, None]): Conjunto ordenado (dict) dos produtos que pertencem a esta categoria.
     """
+    __slots__ = ('nome', 'produtos')
+
     def __init__(self, nome: str):
-        self.nome = nome
-        self.produtos = []
+        self.nome = sys.intern(nome)
+        self.produtos = {}
 
     def adicionar_produto(self, produto: 'Produto_prod'):
         """
         Associa um produto a esta categoria.
         """
-        if produto not in self.produtos:
-            self.produtos.append(produto)
+        self.produtos[produto] = None
 
 
 class Produto_prod:
@@ -28,12 +33,12 @@ class Produto_prod:
     Atributos:
         nome (str): Nome do produto.
         categoria (Categoria): Referência à categoria à qual o produto pertence.
-        produtividades (list[ProdutividadeAnual]): Registros de produtividade anual deste produto.
     """
+    __slots__ = ('nome', 'categoria')
+
     def __init__(self, nome: str, categoria: Categoria_prod = None):
-        self.nome = nome
+        self.nome = sys.intern(nome)
         self.categoria = None
-        self.produtividades = []
 
         if categoria:
             self.set_categoria(categoria)
@@ -45,13 +50,6 @@ class Produto_prod:
         self.categoria = categoria
         categoria.adicionar_produto(self)
 
-    def adicionar_produtividade(self, produtividade_anual: 'ProdutividadeAnual'):
-        """
-        Associa um objeto ProdutividadeAnual a este produto.
-        """
-        if produtividade_anual not in self.produtividades:
-            self.produtividades.append(produtividade_anual)
-
 
 class ProdutividadeAnual:
     """
@@ -61,15 +59,24 @@ class ProdutividadeAnual:
         ano (int): Ano de referência.
         quantidade (int): Quantidade produzida.
         produto (Produto): Referência ao produto associado.
+        origem (EnumOrigemDados): Origem do registro (webscraping ou arquivo .CSV), se informada.
+        carregado_em (float): Momento da carga do registro (time.time()), se informado.
     """
-    def __init__(self, ano: int, quantidade: int, produto: Produto_prod = None):
-        self.ano = ano
-        apenasNumericos = re.sub(r'\D', '', quantidade) # retira caracteres não numéricos
-        if apenasNumericos == "":
-            self.quantidade = 0
+    __slots__ = ('ano', 'quantidade', 'produto', 'origem', 'carregado_em')
+
+    def __init__(self, ano: int, quantidade: int, produto: Produto_prod = None, origem: EnumOrigemDados = None, carregado_em: float = None):
+        self.ano = internar_ano(ano)
+        if isinstance(quantidade, int):
+            self.quantidade = quantidade # já convertido (p.ex. lido do snapshot)
         else:
-            self.quantidade = int(apenasNumericos)
+            apenasNumericos = re.sub(r'\D', '', quantidade) # retira caracteres não numéricos
+            if apenasNumericos == "":
+                self.quantidade = 0
+            else:
+                self.quantidade = int(apenasNumericos)
         self.produto = None
+        self.origem = origem
+        self.carregado_em = carregado_em
         if produto:
             self.set_produto(produto)
 
@@ -78,7 +85,6 @@ class ProdutividadeAnual:
         Associa esta produtividade anual a um produto específico.
         """
         self.produto = produto
-        produto.adicionar_produtividade(self)
 
 
 class RepositorioProdutos_prod:
@@ -86,39 +92,54 @@ class RepositorioProdutos_prod:
     Produção - Armazena e gerencia a lista de produtos criados no sistema.
     
     Atributos:
-        produtos (list[Produto]): Lista de todos os produtos cadastrados.
+        produtos (dict[Produto, None]): Conjunto ordenado (dict) de todos os produtos cadastrados.
+        indice_nome_categoria (dict): Produtos indexados por (nome, categoria).
     """
     def __init__(self):
-        self.produtos = []
+        self.produtos = {}
+        self.indice_nome_categoria = {}
 
     def adicionar_produto(self, produto: Produto_prod):
         """
         Adiciona um produto ao repositório, caso ainda não exista.
         """
-        if produto not in self.produtos:
-            self.produtos.append(produto)
+        if produto not in self.indice_nome_categoria.get((produto.nome, produto.categoria), ()):
+            self.produtos[produto] = None
+            indexar(self.indice_nome_categoria, (produto.nome, produto.categoria), produto)
+
+    def adicionar_lote(self, produtos: Iterable[Produto_prod]) -> List[Produto_prod]:
+        """
+        Adiciona um lote de produtos ao repositório, descartando os que tenham (nome, categoria) já cadastrados.  Retorna os produtos aceitos.
+        """
+        aceitos = []
+        for produto in produtos:
+            chave = (produto.nome, produto.categoria)
+            if chave in self.indice_nome_categoria:
+                continue
+            self.indice_nome_categoria[chave] = [produto]
+            aceitos.append(produto)
+        self.produtos.update(dict.fromkeys(aceitos))
+        return aceitos
 
     def remover_produto(self, produto: Produto_prod):
         """
         Remove um produto do repositório, caso exista.
         """
         if produto in self.produtos:
-            self.produtos.remove(produto)
+            del self.produtos[produto]
+            desindexar(self.indice_nome_categoria, (produto.nome, produto.categoria), produto)
 
     def buscar_produto_por_nome_categoria(self, nome: str, categoria: Categoria_prod) -> Produto_prod:
         """
         Retorna o primeiro produto que corresponda aos parametros informados, ou None se não encontrado.
         """
-        for p in self.produtos:
-            if (p.nome == nome) and (p.categoria == categoria):
-                return p
-        return None
+        return primeiro_indexado(self.indice_nome_categoria, (nome, categoria))
 
     def listar_produtos(self) -> List[Produto_prod]:
         """
         Retorna a lista completa de produtos cadastrados.
         """
-        return self.produtos
+        return list(self.produtos)
 
 
 class RepositorioCategorias_prod:
@@ -126,101 +147,160 @@ class RepositorioCategorias_prod:
     Produção - Armazena e gerencia a lista de categorias de produção cadastradas no sistema.
     
     Atributos:
-        categorias (list[Categoria_prod]): Lista de todas as categorias cadastradas.
+        categorias (dict[Categoria_prod, None]): Conjunto ordenado (dict) de todas as categorias cadastradas.
+        indice_nome (dict): Categorias indexadas por nome.
     """
     def __init__(self):
-        self.categorias = []
+        self.categorias = {}
+        self.indice_nome = {}
 
     def adicionar_categoria(self, categoria: Categoria_prod):
         """
         Adiciona uma categoria ao repositório, caso ainda não exista.
         """
-        if categoria not in self.categorias:
-            self.categorias.append(categoria)
+        if categoria not in self.indice_nome.get(categoria.nome, ()):
+            self.categorias[categoria] = None
+            indexar(self.indice_nome, categoria.nome, categoria)
+
+    def adicionar_lote(self, categorias: Iterable[Categoria_prod]) -> List[Categoria_prod]:
+        """
+        Adiciona um lote de categorias ao repositório, descartando as que tenham nome já cadastrado.  Retorna as categorias aceitas.
+        """
+        aceitas = []
+        for categoria in categorias:
+            if categoria.nome in self.indice_nome:
+                continue
+            self.indice_nome[categoria.nome] = [categoria]
+            aceitas.append(categoria)
+        self.categorias.update(dict.fromkeys(aceitas))
+        return aceitas
 
     def remover_categoria(self, categoria: Categoria_prod):
         """
         Remove uma categoria do repositório, caso exista.
         """
         if categoria in self.categorias:
-            self.categorias.remove(categoria)
+            del self.categorias[categoria]
+            desindexar(self.indice_nome, categoria.nome, categoria)
 
     def buscar_categoria_por_nome(self, nome: str) -> Categoria_prod:
         """
         Retorna a primeira categoria que corresponda ao nome informado, ou None se não encontrado.
         """
-        for c in self.categorias:
-            if c.nome == nome:
-                return c
-        return None
+        return primeiro_indexado(self.indice_nome, nome)
 
     def listar_categorias(self) -> List[Categoria_prod]:
         """
         Retorna a lista completa de categorias cadastradas.
         """
-        return self.categorias
+        return list(self.categorias)
 
 
 class RepositorioProdutividadesAnuais:
     """
-    Produção - Armazena e gerencia a lista de registros de produtividade anual cadastrados no sistema.
+    Produção - Armazena e gerencia os registros de produtividade anual cadastrados no sistema.  As quantidades ficam em uma
+    tabela colunar (uma linha por produto e uma coluna por ano); os objetos ProdutividadeAnual são montados a cada consulta.
     
     Atributos:
-        produtividades (list[ProdutividadeAnual]): Lista de todos os registros de produtividade.
+        tabela (TabelaSeriesAnuais): Quantidade, origem e momento da carga de cada (produto, ano).
+        totais (TotaisAnuais): Quantidades totais por categoria do produto.
     """
     def __init__(self):
-        self.produtividades = []
+        self.tabela = TabelaSeriesAnuais()
+        self.totais = TotaisAnuais()
+
+    def montar_produtividade(self, celula: Celula) -> ProdutividadeAnual:
+        produto, ano, (quantidade,), origem, carregado_em = celula
+        return ProdutividadeAnual(ano, quantidade, produto, origem, carregado_em)
 
     def adicionar_produtividade(self, produtividade: ProdutividadeAnual):
         """
         Adiciona um registro de produtividade ao repositório, caso ainda não exista.
         """
-        if produtividade not in self.produtividades:
-            self.produtividades.append(produtividade)
+        self.adicionar_lote((produtividade,))
+
+    def adicionar_lote(self, produtividades: Iterable[ProdutividadeAnual]) -> List[ProdutividadeAnual]:
+        """
+        Adiciona um lote de registros de produtividade, descartando os que tenham (produto, ano) já cadastrados.  Retorna os registros aceitos.
+        """
+        aceitos = []
+        for produtividade in produtividades:
+            valores = (produtividade.quantidade,)
+            if self.tabela.registrar(produtividade.produto, produtividade.ano, valores, produtividade.origem, produtividade.carregado_em):
+                self.totais.somar(produtividade.produto.categoria, produtividade.ano, valores)
+                aceitos.append(produtividade)
+        return aceitos
 
     def remover_produtividade(self, produtividade: ProdutividadeAnual):
         """
-        Remove um registro de produtividade do repositório, caso exista.
+        Remove o registro de produtividade do (produto, ano) informado do repositório, caso exista.
+        """
+        self.remover_lote((produtividade,))
+
+    def remover_lote(self, produtividades: Iterable[ProdutividadeAnual]):
+        """
+        Remove um lote de registros do repositório (p.ex. todos os de uma página do site em um ano), pelo (produto, ano) de cada um, ignorando os não cadastrados.
         """
-        if produtividade in self.produtividades:
-            self.produtividades.remove(produtividade)
+        for produtividade in produtividades:
+            valores = self.tabela.remover(produtividade.produto, produtividade.ano)
+            if valores is not None:
+                self.totais.subtrair(produtividade.produto.categoria, produtividade.ano, valores)
 
     def buscar_produtividade(self, produto: Produto_prod, ano: int) -> ProdutividadeAnual:
         """
         Retorna a produtividade para determinado produto e ano, ou None se não encontrado.
         """
-        for p in self.produtividades:
-            if p.produto == produto and p.ano == ano:
-                return p
-        return None
+        celula = self.tabela.celula(produto, ano)
+        return self.montar_produtividade(celula) if celula else None
 
     def buscar_produtividadesPorAno(self, ano: int) -> List[ProdutividadeAnual]:
         """
         Retorna as produtividades de todos os produtos para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno = []
-        for p in self.produtividades:
-            if p.ano == ano:
-                retorno.append(p)
-        return retorno
+        return [self.montar_produtividade(celula) for celula in self.tabela.celulas_do_ano(ano)]
 
     def buscarProdutividadeTotalDeCategoriaPorAno(self, categoria: Categoria_prod, ano: int) -> int:
         """
         Retorna as produtividades de todos os produtos para determinado ano, ou uma lista vazia, se não encontrado.
         """
-        retorno: int = 0
-        produtividadesDoAno = self.buscar_produtividadesPorAno(ano)
-        for p in produtividadesDoAno:
-            if p.produto.categoria == categoria:
-                retorno = retorno + p.quantidade
-        return retorno
+        return self.totais.total_grupo(categoria, ano)
+
+    def buscarProdutividadeTotalDeCategoriaPorPeriodo(self, categoria: Categoria_prod, ano_inicial: int, ano_final: int) -> Dict[int, int]:
+        """
+        Retorna {ano: quantidade total} dos produtos da categoria, para cada ano do período informado.
+        """
+        return self.totais.totais_por_ano(ano_inicial, ano_final, categoria)
 
+    def buscarProdutividadeTotalDeCategoriaPorDecada(self, categoria: Categoria_prod, decada: int) -> int:
+        """
+        Retorna a quantidade total dos produtos da categoria na década informada (p.ex. 1990 para 1990-1999).
+        """
+        return self.totais.total_grupo_decada(categoria, decada)
+
+    def buscarProdutividadeTotalDeCategoria(self, categoria: Categoria_prod) -> int:
+        """
+        Retorna a quantidade total dos produtos da categoria, somando todos os anos carregados.
+        """
+        return self.totais.total_grupo_geral(categoria)
+
+    def buscar_serieProdutividade(self, produto: Produto_prod) -> Dict[int, int]:
+        """
+        Retorna a série histórica {ano: quantidade} de um produto, apenas com os anos carregados.
+        """
+        return self.tabela.serie(produto)
+
+
+    def listar_anos(self) -> Set[int]:
+        """
+        Retorna os anos que possuem ao menos uma produtividade cadastrada.
+        """
+        return self.tabela.listar_anos()
 
     def listar_produtividades(self) -> List[ProdutividadeAnual]:
         """
-        Retorna a lista completa de produtividades cadastradas.
+        Retorna a lista completa de produtividades cadastradas, por ano.
         """
-        return self.produtividades
+        return [self.montar_produtividade(celula) for celula in self.tabela.celulas()]
 
 
 
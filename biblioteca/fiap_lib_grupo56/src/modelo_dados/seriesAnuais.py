@@ -0,0 +1,277 @@
+from array import array
+from itertools import compress
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+from .origemDados import EnumOrigemDados
+
+ANO_INICIAL = 1970
+ANO_FINAL = 2023
+
+# Origem de cada célula preenchida da tabela, guardada como o seu código (1 byte).  O código 0 marca a célula vazia.
+ORIGENS = (None, None) + tuple(EnumOrigemDados)
+CODIGOS_ORIGEM = {origem: codigo for codigo, origem in enumerate(ORIGENS) if codigo > 0}
+
+# Um único objeto int por ano, compartilhado por todos os registros anuais
+ANOS_INTERNADOS = {}
+
+def internar_ano(ano: int) -> int:
+    """
+    Retorna a instância compartilhada do ano informado, evitando um objeto int por registro.
+    """
+    return ANOS_INTERNADOS.setdefault(ano, ano)
+
+# (entidade, ano, valores das métricas, origem, carregado_em) de uma célula preenchida
+Celula = Tuple[Hashable, int, Tuple[int, ...], Optional[EnumOrigemDados], Optional[float]]
+
+class TabelaSeriesAnuais:
+    """
+    Armazena, em formato colunar, os valores anuais de um conjunto de entidades (produto, cultivar, país...).  É o único
+    armazenamento dos registros anuais dos repositórios: os objetos de registro (ProdutividadeAnual etc.) são montados a
+    partir das células a cada consulta.
+
+    Cada métrica é um array int64 contínuo, dividido em linhas de tamanho fixo (uma linha por entidade e uma coluna por ano).
+    O valor de uma entidade em um ano fica na posição indice_linhas[entidade] * num_anos + (ano - ano_inicial): a série de
+    uma entidade é uma fatia contínua do array e um ano de todas as entidades, uma fatia com passo num_anos.
+
+    Atributos:
+        metricas (tuple[str]): Nomes das métricas armazenadas (p.ex. 'quantidade', 'valor').
+        ano_inicial (int): Ano representado pela primeira coluna.
+        num_anos (int): Quantidade de colunas (anos) de cada linha.
+        entidades (list): Entidades, na ordem das linhas.
+        indice_linhas (dict): Linha ocupada por cada entidade.
+        valores (dict[str, array]): Um array int64 por métrica.
+        origens (bytearray): Código da origem de cada célula (ver ORIGENS); 0 nas células sem registro.
+        carregados_em (array): Momento da carga de cada célula (NaN se não informado).
+        registros_por_ano (array): Quantidade de células preenchidas em cada coluna.
+    """
+    def __init__(self, metricas: Tuple[str, ...] = ("quantidade",), ano_inicial: int = ANO_INICIAL, ano_final: int = ANO_FINAL):
+        self.metricas = tuple(metricas)
+        self.ano_inicial = ano_inicial
+        self.num_anos = ano_final - ano_inicial + 1
+        self.entidades = []
+        self.indice_linhas = {}
+        self.valores = {metrica: array('q') for metrica in self.metricas}
+        self.origens = bytearray()
+        self.carregados_em = array('d')
+        self.registros_por_ano = array('q', bytes(8 * self.num_anos))
+
+    def __len__(self) -> int:
+        return sum(self.registros_por_ano)
+
+    def linha_da_entidade(self, entidade: Hashable) -> int:
+        """
+        Retorna a linha da entidade, criando uma nova linha vazia caso ainda não exista.
+        """
+        linha = self.indice_linhas.get(entidade)
+        if linha is None:
+            linha = len(self.entidades)
+            self.entidades.append(entidade)
+            self.indice_linhas[entidade] = linha
+            for colunas in self.valores.values():
+                colunas.frombytes(bytes(8 * self.num_anos))
+            self.origens.extend(bytes(self.num_anos))
+            self.carregados_em.extend(array('d', (float("nan"),)) * self.num_anos)
+        return linha
+
+    def ampliar_anos(self, ano: int):
+        """
+        Redimensiona todas as linhas para que o ano informado passe a ter uma coluna.
+        """
+        novo_inicial = min(self.ano_inicial, ano)
+        novo_num_anos = max(self.ano_inicial + self.num_anos, ano + 1) - novo_inicial
+        deslocamento = self.ano_inicial - novo_inicial
+
+        def redimensionar(colunas, vazias):
+            for linha in range(len(self.entidades)):
+                origem = linha * self.num_anos
+                destino = linha * novo_num_anos + deslocamento
+                vazias[destino:destino + self.num_anos] = colunas[origem:origem + self.num_anos]
+            return vazias
+
+        linhas = len(self.entidades)
+        for metrica, colunas in self.valores.items():
+            self.valores[metrica] = redimensionar(colunas, array('q', bytes(8 * novo_num_anos * linhas)))
+        self.origens = redimensionar(self.origens, bytearray(novo_num_anos * linhas))
+        self.carregados_em = redimensionar(self.carregados_em, array('d', (float("nan"),)) * (novo_num_anos * linhas))
+        registros_por_ano = array('q', bytes(8 * novo_num_anos))
+        registros_por_ano[deslocamento:deslocamento + self.num_anos] = self.registros_por_ano
+        self.registros_por_ano = registros_por_ano
+        self.ano_inicial = novo_inicial
+        self.num_anos = novo_num_anos
+
+    def coluna_do_ano(self, ano: int) -> int:
+        """
+        Retorna o deslocamento do ano dentro de uma linha, ou -1 se o ano estiver fora da faixa armazenada.
+        """
+        coluna = ano - self.ano_inicial
+        if 0 <= coluna < self.num_anos:
+            return coluna
+        return -1
+
+    def posicao(self, entidade: Hashable, ano: int) -> int:
+        """
+        Retorna a posição da célula (entidade, ano) nos arrays, ou -1 se a entidade ou o ano não estiverem na tabela.
+        """
+        linha = self.indice_linhas.get(entidade)
+        coluna = self.coluna_do_ano(ano)
+        if linha is None or coluna < 0:
+            return -1
+        return linha * self.num_anos + coluna
+
+    def contem(self, entidade: Hashable, ano: int) -> bool:
+        posicao = self.posicao(entidade, ano)
+        return posicao >= 0 and self.origens[posicao] != 0
+
+    def registrar(self, entidade: Hashable, ano: int, valores: Tuple[int, ...], origem: EnumOrigemDados = None,
+                  carregado_em: float = None) -> bool:
+        """
+        Grava os valores das métricas (na ordem de metricas) da entidade no ano informado.  Retorna False, sem alterar a
+        célula, se ela já estiver preenchida.
+        """
+        if self.coluna_do_ano(ano) < 0:
+            self.ampliar_anos(ano)
+        posicao = self.linha_da_entidade(entidade) * self.num_anos + self.coluna_do_ano(ano)
+        if self.origens[posicao]:
+            return False
+        for metrica, valor in zip(self.metricas, valores):
+            self.valores[metrica][posicao] = valor
+        self.origens[posicao] = CODIGOS_ORIGEM[origem]
+        self.carregados_em[posicao] = float("nan") if carregado_em is None else carregado_em
+        self.registros_por_ano[ano - self.ano_inicial] += 1
+        return True
+
+    def remover(self, entidade: Hashable, ano: int) -> Optional[Tuple[int, ...]]:
+        """
+        Esvazia a célula da entidade no ano informado e retorna os valores que ela tinha, ou None se estava vazia.  A linha
+        da entidade é mantida.
+        """
+        posicao = self.posicao(entidade, ano)
+        if posicao < 0 or not self.origens[posicao]:
+            return None
+        valores = tuple(self.valores[metrica][posicao] for metrica in self.metricas)
+        for colunas in self.valores.values():
+            colunas[posicao] = 0
+        self.origens[posicao] = 0
+        self.carregados_em[posicao] = float("nan")
+        self.registros_por_ano[ano - self.ano_inicial] -= 1
+        return valores
+
+    def celula(self, entidade: Hashable, ano: int) -> Optional[Celula]:
+        """
+        Retorna a célula da entidade no ano, ou None se ela estiver vazia.
+        """
+        posicao = self.posicao(entidade, ano)
+        if posicao < 0 or not self.origens[posicao]:
+            return None
+        return self.montar_celula(entidade, ano, posicao)
+
+    def montar_celula(self, entidade: Hashable, ano: int, posicao: int) -> Celula:
+        carregado_em = self.carregados_em[posicao]
+        return (entidade, ano, tuple(self.valores[metrica][posicao] for metrica in self.metricas), ORIGENS[self.origens[posicao]],
+                None if carregado_em != carregado_em else carregado_em)
+
+    def celulas_do_ano(self, ano: int) -> List[Celula]:
+        """
+        Retorna as células preenchidas do ano, na ordem das linhas.  Lê a coluna do ano de cada array como uma única fatia.
+        """
+        coluna = self.coluna_do_ano(ano)
+        if coluna < 0 or self.registros_por_ano[coluna] == 0:
+            return []
+        origens = self.origens[coluna::self.num_anos]
+        colunas = [self.valores[metrica][coluna::self.num_anos] for metrica in self.metricas]
+        carregados_em = self.carregados_em[coluna::self.num_anos]
+        ano = internar_ano(ano)
+        return [(self.entidades[linha], ano, tuple(valores[linha] for valores in colunas), ORIGENS[codigo],
+                 None if carregados_em[linha] != carregados_em[linha] else carregados_em[linha])
+                for linha, codigo in enumerate(origens) if codigo]
+
+    def celulas(self) -> Iterator[Celula]:
+        """
+        Percorre todas as células preenchidas, por ano e, em cada ano, na ordem das linhas.
+        """
+        for ano in sorted(self.listar_anos()):
+            yield from self.celulas_do_ano(ano)
+
+    def serie(self, entidade: Hashable, metrica: str = "quantidade") -> Dict[int, int]:
+        """
+        Retorna a série histórica {ano: valor da métrica} da entidade, apenas com os anos preenchidos, em ordem de ano.
+        """
+        linha = self.indice_linhas.get(entidade)
+        if linha is None:
+            return {}
+        inicio = linha * self.num_anos
+        preenchidos = self.origens[inicio:inicio + self.num_anos]
+        anos = range(self.ano_inicial, self.ano_inicial + self.num_anos)
+        return dict(zip(compress(anos, preenchidos), compress(self.valores[metrica][inicio:inicio + self.num_anos], preenchidos)))
+
+    def listar_anos(self) -> Set[int]:
+        """
+        Retorna os anos que possuem ao menos uma célula preenchida.
+        """
+        return {self.ano_inicial + coluna for coluna, registros in enumerate(self.registros_por_ano) if registros}
+
+class TotaisAnuais:
+    """
+    Totais das métricas dos registros anuais de um repositório, por grupo (p.ex. a categoria do produto): por ano, por
+    década e em todos os anos.  São atualizados a cada inclusão e remoção de registro, de modo que as consultas de totais
+    não percorrem os registros.
+
+    Atributos:
+        metricas (tuple[str]): Métricas somadas (p.ex. 'quantidade', 'valor'), na ordem dos valores informados.
+        totais_grupo_ano (dict[str, dict]): Por métrica, o total de cada (grupo, ano).
+        totais_grupo_decada (dict[str, dict]): Por métrica, o total de cada (grupo, década).
+        totais_grupo_geral (dict[str, dict]): Por métrica, o total de cada grupo em todos os anos.
+    """
+    def __init__(self, metricas: Tuple[str, ...] = ("quantidade",)):
+        self.metricas = tuple(metricas)
+        self.totais_grupo_ano = {metrica: {} for metrica in self.metricas}
+        self.totais_grupo_decada = {metrica: {} for metrica in self.metricas}
+        self.totais_grupo_geral = {metrica: {} for metrica in self.metricas}
+
+    def somar(self, grupo: Hashable, ano: int, valores: Tuple[int, ...]):
+        """
+        Soma os valores (na ordem de metricas) de um registro incluído no repositório aos totais do seu grupo.
+        """
+        self.acumular(grupo, ano, valores, 1)
+
+    def subtrair(self, grupo: Hashable, ano: int, valores: Tuple[int, ...]):
+        """
+        Subtrai os valores (na ordem de metricas) de um registro removido do repositório dos totais do seu grupo.
+        """
+        self.acumular(grupo, ano, valores, -1)
+
+    def acumular(self, grupo: Hashable, ano: int, valores: Tuple[int, ...], sinal: int):
+        decada = ano - ano % 10
+        for metrica, valor in zip(self.metricas, valores):
+            diferenca = sinal * valor
+            if diferenca == 0:
+                continue
+            totais = self.totais_grupo_ano[metrica]
+            totais[(grupo, ano)] = totais.get((grupo, ano), 0) + diferenca
+            totais = self.totais_grupo_decada[metrica]
+            totais[(grupo, decada)] = totais.get((grupo, decada), 0) + diferenca
+            totais = self.totais_grupo_geral[metrica]
+            totais[grupo] = totais.get(grupo, 0) + diferenca
+
+    def total_grupo(self, grupo: Hashable, ano: int, metrica: str = "quantidade") -> int:
+        """
+        Retorna a soma da métrica dos registros de um grupo no ano informado.
+        """
+        return self.totais_grupo_ano[metrica].get((grupo, ano), 0)
+
+    def total_grupo_decada(self, grupo: Hashable, decada: int, metrica: str = "quantidade") -> int:
+        """
+        Retorna a soma da métrica dos registros de um grupo na década informada (p.ex. 1990 para 1990-1999).
+        """
+        return self.totais_grupo_decada[metrica].get((grupo, decada - decada % 10), 0)
+
+    def total_grupo_geral(self, grupo: Hashable, metrica: str = "quantidade") -> int:
+        """
+        Retorna a soma da métrica dos registros de um grupo em todos os anos.
+        """
+        return self.totais_grupo_geral[metrica].get(grupo, 0)
+
+    def totais_por_ano(self, ano_inicial: int, ano_final: int, grupo: Hashable, metrica: str = "quantidade") -> Dict[int, int]:
+        """
+        Retorna {ano: total} dos registros de um grupo, para cada ano do período.
+        """
+        return {ano: self.total_grupo(grupo, ano, metrica) for ano in range(ano_inicial, ano_final + 1)}
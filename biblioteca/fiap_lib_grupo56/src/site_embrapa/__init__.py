@@ -1 +1,2 @@
-from .site_embrapa import SiteEmbrapa
\ No newline at end of file
+from .site_embrapa import SiteEmbrapa
+from .site_embrapa_async import SiteEmbrapaAsync
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Agrupamento (single-flight) das cargas simultâneas da mesma página (opcao, subopcao, ano) do site da Embrapa.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+class ChamadaEmAndamento:
+    """
+    Carga em execução para uma chave.
+
+    Atributos:
+        concluida (threading.Event): Sinalizado quando a carga termina.
+        resultado (Any): Retorno da carga.
+        erro (Exception): Exceção levantada pela carga, ou None.
+        interrompida (bool): A carga não terminou, nem com resultado nem com erro (p.ex. KeyboardInterrupt ou SystemExit).
+    """
+    __slots__ = ('concluida', 'resultado', 'erro', 'interrompida')
+
+    def __init__(self):
+        self.concluida = threading.Event()
+        self.resultado = None
+        self.erro = None
+        self.interrompida = True
+
+class AgrupadorRequisicoes:
+    """
+    Executa no máximo uma carga por chave de cada vez; chamadas simultâneas da mesma chave aguardam a carga em andamento.
+
+    Atributos:
+        em_andamento (dict): Cargas em execução, por chave.
+        executadas (int): Cargas efetivamente executadas.
+        agrupadas (int): Chamadas atendidas pela carga de outra thread (requisições ao site economizadas).
+    """
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.em_andamento = {}
+        self.executadas = 0
+        self.agrupadas = 0
+
+    def executar(self, chave: Hashable, funcao: Callable[..., Any], *args) -> Any:
+        """
+        Executa funcao(*args), a menos que já haja uma carga da mesma chave em andamento: nesse caso espera por ela e
+        retorna o seu resultado (ou levanta a sua exceção).  Apenas as exceções (Exception) da carga são repassadas às
+        chamadas que a aguardam: se ela for interrompida (KeyboardInterrupt, SystemExit...), a interrupção fica com a thread
+        que a executava e as demais tentam a carga novamente.
+        """
+        while True:
+            with self.trava:
+                chamada = self.em_andamento.get(chave)
+                executar = chamada is None
+                if executar:
+                    chamada = ChamadaEmAndamento()
+                    self.em_andamento[chave] = chamada
+                    self.executadas += 1
+                else:
+                    self.agrupadas += 1
+            if executar:
+                break
+            chamada.concluida.wait()
+            if chamada.interrompida:
+                continue
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+        try:
+            chamada.resultado = funcao(*args)
+            chamada.interrompida = False
+            return chamada.resultado
+        except Exception as erro:
+            chamada.erro = erro
+            chamada.interrompida = False
+            raise
+        finally:
+            with self.trava:
+                del self.em_andamento[chave]
+            chamada.concluida.set()
+
+    def obterMetricas(self) -> dict:
+        with self.trava:
+            return {"executadas": self.executadas, "agrupadas": self.agrupadas, "em_andamento": len(self.em_andamento)}
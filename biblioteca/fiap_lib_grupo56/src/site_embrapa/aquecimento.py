@@ -0,0 +1,171 @@
+"""
+Aquecimento (warm-up) dos repositórios: carrega via webscraping todas as páginas do site da Embrapa dos anos informados.
+
+Uso pela linha de comando (os repositórios do processo se perdem ao terminar: informe o banco SQLite e/ou o cache em disco
+que a API vai usar):
+    python -m site_embrapa.aquecimento [--ano-inicial 1970] [--ano-final 2023] [--concorrencia 8] [--progresso arquivo.json]
+                                       [--sqlite banco.db] [--cache-html pasta] [--taxa 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Iterable, List, Optional
+from site_embrapa.site_embrapa import SiteEmbrapa, URL_SITE_EMBRAPA
+from site_embrapa.site_embrapa_async import SiteEmbrapaAsync, PaginaAno, MAX_CONCORRENCIA
+from site_embrapa.limitador import LimitadorRequisicoes, segundo_plano
+from site_embrapa.opcoes import PAGINAS_SITE, ANO_INICIAL_SITE, ANO_FINAL_SITE
+
+class ProgressoAquecimento:
+    """
+    Progresso de um aquecimento: páginas concluídas e com falha, vazão e tempo estimado para o término.
+
+    Atributos:
+        paginas (List[PaginaAno]): Todas as páginas (opcao, subopcao, ano) do aquecimento, na ordem em que são percorridas.
+        concluidas (set): Páginas já carregadas nos repositórios (nesta ou em execuções anteriores).
+        falhas (dict): Por página cujo webscraping falhou na última tentativa, o motivo da falha.
+        processadas_nesta_execucao (int): Páginas baixadas (com sucesso ou falha) desde o início desta execução.
+        inicio (float): Momento (time.monotonic) do início desta execução.
+    """
+    def __init__(self, paginas: Iterable[PaginaAno], concluidas: Iterable[PaginaAno] = ()):
+        self.paginas = list(paginas)
+        self.concluidas = set(concluidas).intersection(self.paginas)
+        self.falhas = {}
+        self.processadas_nesta_execucao = 0
+        self.inicio = time.monotonic()
+
+    def pendentes(self) -> List[PaginaAno]:
+        return [pagina for pagina in self.paginas if pagina not in self.concluidas]
+
+    def registrar(self, pagina: PaginaAno, motivo_falha: str = None, baixada: bool = True):
+        """
+        Registra o resultado de uma página: concluída ou, se informado o motivo, com falha.  baixada=False para páginas
+        concluídas sem download (já estavam nos repositórios).
+        """
+        if motivo_falha is None:
+            self.concluidas.add(pagina)
+            self.falhas.pop(pagina, None)
+        else:
+            self.falhas[pagina] = motivo_falha
+        if baixada:
+            self.processadas_nesta_execucao += 1
+
+    def paginasPorSegundo(self) -> float:
+        decorrido = time.monotonic() - self.inicio
+        return self.processadas_nesta_execucao / decorrido if decorrido > 0 else 0.0
+
+    def segundosRestantes(self) -> Optional[float]:
+        """
+        Estimativa do tempo para baixar as páginas ainda não concluídas (incluindo as que falharam), pela vazão desta execução.
+        """
+        vazao = self.paginasPorSegundo()
+        if vazao == 0:
+            return None
+        return (len(self.paginas) - len(self.concluidas) - len(self.falhas)) / vazao
+
+    def resumo(self) -> str:
+        total = len(self.paginas)
+        percentual = len(self.concluidas) / total * 100 if total else 100.0
+        restante = self.segundosRestantes()
+        eta = "--:--" if restante is None else f"{int(restante // 60):02d}:{int(restante % 60):02d}"
+        return (f"páginas {len(self.concluidas)}/{total} ({percentual:.1f}%) - falhas {len(self.falhas)} - "
+                f"{self.paginasPorSegundo():.1f} páginas/s - restante {eta}")
+
+    def salvar(self, caminho: str):
+        """
+        Grava as páginas concluídas e com falha no arquivo JSON (substituindo o arquivo de forma atômica).
+        """
+        conteudo = {
+            "concluidas": sorted([list(pagina) for pagina in self.concluidas], key=str),
+            "falhas": sorted([list(pagina) + [motivo] for pagina, motivo in self.falhas.items()], key=str),
+        }
+        temporario = caminho + ".tmp"
+        with open(temporario, mode='w', encoding='utf-8') as file:
+            json.dump(conteudo, file, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    @staticmethod
+    def lerConcluidas(caminho: str) -> set:
+        """
+        Páginas concluídas gravadas no arquivo de progresso; vazio se o arquivo não existir.
+        """
+        if not caminho or not os.path.exists(caminho):
+            return set()
+        with open(caminho, mode='r', encoding='utf-8') as file:
+            conteudo = json.load(file)
+        return {tuple(pagina) for pagina in conteudo.get("concluidas", [])}
+
+def paginas_dos_anos(ano_inicial: int, ano_final: int) -> List[PaginaAno]:
+    return [(opcao, subopcao, ano) for ano in range(ano_inicial, ano_final + 1) for opcao, subopcao in PAGINAS_SITE]
+
+async def aquecer_async(site_async: SiteEmbrapaAsync, ano_inicial: int = ANO_INICIAL_SITE, ano_final: int = ANO_FINAL_SITE,
+                        arquivo_progresso: str = None, relatorio: Callable[[ProgressoAquecimento], None] = None) -> ProgressoAquecimento:
+    """
+    Versão assíncrona de aquecer, para quem já está em um event loop.
+    """
+    with segundo_plano():
+        return await aquecer_paginas(site_async, ano_inicial, ano_final, arquivo_progresso, relatorio)
+
+async def aquecer_paginas(site_async: SiteEmbrapaAsync, ano_inicial: int, ano_final: int, arquivo_progresso: str,
+                          relatorio: Callable[[ProgressoAquecimento], None]) -> ProgressoAquecimento:
+    progresso = ProgressoAquecimento(paginas_dos_anos(ano_inicial, ano_final), ProgressoAquecimento.lerConcluidas(arquivo_progresso))
+    # Páginas já nos repositórios, no cache negativo ou no armazenamento persistente não são baixadas
+    pendentes = await asyncio.to_thread(site_async.paginasPendentes, progresso.pendentes())
+    for pagina in set(progresso.pendentes()).difference(pendentes):
+        progresso.registrar(pagina, baixada=False)
+    tamanho_lote = max(site_async.max_concorrencia * 4, 1)
+    for inicio_lote in range(0, len(pendentes), tamanho_lote):
+        lote = pendentes[inicio_lote:inicio_lote + tamanho_lote]
+        resultados = await site_async.obterPaginas(lote)
+        for pagina, resultado in zip(lote, resultados):
+            if isinstance(resultado, BaseException) and not isinstance(resultado, Exception):
+                raise resultado  # cancelamento
+            progresso.registrar(pagina, site_async.motivoDaFalha(resultado))
+        if arquivo_progresso:
+            progresso.salvar(arquivo_progresso)
+        if relatorio:
+            relatorio(progresso)
+    if arquivo_progresso and not pendentes:
+        progresso.salvar(arquivo_progresso)
+    return progresso
+
+def aquecer(site: SiteEmbrapa, ano_inicial: int = ANO_INICIAL_SITE, ano_final: int = ANO_FINAL_SITE,
+            max_concorrencia: int = MAX_CONCORRENCIA, arquivo_progresso: str = None,
+            relatorio: Callable[[ProgressoAquecimento], None] = None) -> ProgressoAquecimento:
+    """
+    Carrega nos repositórios do site todas as páginas do site da Embrapa dos anos ano_inicial a ano_final, baixando até
+    max_concorrencia páginas ao mesmo tempo.  relatorio, se informado, é chamado com o progresso após cada lote de páginas.
+    Retorna o progresso final.
+    """
+    site_async = SiteEmbrapaAsync(site, max_concorrencia)
+    return asyncio.run(aquecer_async(site_async, ano_inicial, ano_final, arquivo_progresso, relatorio))
+
+def main(argumentos: List[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m site_embrapa.aquecimento",
+                                     description="Carrega via webscraping todas as páginas do site da Embrapa na faixa de anos informada.")
+    parser.add_argument("--ano-inicial", type=int, default=ANO_INICIAL_SITE)
+    parser.add_argument("--ano-final", type=int, default=ANO_FINAL_SITE)
+    parser.add_argument("--concorrencia", type=int, default=MAX_CONCORRENCIA, help="páginas baixadas ao mesmo tempo")
+    parser.add_argument("--progresso", default=None, help="arquivo JSON de progresso, para retomar um aquecimento interrompido")
+    parser.add_argument("--url", default=None, help="url base do site (padrão: site da Embrapa)")
+    parser.add_argument("--sqlite", default=None, help="banco SQLite em que as páginas baixadas são persistidas")
+    parser.add_argument("--cache-html", default=None, help="pasta do cache em disco das páginas baixadas")
+    parser.add_argument("--taxa", type=float, default=None, help="máximo de requisições por segundo ao site")
+    args = parser.parse_args(argumentos)
+
+    if not args.sqlite and not args.cache_html:
+        print("Aviso: sem --sqlite nem --cache-html, as páginas baixadas se perdem ao terminar.", flush=True)
+    site = SiteEmbrapa(pasta_cache_html=args.cache_html, url_site=args.url or URL_SITE_EMBRAPA, caminho_sqlite=args.sqlite)
+    if args.taxa:
+        site.webscraping.limitador = LimitadorRequisicoes(args.taxa)
+    progresso = aquecer(site, args.ano_inicial, args.ano_final, args.concorrencia, args.progresso,
+                        relatorio=lambda progresso: print(progresso.resumo(), flush=True))
+    if site.armazenamento is not None:
+        site.armazenamento.aguardar()  # gravações em segundo plano (write-behind) ainda na fila
+    print(f"Concluído: {progresso.resumo()}")
+    return 0 if not progresso.falhas else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
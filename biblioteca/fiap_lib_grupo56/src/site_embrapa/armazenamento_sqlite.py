@@ -0,0 +1,224 @@
+"""
+Armazenamento persistente (SQLite, read-through e write-behind) das páginas obtidas via webscraping.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# (opcao, subopcao, ano)
+PaginaAno = Tuple[str, Optional[str], int]
+# (categoria, item, pais, quantidade, valor)
+RegistroPersistido = Tuple[Optional[str], Optional[str], Optional[str], int, Optional[int]]
+
+# Subopção gravada para as páginas sem subopções (NULL não identifica a página na chave primária)
+SEM_SUBOPCAO = ""
+
+LOTE_MAXIMO = 50
+TIMEOUT_BLOQUEIO = 10.0
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS paginas (
+    opcao TEXT NOT NULL,
+    subopcao TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    origem TEXT NOT NULL,
+    carregado_em REAL,
+    quantidade_registros INTEGER NOT NULL,
+    gravado_em REAL NOT NULL,
+    PRIMARY KEY (opcao, subopcao, ano)
+);
+CREATE TABLE IF NOT EXISTS registros (
+    opcao TEXT NOT NULL,
+    subopcao TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    ordem INTEGER NOT NULL,
+    categoria TEXT,
+    item TEXT,
+    pais TEXT,
+    quantidade INTEGER NOT NULL,
+    valor INTEGER,
+    PRIMARY KEY (opcao, subopcao, ano, ordem)
+);
+CREATE INDEX IF NOT EXISTS idx_registros_ano ON registros (ano, opcao);
+CREATE INDEX IF NOT EXISTS idx_registros_categoria_ano ON registros (categoria, ano);
+CREATE INDEX IF NOT EXISTS idx_registros_pais_ano ON registros (pais, ano);
+"""
+
+class PaginaPersistida:
+    """
+    Página lida do banco.
+
+    Atributos:
+        pagina (PaginaAno): Página (opcao, subopcao, ano) do site.
+        origem (str): Valor de EnumOrigemDados dos registros.
+        carregado_em (float): Momento (time.time) da carga original dos registros.
+        registros (List[RegistroPersistido]): Registros da página, na ordem em que foram gravados.
+    """
+    __slots__ = ('pagina', 'origem', 'carregado_em', 'registros')
+
+    def __init__(self, pagina: PaginaAno, origem: str, carregado_em: float, registros: List[RegistroPersistido]):
+        self.pagina = pagina
+        self.origem = origem
+        self.carregado_em = carregado_em
+        self.registros = registros
+
+class ArmazenamentoSqlite:
+    """
+    Banco SQLite das páginas obtidas via webscraping, com leitura direta e gravação em segundo plano.  Pode ser usado por
+    várias threads ao mesmo tempo (cada thread usa a sua conexão) e por vários processos.
+
+    Atributos:
+        caminho (str): Arquivo do banco (criado, se não existir).
+        lote_maximo (int): Máximo de páginas gravadas em uma transação.
+    """
+    def __init__(self, caminho: str, lote_maximo: int = LOTE_MAXIMO):
+        self.caminho = caminho
+        self.lote_maximo = max(lote_maximo, 1)
+        self.local = threading.local()
+        self.fila = queue.Queue()
+        self.trava = threading.Lock()
+        self.thread = None
+        self.metricas = {"leituras": 0, "acertos": 0, "paginas_gravadas": 0, "lotes": 0, "falhas_gravacao": 0}
+        conexao = self.conexao()
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.executescript(ESQUEMA)
+        # Páginas na fila são gravadas antes do encerramento do processo
+        atexit.register(self.aguardar)
+
+    def conexao(self) -> sqlite3.Connection:
+        """
+        Conexão da thread corrente com o banco (aberta no primeiro uso).
+        """
+        conexao = getattr(self.local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=TIMEOUT_BLOQUEIO, isolation_level=None)
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self.local.conexao = conexao
+        return conexao
+
+    def contar(self, metrica: str, quantidade: int = 1):
+        with self.trava:
+            self.metricas[metrica] += quantidade
+
+    def lerPagina(self, opcao: str, subopcao: str, ano: int) -> Optional[PaginaPersistida]:
+        """
+        Página gravada no banco, ou None se ela não foi gravada.
+        """
+        self.contar("leituras")
+        conexao = self.conexao()
+        chave = (opcao, subopcao or SEM_SUBOPCAO, ano)
+        conexao.execute("BEGIN")
+        try:
+            pagina = conexao.execute("SELECT origem, carregado_em FROM paginas WHERE opcao = ? AND subopcao = ? AND ano = ?", chave).fetchone()
+            if pagina is None:
+                return None
+            registros = conexao.execute("SELECT categoria, item, pais, quantidade, valor FROM registros "
+                                        "WHERE opcao = ? AND subopcao = ? AND ano = ? ORDER BY ordem", chave).fetchall()
+        finally:
+            conexao.execute("COMMIT")
+        self.contar("acertos")
+        return PaginaPersistida((opcao, subopcao, ano), pagina[0], pagina[1], registros)
+
+    def agendarGravacao(self, pagina: PaginaAno, origem: str, carregado_em: float, registros: List[RegistroPersistido]):
+        """
+        Coloca a página na fila de gravação (write-behind).  A gravação substitui a página, se ela já estiver no banco.
+        """
+        with self.trava:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.executar, name="armazenamento-sqlite", daemon=True)
+                self.thread.start()
+        self.fila.put((pagina, origem, carregado_em, registros))
+
+    def executar(self):
+        while True:
+            lote = [self.fila.get()]
+            while len(lote) < self.lote_maximo:
+                try:
+                    lote.append(self.fila.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.gravarPaginas(lote)
+                self.contar("paginas_gravadas", len(lote))
+                self.contar("lotes")
+            except Exception:
+                # Qualquer falha (banco, registro mal formado) perde apenas o lote: a thread continua atendendo a fila
+                self.contar("falhas_gravacao", len(lote))
+            finally:
+                for _ in lote:
+                    self.fila.task_done()
+
+    def gravarPaginas(self, lote: list):
+        """
+        Grava as páginas (pagina, origem, carregado_em, registros) em uma única transação.
+        """
+        conexao = self.conexao()
+        gravado_em = time.time()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            for (opcao, subopcao, ano), origem, carregado_em, registros in lote:
+                chave = (opcao, subopcao or SEM_SUBOPCAO, ano)
+                conexao.execute("DELETE FROM registros WHERE opcao = ? AND subopcao = ? AND ano = ?", chave)
+                conexao.executemany("INSERT INTO registros (opcao, subopcao, ano, ordem, categoria, item, pais, quantidade, valor) "
+                                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    [(*chave, ordem, *registro) for ordem, registro in enumerate(registros)])
+                conexao.execute("INSERT OR REPLACE INTO paginas (opcao, subopcao, ano, origem, carregado_em, quantidade_registros, gravado_em) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)", (*chave, origem, carregado_em, len(registros), gravado_em))
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        conexao.execute("COMMIT")
+
+    def aguardar(self):
+        """
+        Espera até que todas as páginas da fila tenham sido gravadas.
+        """
+        self.fila.join()
+
+    def listar(self) -> List[PaginaAno]:
+        """
+        Páginas (opcao, subopcao, ano) gravadas no banco.
+        """
+        linhas = self.conexao().execute("SELECT opcao, subopcao, ano FROM paginas ORDER BY opcao, subopcao, ano").fetchall()
+        return [(opcao, subopcao or None, ano) for opcao, subopcao, ano in linhas]
+
+    def remover(self, opcao: str, subopcao: str, ano: int):
+        conexao = self.conexao()
+        chave = (opcao, subopcao or SEM_SUBOPCAO, ano)
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            conexao.execute("DELETE FROM registros WHERE opcao = ? AND subopcao = ? AND ano = ?", chave)
+            conexao.execute("DELETE FROM paginas WHERE opcao = ? AND subopcao = ? AND ano = ?", chave)
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        conexao.execute("COMMIT")
+
+    def limpar(self):
+        """
+        Remove todas as páginas do banco (após gravar as que estão na fila).
+        """
+        self.aguardar()
+        conexao = self.conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            conexao.execute("DELETE FROM registros")
+            conexao.execute("DELETE FROM paginas")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        conexao.execute("COMMIT")
+
+    def obterMetricas(self) -> dict:
+        """
+        Leituras e acertos, páginas gravadas, lotes, falhas, páginas na fila de gravação e páginas no banco.
+        """
+        with self.trava:
+            metricas = dict(self.metricas)
+        metricas["pendentes"] = self.fila.unfinished_tasks
+        metricas["paginas"] = self.conexao().execute("SELECT COUNT(*) FROM paginas").fetchone()[0]
+        return metricas
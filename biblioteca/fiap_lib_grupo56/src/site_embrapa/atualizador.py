@@ -0,0 +1,92 @@
+"""
+Atualização em segundo plano (stale-while-revalidate) das páginas vencidas do site carregadas nos repositórios.
+"""
+
+import queue
+import threading
+from typing import Callable, Optional, Tuple
+from site_embrapa.limitador import segundo_plano
+
+# (opcao, subopcao, ano)
+PaginaAno = Tuple[str, Optional[str], int]
+
+TEMPO_VALIDADE = 24 * 60 * 60.0
+
+class AtualizadorPaginas:
+    """
+    Fila das páginas vencidas, processada por uma thread de segundo plano (daemon) criada no primeiro agendamento.  As
+    requisições ao site feitas pela thread têm a prioridade de segundo plano do limitador de taxa.
+
+    Atributos:
+        atualizar (Callable[[str, str, int, int], bool]): Atualiza a página (opcao, subopcao, ano) agendada na geração
+            informada; retorna se ela foi atualizada.
+        pendentes (set): Páginas na fila ou em atualização (não são agendadas novamente).
+        geracao (int): Incrementada por descartarPendentes; páginas agendadas em uma geração anterior não são atualizadas.
+    """
+    def __init__(self, atualizar: Callable[[str, Optional[str], int, int], bool]):
+        self.atualizar = atualizar
+        self.fila = queue.Queue()
+        self.trava = threading.Lock()
+        self.pendentes = set()
+        self.geracao = 0
+        self.thread = None
+        self.metricas = {"agendadas": 0, "atualizadas": 0, "falhas": 0, "descartadas": 0}
+
+    def agendar(self, pagina: PaginaAno) -> bool:
+        """
+        Coloca a página na fila de atualização.  Retorna False se ela já estiver na fila ou em atualização.
+        """
+        with self.trava:
+            if pagina in self.pendentes:
+                return False
+            self.pendentes.add(pagina)
+            self.metricas["agendadas"] += 1
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.executar, name="atualizador-paginas", daemon=True)
+                self.thread.start()
+            geracao = self.geracao
+        self.fila.put((pagina, geracao))
+        return True
+
+    def descartarPendentes(self):
+        """
+        Descarta as páginas agendadas (p.ex. ao esvaziar os repositórios): as que estão na fila não são atualizadas e o
+        resultado das que estão em atualização deve ser ignorado (ver geracaoAtual).
+        """
+        with self.trava:
+            self.geracao += 1
+            self.pendentes = set()
+
+    def geracaoAtual(self, geracao: int) -> bool:
+        with self.trava:
+            return geracao == self.geracao
+
+    def executar(self):
+        with segundo_plano():
+            while True:
+                pagina, geracao = self.fila.get()
+                atualizada = False
+                try:
+                    if self.geracaoAtual(geracao):
+                        atualizada = self.atualizar(*pagina, geracao)
+                except Exception:
+                    pass
+                with self.trava:
+                    if geracao != self.geracao:
+                        self.metricas["descartadas"] += 1
+                    else:
+                        self.pendentes.discard(pagina)
+                        self.metricas["atualizadas" if atualizada else "falhas"] += 1
+                self.fila.task_done()
+
+    def aguardar(self):
+        """
+        Espera até que todas as páginas agendadas tenham sido processadas.
+        """
+        self.fila.join()
+
+    def obterMetricas(self) -> dict:
+        with self.trava:
+            metricas = dict(self.metricas)
+            metricas["pendentes"] = len(self.pendentes)
+        return metricas
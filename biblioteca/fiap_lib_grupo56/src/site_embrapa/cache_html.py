@@ -0,0 +1,150 @@
+"""
+Cache em disco do HTML das páginas do site da Embrapa, com os metadados para GETs condicionais (ETag / Last-Modified).
+"""
+
+import json
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# (opcao, subopcao, ano)
+PaginaAno = Tuple[str, Optional[str], int]
+
+SEM_SUBOPCAO = "sem_subopcao"
+
+class EntradaCacheHtml:
+    """
+    Página gravada no cache.
+
+    Atributos:
+        pagina (PaginaAno): Página (opcao, subopcao, ano) do site.
+        conteudo (bytes): HTML bruto da resposta.
+        url (str): Url de onde a página foi obtida.
+        etag (str): Cabeçalho ETag da resposta, se enviado pelo site.
+        last_modified (str): Cabeçalho Last-Modified da resposta, se enviado pelo site.
+        gravado_em (float): Momento (time.time) em que o conteúdo foi gravado.
+        validado_em (float): Momento da última confirmação, pelo site, de que o conteúdo continua atual (gravação ou 304).
+    """
+    __slots__ = ('pagina', 'conteudo', 'url', 'etag', 'last_modified', 'gravado_em', 'validado_em')
+
+    def __init__(self, pagina: PaginaAno, conteudo: bytes, url: str = None, etag: str = None, last_modified: str = None,
+                 gravado_em: float = None, validado_em: float = None):
+        self.pagina = pagina
+        self.conteudo = conteudo
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.gravado_em = gravado_em
+        self.validado_em = validado_em
+
+    def cabecalhosCondicionais(self) -> dict:
+        """
+        Cabeçalhos para revalidar a página com um GET condicional; vazio se o site não enviou ETag nem Last-Modified.
+        """
+        cabecalhos = {}
+        if self.etag:
+            cabecalhos["If-None-Match"] = self.etag
+        if self.last_modified:
+            cabecalhos["If-Modified-Since"] = self.last_modified
+        return cabecalhos
+
+class CacheHtml:
+    """
+    Cache das páginas do site em uma pasta do disco.  Pode ser usado por várias threads ao mesmo tempo.
+
+    Atributos:
+        pasta (str): Pasta onde ficam os arquivos do cache (criada, se não existir).
+    """
+    def __init__(self, pasta: str):
+        self.pasta = pasta
+        os.makedirs(pasta, exist_ok=True)
+        self.trava_metricas = threading.Lock()
+        self.metricas = {"gravacoes": 0, "revalidacoes": 0, "leituras": 0}
+
+    def caminhoBase(self, opcao: str, subopcao: str, ano: int) -> str:
+        return os.path.join(self.pasta, f"{opcao}-{subopcao or SEM_SUBOPCAO}-{ano}")
+
+    def contar(self, metrica: str):
+        with self.trava_metricas:
+            self.metricas[metrica] += 1
+
+    def ler(self, opcao: str, subopcao: str, ano: int) -> Optional[EntradaCacheHtml]:
+        """
+        Página em cache, ou None se ela não estiver no cache (ou os arquivos estiverem incompletos ou corrompidos).
+        """
+        caminho = self.caminhoBase(opcao, subopcao, ano)
+        try:
+            with open(caminho + ".json", mode='r', encoding='utf-8') as file:
+                metadados = json.load(file)
+            with open(caminho + ".html", mode='rb') as file:
+                conteudo = file.read()
+        except (OSError, ValueError):
+            return None
+        self.contar("leituras")
+        return EntradaCacheHtml((opcao, subopcao, ano), conteudo, metadados.get("url"), metadados.get("etag"),
+                                metadados.get("last_modified"), metadados.get("gravado_em"), metadados.get("validado_em"))
+
+    def gravar(self, opcao: str, subopcao: str, ano: int, conteudo: bytes, url: str = None, etag: str = None,
+               last_modified: str = None) -> EntradaCacheHtml:
+        agora = time.time()
+        entrada = EntradaCacheHtml((opcao, subopcao, ano), conteudo, url, etag, last_modified, agora, agora)
+        caminho = self.caminhoBase(opcao, subopcao, ano)
+        self.gravarArquivo(caminho + ".html", conteudo)
+        self.gravarMetadados(caminho, entrada)
+        self.contar("gravacoes")
+        return entrada
+
+    def registrarRevalidacao(self, entrada: EntradaCacheHtml):
+        """
+        Registra que o site confirmou (resposta 304) que a página em cache continua atual.
+        """
+        entrada.validado_em = time.time()
+        self.gravarMetadados(self.caminhoBase(*entrada.pagina), entrada)
+        self.contar("revalidacoes")
+
+    def gravarMetadados(self, caminho: str, entrada: EntradaCacheHtml):
+        metadados = {"url": entrada.url, "etag": entrada.etag, "last_modified": entrada.last_modified,
+                     "gravado_em": entrada.gravado_em, "validado_em": entrada.validado_em}
+        self.gravarArquivo(caminho + ".json", json.dumps(metadados).encode('utf-8'))
+
+    def gravarArquivo(self, destino: str, conteudo: bytes):
+        temporario = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, mode='wb') as file:
+            file.write(conteudo)
+        os.replace(temporario, destino)
+
+    def listar(self) -> List[PaginaAno]:
+        """
+        Páginas (opcao, subopcao, ano) gravadas no cache.
+        """
+        paginas = []
+        for nome in sorted(os.listdir(self.pasta)):
+            if not nome.endswith(".json"):
+                continue
+            partes = nome[:-len(".json")].split("-")
+            if len(partes) == 3 and partes[2].isdigit():
+                opcao, subopcao, ano = partes
+                paginas.append((opcao, None if subopcao == SEM_SUBOPCAO else subopcao, int(ano)))
+        return paginas
+
+    def remover(self, opcao: str, subopcao: str, ano: int):
+        caminho = self.caminhoBase(opcao, subopcao, ano)
+        for extensao in (".json", ".html"):
+            try:
+                os.remove(caminho + extensao)
+            except FileNotFoundError:
+                pass
+
+    def limpar(self):
+        """
+        Remove todas as páginas do cache.
+        """
+        for opcao, subopcao, ano in self.listar():
+            self.remover(opcao, subopcao, ano)
+
+    def obterMetricas(self) -> dict:
+        with self.trava_metricas:
+            metricas = dict(self.metricas)
+        metricas["paginas"] = len(self.listar())
+        return metricas
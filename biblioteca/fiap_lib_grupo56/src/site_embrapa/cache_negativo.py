@@ -0,0 +1,78 @@
+"""
+Cache negativo: páginas (opcao, subopcao, ano) sabidamente sem dados, para não repetir o webscraping a cada consulta.
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+# (opcao, subopcao, ano)
+PaginaAno = Tuple[str, Optional[str], int]
+
+TEMPO_VALIDADE_NEGATIVO = 60 * 60.0
+
+# Motivos das entradas
+MOTIVO_PAGINA_VAZIA = "pagina_vazia"  # o site retornou a tabela de dados sem linhas
+MOTIVO_SEM_DADOS_CSV = "sem_dados_csv"  # webscraping falhou e o arquivo .CSV da página não tem dados do ano
+
+class CacheNegativo:
+    """
+    Páginas sem dados, com tempo de validade.  Pode ser usado por várias threads ao mesmo tempo.
+
+    Atributos:
+        tempo_validade (float): Segundos de validade de cada entrada.  None: as entradas nunca vencem.
+        entradas (dict): Por página (opcao, subopcao, ano), (motivo, momento do registro em time.monotonic()).
+    """
+    def __init__(self, tempo_validade: float = TEMPO_VALIDADE_NEGATIVO):
+        self.tempo_validade = tempo_validade
+        self.trava = threading.Lock()
+        self.entradas = {}
+        self.metricas = {"registradas": 0, "acertos": 0, "vencidas": 0}
+
+    def registrar(self, pagina: PaginaAno, motivo: str):
+        """
+        Registra a página como sem dados (ou renova a entrada existente).
+        """
+        with self.trava:
+            self.entradas[pagina] = (motivo, time.monotonic())
+            self.metricas["registradas"] += 1
+
+    def contem(self, pagina: PaginaAno) -> bool:
+        """
+        Indica se a página tem uma entrada válida.  Uma entrada vencida é removida (e a página deve ser obtida novamente).
+        """
+        with self.trava:
+            entrada = self.entradas.get(pagina)
+            if entrada is None:
+                return False
+            if self.tempo_validade is not None and time.monotonic() - entrada[1] > self.tempo_validade:
+                del self.entradas[pagina]
+                self.metricas["vencidas"] += 1
+                return False
+            self.metricas["acertos"] += 1
+            return True
+
+    def remover(self, pagina: PaginaAno):
+        with self.trava:
+            self.entradas.pop(pagina, None)
+
+    def descartarOpcao(self, opcao: str):
+        """
+        Remove as entradas das páginas da opção (p.ex. ao recarregar os seus repositórios).
+        """
+        with self.trava:
+            self.entradas = {pagina: entrada for pagina, entrada in self.entradas.items() if pagina[0] != opcao}
+
+    def limpar(self):
+        with self.trava:
+            self.entradas = {}
+
+    def obterMetricas(self) -> dict:
+        """
+        Entradas por motivo, entradas registradas, consultas respondidas pelo cache negativo (acertos) e entradas vencidas.
+        """
+        with self.trava:
+            metricas = dict(self.metricas, entradas=len(self.entradas), tempo_validade=self.tempo_validade)
+            for motivo, _ in self.entradas.values():
+                metricas[motivo] = metricas.get(motivo, 0) + 1
+        return metricas
@@ -0,0 +1,129 @@
+"""
+Cliente HTTP do webscraping do site da Embrapa: conexões persistentes compartilhadas entre as threads e timeouts.
+"""
+
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+TIMEOUT_CONEXAO = 5.0
+TIMEOUT_LEITURA = 30.0
+CONEXOES_POR_HOST = 10
+HOSTS_NO_POOL = 4
+
+class ClienteHttp:
+    """
+    Pool de conexões HTTP com keep-alive, timeouts e métricas de reuso das conexões.
+
+    Cada thread usa a sua própria requests.Session (a Session não é thread-safe), mas todas as Sessions montam o mesmo
+    HTTPAdapter, cujo pool de conexões (urllib3) é thread-safe e compartilhado.
+
+    Atributos:
+        timeout_conexao (float): Segundos para estabelecer a conexão com o servidor.
+        timeout_leitura (float): Segundos sem receber dados do servidor até desistir da resposta.
+        conexoes_por_host (int): Conexões mantidas abertas por host (também o limite de requisições simultâneas reaproveitando conexões).
+        hosts_no_pool (int): Quantidade de hosts diferentes com pool de conexões mantido.
+        adaptador (HTTPAdapter): Adaptador compartilhado que contém o pool de conexões.
+    """
+    def __init__(self, timeout_conexao: float = TIMEOUT_CONEXAO, timeout_leitura: float = TIMEOUT_LEITURA,
+                 conexoes_por_host: int = CONEXOES_POR_HOST, hosts_no_pool: int = HOSTS_NO_POOL):
+        self.timeout_conexao = timeout_conexao
+        self.timeout_leitura = timeout_leitura
+        self.conexoes_por_host = conexoes_por_host
+        self.hosts_no_pool = hosts_no_pool
+        self.adaptador = HTTPAdapter(pool_connections=hosts_no_pool, pool_maxsize=conexoes_por_host, max_retries=0)
+        self.sessoes = threading.local()
+        self.trava_metricas = threading.Lock()
+        self.zerarMetricas()
+
+    def sessao(self) -> requests.Session:
+        """
+        Session da thread corrente, criada na primeira chamada com o adaptador compartilhado.
+        """
+        sessao = getattr(self.sessoes, "sessao", None)
+        if sessao is None:
+            sessao = requests.Session()
+            sessao.mount("http://", self.adaptador)
+            sessao.mount("https://", self.adaptador)
+            self.sessoes.sessao = sessao
+        return sessao
+
+    def get(self, url: str, cabecalhos: dict = None, timeout: float = None) -> requests.Response:
+        """
+        Faz o GET da url pelo pool de conexões, com os cabeçalhos HTTP adicionais informados (p.ex. If-None-Match).
+        timeout: segundos que restam para esta requisição, que reduzem os timeouts de conexão e de leitura do cliente.
+        Levanta requests.Timeout ou outra requests.RequestException em caso de falha.
+        """
+        timeouts = (self.timeout_conexao, self.timeout_leitura)
+        if timeout is not None:
+            timeouts = (min(self.timeout_conexao, timeout), min(self.timeout_leitura, timeout))
+        inicio = time.perf_counter()
+        try:
+            resposta = self.sessao().get(url, headers=cabecalhos, timeout=timeouts)
+        except requests.Timeout:
+            self.registrarRequisicao(inicio, "timeouts")
+            raise
+        except requests.RequestException:
+            self.registrarRequisicao(inicio, "erros")
+            raise
+        self.registrarRequisicao(inicio, resposta=resposta)
+        return resposta
+
+    def registrarRequisicao(self, inicio: float, falha: str = None, resposta: requests.Response = None):
+        duracao = time.perf_counter() - inicio
+        with self.trava_metricas:
+            self.metricas["requisicoes"] += 1
+            self.metricas["tempo_total"] += duracao
+            if falha:
+                self.metricas[falha] += 1
+            if resposta is not None:
+                self.metricas["bytes_recebidos"] += len(resposta.content)
+                if resposta.status_code == 304:
+                    self.metricas["nao_modificadas"] += 1
+
+    def zerarMetricas(self):
+        with self.trava_metricas:
+            self.metricas = {"requisicoes": 0, "timeouts": 0, "erros": 0, "nao_modificadas": 0, "bytes_recebidos": 0, "tempo_total": 0.0}
+            self.contagem_inicial_pools = self.contarConexoes()
+
+    def contarConexoes(self) -> tuple:
+        """
+        Retorna (conexões abertas, requisições feitas) somadas em todos os pools de host ativos do adaptador.
+        """
+        conexoes_abertas = 0
+        requisicoes_http = 0
+        pools = self.adaptador.poolmanager.pools
+        for chave in list(pools.keys()):
+            pool = pools.get(chave)
+            if pool is not None:
+                conexoes_abertas += pool.num_connections
+                requisicoes_http += pool.num_requests
+        return conexoes_abertas, requisicoes_http
+
+    def obterMetricas(self) -> dict:
+        """
+        Requisições, falhas, respostas 304, bytes recebidos, latência média e reuso das conexões, desde zerarMetricas.
+        """
+        with self.trava_metricas:
+            metricas = dict(self.metricas)
+            conexoes_iniciais, requisicoes_iniciais = self.contagem_inicial_pools
+        conexoes_abertas, requisicoes_http = self.contarConexoes()
+        conexoes_abertas -= conexoes_iniciais
+        requisicoes_http -= requisicoes_iniciais
+        conexoes_reutilizadas = max(requisicoes_http - conexoes_abertas, 0)
+        requisicoes = metricas["requisicoes"]
+        return {
+            "requisicoes": requisicoes,
+            "timeouts": metricas["timeouts"],
+            "erros": metricas["erros"],
+            "nao_modificadas": metricas["nao_modificadas"],
+            "bytes_recebidos": metricas["bytes_recebidos"],
+            "latencia_media_ms": round(metricas["tempo_total"] / requisicoes * 1000, 1) if requisicoes else 0.0,
+            "conexoes_abertas": conexoes_abertas,
+            "conexoes_reutilizadas": conexoes_reutilizadas,
+            "taxa_reuso_conexoes": round(conexoes_reutilizadas / requisicoes_http, 3) if requisicoes_http else 0.0,
+            "timeout_conexao": self.timeout_conexao,
+            "timeout_leitura": self.timeout_leitura,
+            "conexoes_por_host": self.conexoes_por_host,
+        }
@@ -0,0 +1,95 @@
+"""
+Disjuntor (circuit breaker) das requisições ao site da Embrapa: estados "fechado", "aberto" e "semiaberto".
+"""
+
+import threading
+import time
+
+ESTADO_FECHADO = "fechado"
+ESTADO_ABERTO = "aberto"
+ESTADO_SEMIABERTO = "semiaberto"
+
+LIMITE_FALHAS = 5
+INTERVALO_TESTE = 30.0
+
+class DisjuntorAberto(Exception):
+    """
+    Requisição rejeitada sem acessar o site, porque o disjuntor está aberto.
+    """
+    pass
+
+class Disjuntor:
+    """
+    Disjuntor com os estados fechado, aberto e semiaberto.  Pode ser usado por várias threads ao mesmo tempo.
+
+    Atributos:
+        limite_falhas (int): Falhas seguidas que abrem o disjuntor.
+        intervalo_teste (float): Segundos com o disjuntor aberto até a próxima requisição de teste.
+        estado (str): Estado atual (ESTADO_FECHADO, ESTADO_ABERTO ou ESTADO_SEMIABERTO).
+        falhas_seguidas (int): Falhas desde o último sucesso.
+        aberto_em (float): Momento (time.monotonic) da última abertura, ou None se nunca abriu.
+    """
+    def __init__(self, limite_falhas: int = LIMITE_FALHAS, intervalo_teste: float = INTERVALO_TESTE):
+        self.limite_falhas = max(limite_falhas, 1)
+        self.intervalo_teste = intervalo_teste
+        self.trava = threading.Lock()
+        self.estado = ESTADO_FECHADO
+        self.falhas_seguidas = 0
+        self.aberto_em = None
+        self.aberturas = 0
+        self.rejeitadas = 0
+
+    def permitirRequisicao(self) -> bool:
+        """
+        Indica se a requisição pode ser feita.  Com o disjuntor aberto e o intervalo de teste esgotado, passa para
+        semiaberto e permite esta requisição, que é a de teste.
+        """
+        with self.trava:
+            if self.estado == ESTADO_FECHADO:
+                return True
+            if self.estado == ESTADO_ABERTO and time.monotonic() - self.aberto_em >= self.intervalo_teste:
+                self.estado = ESTADO_SEMIABERTO
+                return True
+            self.rejeitadas += 1
+            return False
+
+    def verificar(self):
+        """
+        Levanta DisjuntorAberto se a requisição não puder ser feita (ver permitirRequisicao).
+        """
+        if not self.permitirRequisicao():
+            raise DisjuntorAberto(f"Site indisponível: disjuntor aberto após {self.falhas_seguidas} falhas seguidas.")
+
+    def registrarSucesso(self):
+        with self.trava:
+            self.estado = ESTADO_FECHADO
+            self.falhas_seguidas = 0
+
+    def registrarFalha(self):
+        with self.trava:
+            self.falhas_seguidas += 1
+            if self.estado == ESTADO_SEMIABERTO or (self.estado == ESTADO_FECHADO and self.falhas_seguidas >= self.limite_falhas):
+                self.estado = ESTADO_ABERTO
+                self.aberto_em = time.monotonic()
+                self.aberturas += 1
+
+    def fechar(self):
+        """
+        Fecha o disjuntor manualmente, voltando a permitir todas as requisições.
+        """
+        self.registrarSucesso()
+
+    def obterMetricas(self) -> dict:
+        with self.trava:
+            proximo_teste = None
+            if self.estado == ESTADO_ABERTO:
+                proximo_teste = round(max(self.aberto_em + self.intervalo_teste - time.monotonic(), 0.0), 1)
+            return {
+                "estado": self.estado,
+                "falhas_seguidas": self.falhas_seguidas,
+                "aberturas": self.aberturas,
+                "rejeitadas": self.rejeitadas,
+                "segundos_para_teste": proximo_teste,
+                "limite_falhas": self.limite_falhas,
+                "intervalo_teste": self.intervalo_teste,
+            }
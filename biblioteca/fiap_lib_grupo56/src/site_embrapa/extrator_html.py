@@ -0,0 +1,156 @@
+"""
+Extração das linhas da tabela de dados (table.tb_base.tb_dados tbody tr) das páginas do site da Embrapa.
+
+Cada linha é retornada como (classe, texto_coluna_0, texto_coluna_1, ...), com a classe da primeira célula ("tb_item",
+"tb_subitem" ou "").
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Tuple, Union
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+EXTRATOR_HTMLPARSER = "htmlparser"
+EXTRATOR_LXML = "lxml"
+EXTRATOR_BS4 = "bs4"
+
+LinhaTabela = Tuple[str, ...]
+
+CLASSES_TABELA_DADOS = {"tb_base", "tb_dados"}
+INICIO_TABELA = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+ATRIBUTO_CLASS = re.compile(r"""\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+FIM_TABELA = re.compile(r"</table\s*>", re.IGNORECASE)
+
+def decodificar(conteudo: Union[bytes, str]) -> str:
+    """
+    Decodifica o conteúdo da resposta HTTP pelas mesmas regras do BeautifulSoup (BOM, charset declarado na página, utf-8, windows-1252).
+    """
+    if isinstance(conteudo, str):
+        return conteudo
+    return UnicodeDammit(conteudo, is_html=True).unicode_markup or ""
+
+def trechos_tabela_dados(html: str) -> List[str]:
+    """
+    Trechos do HTML com as tabelas de classes tb_base e tb_dados, da tag <table> até o </table> seguinte.
+    """
+    trechos = []
+    posicao = 0
+    while True:
+        inicio = INICIO_TABELA.search(html, posicao)
+        if inicio is None:
+            return trechos
+        posicao = inicio.end()
+        atributo_class = ATRIBUTO_CLASS.search(inicio.group())
+        classes = "".join(atributo_class.groups(default="")).split() if atributo_class else ()
+        if CLASSES_TABELA_DADOS.issubset(classes):
+            fim = FIM_TABELA.search(html, posicao)
+            posicao = fim.end() if fim else len(html)
+            trechos.append(html[inicio.start():posicao])
+
+class ParserTabelaDados(HTMLParser):
+    """
+    Percorre o trecho da tabela de dados guardando, para cada tr dentro de tbody, a classe da primeira td e o texto das td.
+
+    Atributos:
+        linhas (List[LinhaTabela]): Linhas extraídas, na ordem do documento.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.linhas = []
+        self.dentro_tbody = 0
+        self.classe = None
+        self.textos = None
+        self.partes_celula = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tbody":
+            self.dentro_tbody += 1
+        elif not self.dentro_tbody:
+            return
+        elif tag == "tr":
+            self.fecharLinha()
+            self.classe = ""
+            self.textos = []
+        elif tag == "td" and self.textos is not None:
+            self.fecharCelula()
+            if not self.textos:
+                classe = next((valor or "" for nome, valor in attrs if nome == "class"), "")
+                self.classe = " ".join(classe.split())
+            self.partes_celula = []
+
+    def handle_endtag(self, tag):
+        if tag == "td":
+            self.fecharCelula()
+        elif tag == "tr":
+            self.fecharLinha()
+        elif tag == "tbody" and self.dentro_tbody:
+            self.fecharLinha()
+            self.dentro_tbody -= 1
+
+    def handle_data(self, data):
+        if self.partes_celula is not None:
+            self.partes_celula.append(data)
+
+    def fecharCelula(self):
+        if self.partes_celula is not None:
+            self.textos.append("".join(self.partes_celula).strip())
+            self.partes_celula = None
+
+    def fecharLinha(self):
+        if self.textos is not None:
+            self.fecharCelula()
+            self.linhas.append((self.classe, *self.textos))
+            self.textos = None
+
+def extrair_linhas_htmlparser(conteudo: Union[bytes, str]) -> List[LinhaTabela]:
+    linhas = []
+    for trecho in trechos_tabela_dados(decodificar(conteudo)):
+        parser = ParserTabelaDados()
+        parser.feed(trecho)
+        parser.close()
+        parser.fecharLinha()
+        linhas.extend(parser.linhas)
+    return linhas
+
+def extrair_linhas_lxml(conteudo: Union[bytes, str]) -> List[LinhaTabela]:
+    linhas = []
+    for trecho in trechos_tabela_dados(decodificar(conteudo)):
+        tabela = lxml.html.fragment_fromstring(trecho)
+        for tr in tabela.iterfind(".//tbody//tr"):
+            celulas = tr.findall(".//td")
+            classe = " ".join(celulas[0].get("class", "").split()) if celulas else ""
+            linhas.append((classe, *(celula.text_content().strip() for celula in celulas)))
+    return linhas
+
+def extrair_linhas_bs4(conteudo: Union[bytes, str]) -> List[LinhaTabela]:
+    linhas = []
+    for trecho in trechos_tabela_dados(decodificar(conteudo)):
+        for tr in BeautifulSoup(trecho, "html.parser").select("tbody tr"):
+            celulas = tr.find_all("td")
+            classe = " ".join(celulas[0].get("class", [])) if celulas else ""
+            linhas.append((classe, *(celula.text.strip() for celula in celulas)))
+    return linhas
+
+EXTRATORES: Dict[str, Callable[[Union[bytes, str]], List[LinhaTabela]]] = {
+    EXTRATOR_HTMLPARSER: extrair_linhas_htmlparser,
+    EXTRATOR_BS4: extrair_linhas_bs4,
+}
+if lxml is not None:
+    EXTRATORES[EXTRATOR_LXML] = extrair_linhas_lxml
+
+def obter_extrator(nome: str = None) -> Callable[[Union[bytes, str]], List[LinhaTabela]]:
+    """
+    Extrator pelo nome (ver EXTRATORES).  Sem nome, o mais rápido disponível: lxml, se instalado, senão htmlparser.
+    Levanta ValueError se o extrator não existir ou depender de pacote não instalado.
+    """
+    if nome is None:
+        nome = EXTRATOR_LXML if EXTRATOR_LXML in EXTRATORES else EXTRATOR_HTMLPARSER
+    if nome not in EXTRATORES:
+        raise ValueError(f"Extrator [{nome}] indisponível. Disponíveis: {', '.join(EXTRATORES)}.")
+    return EXTRATORES[nome]
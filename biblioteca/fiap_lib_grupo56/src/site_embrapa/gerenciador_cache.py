@@ -0,0 +1,160 @@
+"""
+Gerenciamento da memória das páginas (opcao, subopcao, ano) carregadas nos repositórios: tempo de vida e LRU/LFU.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# (opcao, subopcao, ano)
+PaginaAno = Tuple[str, Optional[str], int]
+
+POLITICA_LRU = "lru"
+POLITICA_LFU = "lfu"
+POLITICAS = (POLITICA_LRU, POLITICA_LFU)
+
+# Memória média de um registro anual nos repositórios, incluindo índices e totais: medida por benchmarks/memoria_registros.py,
+# que deve ser executado novamente ao alterar os repositórios ou o modelo_dados (ele mostra a diferença para este valor)
+BYTES_POR_REGISTRO = 34
+
+class EntradaCache:
+    """
+    Página acompanhada pelo gerenciador.
+
+    Atributos:
+        tamanho (int): Bytes estimados dos registros da página.
+        acessos (int): Consultas respondidas com a página desde a sua carga.
+        carregada_em (float): Momento (time.monotonic) da carga da página nos repositórios.
+    """
+    __slots__ = ('tamanho', 'acessos', 'carregada_em')
+
+    def __init__(self, tamanho: int, acessos: int, carregada_em: float):
+        self.tamanho = tamanho
+        self.acessos = acessos
+        self.carregada_em = carregada_em
+
+class GerenciadorCache:
+    """
+    Páginas carregadas nos repositórios, em ordem de uso, com o tamanho estimado de cada uma.  Não altera os repositórios:
+    registrar e acessar indicam as páginas a descartar, que o SiteEmbrapa remove sob a sua trava.  Pode ser usado por
+    várias threads ao mesmo tempo.
+
+    Atributos:
+        limite_bytes (int): Memória estimada máxima das páginas acompanhadas.  None: sem limite.
+        tempo_vida (float): Segundos, desde a carga, até que a página seja descartada.  None: as páginas não vencem.
+        politica (str): POLITICA_LRU ou POLITICA_LFU, para a escolha das páginas descartadas por limite de memória.
+        bytes_por_registro (int): Bytes estimados por registro anual.
+        entradas (OrderedDict): Por página (opcao, subopcao, ano), a sua EntradaCache, da usada há mais tempo à mais recente.
+    """
+    def __init__(self, limite_bytes: int = None, tempo_vida: float = None, politica: str = POLITICA_LRU,
+                 bytes_por_registro: int = BYTES_POR_REGISTRO):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política [{politica}] desconhecida.")
+        self.limite_bytes = limite_bytes
+        self.tempo_vida = tempo_vida
+        self.politica = politica
+        self.bytes_por_registro = bytes_por_registro
+        self.trava = threading.Lock()
+        self.entradas = OrderedDict()
+        self.total_bytes = 0
+        self.metricas = {"registradas": 0, "acertos": 0, "descartadas_limite": 0, "vencidas": 0}
+
+    def registrar(self, pagina: PaginaAno, quantidade_registros: int) -> List[PaginaAno]:
+        """
+        Registra a página, recém-carregada com a quantidade de registros informada, como a usada mais recentemente (os
+        acessos de uma carga anterior da mesma página são mantidos).  Retorna as páginas a descartar: as vencidas e as
+        escolhidas pela política até o total voltar ao limite.  A página registrada nunca é descartada, mesmo que sozinha
+        ultrapasse o limite.
+        """
+        agora = time.monotonic()
+        with self.trava:
+            anterior = self.entradas.pop(pagina, None)
+            if anterior is not None:
+                self.total_bytes -= anterior.tamanho
+            entrada = EntradaCache(quantidade_registros * self.bytes_por_registro, anterior.acessos if anterior else 0, agora)
+            self.metricas["registradas"] += 1
+            descartadas = self.retirarVencidas(agora)
+            while self.limite_bytes is not None and self.entradas and self.total_bytes + entrada.tamanho > self.limite_bytes:
+                descartada = self.escolherDescarte()
+                self.retirar(descartada)
+                self.metricas["descartadas_limite"] += 1
+                descartadas.append(descartada)
+            self.entradas[pagina] = entrada
+            self.total_bytes += entrada.tamanho
+        return descartadas
+
+    def acessar(self, pagina: PaginaAno) -> bool:
+        """
+        Registra uma consulta respondida com a página.  Retorna False se a página venceu: ela deixa de ser acompanhada e deve
+        ser descartada dos repositórios.  Páginas não acompanhadas (p.ex. carregadas dos arquivos .CSV) retornam True.
+        """
+        with self.trava:
+            entrada = self.entradas.get(pagina)
+            if entrada is None:
+                return True
+            if self.vencida(entrada, time.monotonic()):
+                self.retirar(pagina)
+                self.metricas["vencidas"] += 1
+                return False
+            entrada.acessos += 1
+            self.entradas.move_to_end(pagina)
+            self.metricas["acertos"] += 1
+            return True
+
+    def vencida(self, entrada: EntradaCache, agora: float) -> bool:
+        return self.tempo_vida is not None and agora - entrada.carregada_em > self.tempo_vida
+
+    def retirarVencidas(self, agora: float) -> List[PaginaAno]:
+        """
+        Deixa de acompanhar e retorna as páginas vencidas.  Chamado com a trava adquirida.
+        """
+        if self.tempo_vida is None:
+            return []
+        vencidas = [pagina for pagina, entrada in self.entradas.items() if self.vencida(entrada, agora)]
+        for pagina in vencidas:
+            self.retirar(pagina)
+        self.metricas["vencidas"] += len(vencidas)
+        return vencidas
+
+    def escolherDescarte(self) -> PaginaAno:
+        """
+        Página a descartar por limite de memória, conforme a política.  Chamado com a trava adquirida e entradas não vazias.
+        """
+        if self.politica == POLITICA_LFU:
+            # min retorna a primeira das menos acessadas, na ordem de uso: o empate fica com a usada há mais tempo
+            return min(self.entradas, key=lambda pagina: self.entradas[pagina].acessos)
+        return next(iter(self.entradas))
+
+    def retirar(self, pagina: PaginaAno):
+        entrada = self.entradas.pop(pagina, None)
+        if entrada is not None:
+            self.total_bytes -= entrada.tamanho
+
+    def remover(self, pagina: PaginaAno):
+        """
+        Deixa de acompanhar a página (p.ex. removida dos repositórios por outro motivo).
+        """
+        with self.trava:
+            self.retirar(pagina)
+
+    def descartarOpcao(self, opcao: str):
+        """
+        Deixa de acompanhar as páginas da opção (p.ex. ao recarregar os seus repositórios).
+        """
+        with self.trava:
+            for pagina in [pagina for pagina in self.entradas if pagina[0] == opcao]:
+                self.retirar(pagina)
+
+    def limpar(self):
+        with self.trava:
+            self.entradas = OrderedDict()
+            self.total_bytes = 0
+
+    def obterMetricas(self) -> dict:
+        """
+        Páginas acompanhadas e a sua memória estimada, acertos e páginas descartadas por limite de memória e por tempo de vida.
+        """
+        with self.trava:
+            return dict(self.metricas, entradas=len(self.entradas), bytes_estimados=self.total_bytes,
+                        limite_bytes=self.limite_bytes, tempo_vida=self.tempo_vida, politica=self.politica)
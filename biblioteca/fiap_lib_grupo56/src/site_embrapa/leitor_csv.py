@@ -0,0 +1,266 @@
+"""
+Leitura dos arquivos .CSV da Embrapa para linhas intermediárias (anos, linhas), sem criar objetos do modelo_dados.
+
+    Produção e Comercialização: (nome_categoria, nome_produto, valores) - nome_produto None indica linha de categoria
+    Processamento:              (nome_categoria, nome_cultivar, valores) - nome_cultivar None indica linha de categoria
+    Importação e Exportação:    (nome_pais, quantidades, valores)
+"""
+
+import csv
+import re
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.resources import files, as_file
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from modelo_dados.processamento import EnumTipoUva_proc
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
+from site_embrapa.opcoes import OPCAO_PRODUCAO, OPCAO_PROCESSAMENTO, OPCAO_COMERCIALIZACAO, OPCAO_IMPORTACAO, OPCAO_EXPORTACAO
+from site_embrapa.opcoes import SUBOPCOES_PROCESSAMENTO, SUBOPCOES_IMPORTACAO, SUBOPCOES_EXPORTACAO
+
+# Arquivo .CSV (e delimitador) de cada página do site, por (opcao, subopcao), na ordem da carga completa
+ARQUIVOS_CSV = {
+    (OPCAO_PRODUCAO, None): ("producao.csv", ";"),
+    (OPCAO_COMERCIALIZACAO, None): ("comercio.csv", ";"),
+    (OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[EnumTipoUva_proc.VINIFERAS]): ("processaviniferas.csv", ";"),
+    (OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[EnumTipoUva_proc.AMERICANASEHIBRIDAS]): ("processaamericanas.csv", "\t"),
+    (OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[EnumTipoUva_proc.UVASDEMESA]): ("processamesa.csv", "\t"),
+    (OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[EnumTipoUva_proc.SEMCLASSIFICACAO]): ("processasemclass.csv", "\t"),
+    (OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[EnumCategoria_im_ex.VINHOSDEMESA]): ("impvinhos.csv", ";"),
+    (OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[EnumCategoria_im_ex.ESPUMANTES]): ("impespumantes.csv", ";"),
+    (OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[EnumCategoria_im_ex.UVASFRESCAS]): ("impfrescas.csv", ";"),
+    (OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[EnumCategoria_im_ex.UVASPASSAS]): ("imppassas.csv", ";"),
+    (OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[EnumCategoria_im_ex.SUCODEUVA]): ("impsuco.csv", ";"),
+    (OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[EnumCategoria_im_ex.VINHOSDEMESA]): ("expvinho.csv", ";"),
+    (OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[EnumCategoria_im_ex.ESPUMANTES]): ("expespumantes.csv", ";"),
+    (OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[EnumCategoria_im_ex.UVASFRESCAS]): ("expuva.csv", ";"),
+    (OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[EnumCategoria_im_ex.SUCODEUVA]): ("expsuco.csv", ";"),
+}
+
+LinhaCategorizada = Tuple[Optional[str], Optional[str], Tuple[int, ...]]
+LinhaPais = Tuple[str, Tuple[int, ...], Tuple[int, ...]]
+
+def valor_inteiro(texto: str) -> int:
+    """
+    Converte o texto de uma célula para int, descartando caracteres não numéricos (mesma regra das classes do modelo_dados).
+    Células só com dígitos, o caso comum nos .CSV, são convertidas diretamente, sem a expressão regular.
+    """
+    if not texto:
+        return 0
+    if texto.isdecimal():
+        return int(texto)
+    apenasNumericos = re.sub(r'\D', '', texto)
+    if apenasNumericos == "":
+        return 0
+    return int(apenasNumericos)
+
+def posicoes_anos_ausentes(anos: Tuple[int, ...], anos_carregados: Set[int]) -> List[int]:
+    """
+    Retorna as posições, em anos, dos anos que ainda não foram carregados nos repositórios.
+    """
+    return [posicao for posicao, ano in enumerate(anos) if ano not in anos_carregados]
+
+def linhas_do_ano(anos: Tuple[int, ...], linhas: list, ano: int) -> Tuple[Tuple[int, ...], list]:
+    """
+    Restringe as linhas intermediárias ao ano informado, que deve estar em anos: retorna ((ano,), linhas com um valor por série).
+    """
+    posicao = anos.index(ano)
+    return (ano,), [tuple(celula[posicao:posicao + 1] if isinstance(celula, tuple) else celula for celula in linha) for linha in linhas]
+
+def abrir_leitor(arquivo_csv: str, delimitador_arquivo: str, funcao):
+    """
+    Abre o arquivo .CSV empacotado na biblioteca e repassa para a função informada o cabeçalho ({nome da coluna: posição})
+    e as linhas (ver linhas_completas) do arquivo.
+    """
+    with as_file(files("site_embrapa.arquivos_csv").joinpath(arquivo_csv)) as caminho_csv:
+        with open(caminho_csv, mode='r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file, delimiter = delimitador_arquivo)
+            nomes_colunas = next(reader, [])
+            # Colunas repetidas: vale a última, como no csv.DictReader
+            cabecalho = {coluna: posicao for posicao, coluna in enumerate(nomes_colunas)}
+            return funcao(cabecalho, linhas_completas(reader, len(nomes_colunas)))
+
+def linhas_completas(reader, quantidade_colunas: int) -> Iterator[List[str]]:
+    """
+    Percorre as linhas do arquivo sempre com quantidade_colunas + 1 células: células ausentes (linhas curtas) ficam vazias e
+    as excedentes são descartadas.  A última célula, sempre vazia, é a posição usada para colunas ausentes do cabeçalho.
+    """
+    for linha in reader:
+        if len(linha) == quantidade_colunas:
+            linha.append("")
+        elif len(linha) < quantidade_colunas:
+            linha.extend([""] * (quantidade_colunas + 1 - len(linha)))
+        else:
+            del linha[quantidade_colunas:]
+            linha.append("")
+        yield linha
+
+def posicao_coluna(cabecalho: Dict[str, int], coluna: str) -> int:
+    """
+    Posição da coluna nas linhas do arquivo; se ela não existir no cabeçalho, a posição da célula sempre vazia.
+    """
+    return cabecalho.get(coluna, len(cabecalho))
+
+def seletor_valores(posicoes: List[int]) -> Callable[[List[str]], Tuple[int, ...]]:
+    """
+    Monta a função que extrai de uma linha os valores (int) das posições informadas, na mesma ordem.
+    """
+    if len(posicoes) == 1:
+        posicao = posicoes[0]
+        return lambda linha: (valor_inteiro(linha[posicao]),)
+    if not posicoes:
+        return lambda linha: ()
+    celulas = itemgetter(*posicoes)
+    return lambda linha: tuple(map(valor_inteiro, celulas(linha)))
+
+def colunas_de_ano(cabecalho: Dict[str, int]) -> Tuple[Tuple[int, ...], Callable[[List[str]], Tuple[int, ...]]]:
+    """
+    Retorna os anos das colunas do arquivo (colunas cujo nome é um ano, na ordem do arquivo) e o seletor dos seus valores.
+    """
+    colunas = [coluna for coluna in cabecalho if coluna.isdigit()]
+    return tuple(int(coluna) for coluna in colunas), seletor_valores([cabecalho[coluna] for coluna in colunas])
+
+def ler_linhas_producao(arquivo_csv: str, delimitador_arquivo: str) -> Tuple[Tuple[int, ...], List[LinhaCategorizada]]:
+    """
+    Lê o arquivo de produção.  Linhas em que control e produto coincidem são categorias.
+    """
+    def ler(cabecalho: Dict[str, int], reader: Iterator[List[str]]):
+        anos, valores_da_linha = colunas_de_ano(cabecalho)
+        posicao_categoria = posicao_coluna(cabecalho, "control")
+        posicao_produto = posicao_coluna(cabecalho, "produto")
+        linhas = []
+        nome_categoria_atual = None
+        for linha in reader:
+            nome_categoria = linha[posicao_categoria]
+            nome_produto = linha[posicao_produto]
+
+            if not nome_categoria or not nome_produto:
+                continue  # Pula linhas com dados incompletos
+
+            if nome_categoria == nome_produto:
+                nome_categoria_atual = nome_categoria
+                linhas.append((nome_categoria, None, ()))
+            else:
+                linhas.append((nome_categoria_atual, nome_produto, valores_da_linha(linha)))
+        return anos, linhas
+    return abrir_leitor(arquivo_csv, delimitador_arquivo, ler)
+
+def ler_linhas_comercializacao(arquivo_csv: str, delimitador_arquivo: str) -> Tuple[Tuple[int, ...], List[LinhaCategorizada]]:
+    """
+    Lê o arquivo de comercialização.  Uma categoria seguida imediatamente de outra categoria não possui produtos, e
+    passa a ser também o seu próprio produto, com os valores da própria linha de categoria.
+    """
+    def ler(cabecalho: Dict[str, int], reader: Iterator[List[str]]):
+        anos, valores_da_linha = colunas_de_ano(cabecalho)
+        posicao_categoria = posicao_coluna(cabecalho, "control")
+        posicao_produto = posicao_coluna(cabecalho, "Produto")
+        linhas = []
+        nome_categoria_atual = None
+        valores_categoria = None
+        for linha in reader:
+            nome_categoria = linha[posicao_categoria].strip()
+            nome_produto = linha[posicao_produto].strip()
+
+            if not nome_categoria or not nome_produto:
+                continue  # Pula linhas com dados incompletos
+
+            if nome_categoria == nome_produto:
+                if valores_categoria is not None:
+                    linhas.append((nome_categoria_atual, nome_categoria_atual, valores_categoria))
+                nome_categoria_atual = nome_categoria
+                valores_categoria = valores_da_linha(linha)
+                linhas.append((nome_categoria, None, ()))
+            else:
+                valores_categoria = None
+                linhas.append((nome_categoria_atual, nome_produto, valores_da_linha(linha)))
+        return anos, linhas
+    return abrir_leitor(arquivo_csv, delimitador_arquivo, ler)
+
+def ler_linhas_processamento(arquivo_csv: str, delimitador_arquivo: str) -> Tuple[Tuple[int, ...], List[LinhaCategorizada]]:
+    """
+    Lê um arquivo de processamento.  A linha 'Sem classificação' é, ao mesmo tempo, categoria e cultivar.
+    """
+    def ler(cabecalho: Dict[str, int], reader: Iterator[List[str]]):
+        anos, valores_da_linha = colunas_de_ano(cabecalho)
+        posicao_categoria = posicao_coluna(cabecalho, "control")
+        posicao_cultivar = posicao_coluna(cabecalho, "cultivar")
+        linhas = []
+        nome_categoria_atual = None
+        for linha in reader:
+            nome_categoria = linha[posicao_categoria]
+            nome_cultivar = linha[posicao_cultivar]
+
+            if not nome_categoria or not nome_cultivar:
+                continue  # Pula linhas com dados incompletos
+
+            if nome_categoria == nome_cultivar:
+                nome_categoria_atual = nome_categoria
+                linhas.append((nome_categoria, None, ()))
+            else:
+                if nome_cultivar == "Sem classificação":
+                    nome_categoria_atual = nome_cultivar
+                linhas.append((nome_categoria_atual, nome_cultivar, valores_da_linha(linha)))
+        return anos, linhas
+    return abrir_leitor(arquivo_csv, delimitador_arquivo, ler)
+
+def ler_linhas_importacao_exportacao(arquivo_csv: str, delimitador_arquivo: str) -> Tuple[Tuple[int, ...], List[LinhaPais]]:
+    """
+    Lê um arquivo de importação ou exportação.  Cada ano possui as colunas 'AAAAa' (quantidade) e 'AAAAb' (valor).
+    """
+    def ler(cabecalho: Dict[str, int], reader: Iterator[List[str]]):
+        colunas_anos = [coluna for coluna in cabecalho if coluna[:4].isdigit() and coluna[4:] == 'b']
+        anos = tuple(int(coluna[:4]) for coluna in colunas_anos)
+        quantidades_da_linha = seletor_valores([posicao_coluna(cabecalho, coluna[:4] + 'a') for coluna in colunas_anos])
+        valores_da_linha = seletor_valores([cabecalho[coluna] for coluna in colunas_anos])
+        posicao_pais = posicao_coluna(cabecalho, "País")
+        linhas = []
+        for linha in reader:
+            nome_pais = linha[posicao_pais]
+
+            if not nome_pais:
+                continue  # Pula linhas com dados incompletos
+
+            linhas.append((nome_pais, quantidades_da_linha(linha), valores_da_linha(linha)))
+        return anos, linhas
+    return abrir_leitor(arquivo_csv, delimitador_arquivo, ler)
+
+LEITORES_POR_OPCAO = {
+    OPCAO_PRODUCAO: ler_linhas_producao,
+    OPCAO_PROCESSAMENTO: ler_linhas_processamento,
+    OPCAO_COMERCIALIZACAO: ler_linhas_comercializacao,
+    OPCAO_IMPORTACAO: ler_linhas_importacao_exportacao,
+    OPCAO_EXPORTACAO: ler_linhas_importacao_exportacao,
+}
+
+def ler_linhas(opcao: str, subopcao: str = None) -> Tuple[Tuple[int, ...], list]:
+    """
+    Lê o arquivo .CSV correspondente à página (opcao, subopcao) do site.  Levanta KeyError se não houver arquivo para a página.
+    """
+    arquivo_csv, delimitador_arquivo = ARQUIVOS_CSV[(opcao, subopcao)]
+    return LEITORES_POR_OPCAO[opcao](arquivo_csv, delimitador_arquivo)
+
+# Modos de leitura paralela dos arquivos .CSV (ler_todas_linhas)
+PARALELISMO_THREADS = "threads"
+PARALELISMO_PROCESSOS = "processos"
+
+EXECUTORES_POR_PARALELISMO = {
+    PARALELISMO_THREADS: ThreadPoolExecutor,
+    PARALELISMO_PROCESSOS: ProcessPoolExecutor,
+}
+
+def ler_todas_linhas(paralelismo: Optional[str] = None, max_workers: Optional[int] = None) -> dict:
+    """
+    Lê todos os arquivos .CSV e retorna {(opcao, subopcao): (anos, linhas)}, na ordem de ARQUIVOS_CSV.
+
+    Sem paralelismo os arquivos são lidos um após o outro.  Com PARALELISMO_THREADS ou PARALELISMO_PROCESSOS cada arquivo é
+    lido por um worker do pool (max_workers: ver concurrent.futures); as linhas intermediárias só contêm str, int e tuplas,
+    por isso podem voltar de outro processo.  A conversão é feita em Python puro: threads disputam o GIL e praticamente
+    só processos reduzem o tempo total, e apenas em máquinas com mais de um núcleo.
+    """
+    paginas = list(ARQUIVOS_CSV)
+    if not paralelismo:
+        return {pagina: ler_linhas(*pagina) for pagina in paginas}
+    if paralelismo not in EXECUTORES_POR_PARALELISMO:
+        raise ValueError(f"Paralelismo inválido: {paralelismo}. Use {PARALELISMO_THREADS} ou {PARALELISMO_PROCESSOS}.")
+    with EXECUTORES_POR_PARALELISMO[paralelismo](max_workers=max_workers) as executor:
+        resultados = executor.map(ler_linhas, [opcao for opcao, _ in paginas], [subopcao for _, subopcao in paginas])
+        return dict(zip(paginas, resultados))
@@ -0,0 +1,110 @@
+"""
+Limitador de taxa (token bucket) das requisições ao site da Embrapa, com prioridade para as consultas interativas.
+
+O código de segundo plano usa "with segundo_plano():"; o contexto é herdado pelas tarefas asyncio e por asyncio.to_thread.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from collections import deque
+
+PRIORIDADE_INTERATIVA = "interativa"
+PRIORIDADE_SEGUNDO_PLANO = "segundo_plano"
+PRIORIDADES = (PRIORIDADE_INTERATIVA, PRIORIDADE_SEGUNDO_PLANO)
+
+REQUISICOES_POR_SEGUNDO = 5.0
+RAJADA = 10
+
+prioridade_atual = contextvars.ContextVar("prioridade_atual", default=PRIORIDADE_INTERATIVA)
+
+@contextlib.contextmanager
+def segundo_plano():
+    """
+    Executa o bloco com as requisições ao site na prioridade de segundo plano.
+    """
+    token = prioridade_atual.set(PRIORIDADE_SEGUNDO_PLANO)
+    try:
+        yield
+    finally:
+        prioridade_atual.reset(token)
+
+class LimitadorRequisicoes:
+    """
+    Balde de fichas compartilhado por todas as threads, com filas de espera por prioridade.
+
+    Atributos:
+        requisicoes_por_segundo (float): Taxa de reposição das fichas (requisições por segundo em regime contínuo).
+        rajada (int): Máximo de fichas acumuladas (requisições seguidas sem espera após um período ocioso).
+        fichas (float): Fichas disponíveis na última atualização.
+        filas (dict): Por prioridade, fila (ordem de chegada) das requisições em espera.
+    """
+    def __init__(self, requisicoes_por_segundo: float = REQUISICOES_POR_SEGUNDO, rajada: int = RAJADA):
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.rajada = max(rajada, 1)
+        self.condicao = threading.Condition()
+        self.fichas = float(self.rajada)
+        self.atualizado_em = time.monotonic()
+        self.filas = {prioridade: deque() for prioridade in PRIORIDADES}
+        self.metricas = {prioridade: {"atendidas": 0, "espera_total": 0.0, "espera_maxima": 0.0} for prioridade in PRIORIDADES}
+
+    def reabastecer(self, agora: float):
+        self.fichas = min(self.rajada, self.fichas + (agora - self.atualizado_em) * self.requisicoes_por_segundo)
+        self.atualizado_em = agora
+
+    def proximaDaVez(self, vez: object, prioridade: str) -> bool:
+        """
+        Indica se a requisição é a primeira da fila de maior prioridade com requisições em espera.
+        """
+        for fila_prioridade in PRIORIDADES:
+            if self.filas[fila_prioridade]:
+                return fila_prioridade == prioridade and self.filas[fila_prioridade][0] is vez
+        return False
+
+    def aguardar(self, prioridade: str = None):
+        """
+        Espera até haver uma ficha para a requisição e a consome.  Sem prioridade, usa a do contexto corrente.
+        """
+        prioridade = prioridade or prioridade_atual.get()
+        inicio = time.monotonic()
+        vez = object()
+        with self.condicao:
+            self.filas[prioridade].append(vez)
+            try:
+                while True:
+                    agora = time.monotonic()
+                    self.reabastecer(agora)
+                    if self.proximaDaVez(vez, prioridade):
+                        if self.fichas >= 1:
+                            self.fichas -= 1
+                            break
+                        self.condicao.wait((1 - self.fichas) / self.requisicoes_por_segundo)
+                    else:
+                        self.condicao.wait()
+            finally:
+                self.filas[prioridade].remove(vez)
+                self.condicao.notify_all()
+            espera = time.monotonic() - inicio
+            metricas = self.metricas[prioridade]
+            metricas["atendidas"] += 1
+            metricas["espera_total"] += espera
+            metricas["espera_maxima"] = max(metricas["espera_maxima"], espera)
+
+    def obterMetricas(self) -> dict:
+        """
+        Por prioridade: requisições em espera (profundidade da fila), atendidas e tempo de espera médio e máximo.
+        """
+        with self.condicao:
+            self.reabastecer(time.monotonic())
+            metricas = {"requisicoes_por_segundo": self.requisicoes_por_segundo, "rajada": self.rajada,
+                        "fichas_disponiveis": round(self.fichas, 2)}
+            for prioridade in PRIORIDADES:
+                atendidas = self.metricas[prioridade]["atendidas"]
+                metricas[prioridade] = {
+                    "em_espera": len(self.filas[prioridade]),
+                    "atendidas": atendidas,
+                    "espera_media_ms": round(self.metricas[prioridade]["espera_total"] / atendidas * 1000, 1) if atendidas else 0.0,
+                    "espera_maxima_ms": round(self.metricas[prioridade]["espera_maxima"] * 1000, 1),
+                }
+            return metricas
@@ -0,0 +1,50 @@
+"""
+Códigos de opção (aba) e subopção (botão) das páginas do site da Embrapa (index.php?opcao=...&subopcao=...).
+"""
+
+from modelo_dados.processamento import EnumTipoUva_proc
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
+
+OPCAO_PRODUCAO = "opt_02"
+OPCAO_PROCESSAMENTO = "opt_03"
+OPCAO_COMERCIALIZACAO = "opt_04"
+OPCAO_IMPORTACAO = "opt_05"
+OPCAO_EXPORTACAO = "opt_06"
+
+# Faixa de anos com dados no site
+ANO_INICIAL_SITE = 1970
+ANO_FINAL_SITE = 2023
+
+SUBOPCOES_PROCESSAMENTO = {
+    EnumTipoUva_proc.VINIFERAS: "subopt_01",
+    EnumTipoUva_proc.AMERICANASEHIBRIDAS: "subopt_02",
+    EnumTipoUva_proc.UVASDEMESA: "subopt_03",
+    EnumTipoUva_proc.SEMCLASSIFICACAO: "subopt_04",
+}
+
+SUBOPCOES_IMPORTACAO = {
+    EnumCategoria_im_ex.VINHOSDEMESA: "subopt_01",
+    EnumCategoria_im_ex.ESPUMANTES: "subopt_02",
+    EnumCategoria_im_ex.UVASFRESCAS: "subopt_03",
+    EnumCategoria_im_ex.UVASPASSAS: "subopt_04",
+    EnumCategoria_im_ex.SUCODEUVA: "subopt_05",
+}
+
+SUBOPCOES_EXPORTACAO = {
+    EnumCategoria_im_ex.VINHOSDEMESA: "subopt_01",
+    EnumCategoria_im_ex.ESPUMANTES: "subopt_02",
+    EnumCategoria_im_ex.UVASFRESCAS: "subopt_03",
+    EnumCategoria_im_ex.SUCODEUVA: "subopt_04",
+}
+
+TIPOS_UVA_POR_SUBOPCAO = {subopcao: tipo_uva for tipo_uva, subopcao in SUBOPCOES_PROCESSAMENTO.items()}
+CATEGORIAS_IMPORTACAO_POR_SUBOPCAO = {subopcao: categoria for categoria, subopcao in SUBOPCOES_IMPORTACAO.items()}
+CATEGORIAS_EXPORTACAO_POR_SUBOPCAO = {subopcao: categoria for categoria, subopcao in SUBOPCOES_EXPORTACAO.items()}
+
+# Páginas (opcao, subopcao) do site que possuem dados por ano; subopcao None para páginas sem subopções
+PAGINAS_SITE = (
+    [(OPCAO_PRODUCAO, None), (OPCAO_COMERCIALIZACAO, None)]
+    + [(OPCAO_PROCESSAMENTO, subopcao) for subopcao in SUBOPCOES_PROCESSAMENTO.values()]
+    + [(OPCAO_IMPORTACAO, subopcao) for subopcao in SUBOPCOES_IMPORTACAO.values()]
+    + [(OPCAO_EXPORTACAO, subopcao) for subopcao in SUBOPCOES_EXPORTACAO.values()]
+)
@@ -0,0 +1,59 @@
+"""
+Páginas sintéticas no layout do site da Embrapa, montadas a partir dos arquivos .CSV, para os testes e os benchmarks do
+webscraping sem acesso à rede.
+"""
+
+import functools
+import html
+from site_embrapa import leitor_csv
+from site_embrapa.opcoes import OPCAO_IMPORTACAO, OPCAO_EXPORTACAO
+
+MENU = "".join(f'<li><button type="submit" class="btn_opt" name="opcao" value="opt_0{i}">Opção {i}</button></li>\n' for i in range(1, 8))
+CABECALHO = ('<html><head><meta charset="utf-8"><title>Banco de dados de uva, vinho e derivados</title>'
+             + '<link rel="stylesheet" href="css/estilo.css"><script src="js/funcoes.js"></script></head><body>'
+             + '<div id="cabecalho"><img src="img/logo.png" alt="Embrapa">' + "<p>Vitivinicultura brasileira</p>" * 40 + "</div>"
+             + "<form method='get'><ul class='menu'>" + MENU * 20 + "</ul>"
+             + "<div class='content_center'><p class='text_center'>Ano: <input type='number' name='ano' min='1970' max='2023'></p>")
+RODAPE = "</div></form>" + "<div id='rodape'><p>Embrapa Uva e Vinho - Bento Gonçalves, RS</p></div>" * 30 + "</body></html>"
+
+def formatar(valor: int) -> str:
+    return f"{valor:,}".replace(",", ".") if valor else "-"
+
+@functools.lru_cache(maxsize=None)
+def linhas_da_pagina(opcao: str, subopcao: str):
+    return leitor_csv.ler_linhas(opcao, subopcao)
+
+def pagina_sintetica(opcao: str, subopcao: str, ano: int) -> bytes:
+    """
+    Página no layout do site da Embrapa com a tabela de dados (tb_item / tb_subitem, números com separador de milhar) do
+    ano, montada a partir do arquivo .CSV da página, e um cabeçalho e menu de tamanho semelhante ao das páginas reais.
+    """
+    anos, linhas = linhas_da_pagina(opcao, subopcao)
+    posicao = anos.index(ano)
+    tr = []
+    if opcao in (OPCAO_IMPORTACAO, OPCAO_EXPORTACAO):
+        for nome_pais, quantidades, valores in linhas:
+            tr.append(f"<tr><td>{html.escape(nome_pais)}</td><td>{formatar(quantidades[posicao])}</td><td>{formatar(valores[posicao])}</td></tr>")
+    else:
+        totais = {}
+        categorias = set()
+        for nome_categoria, nome_item, valores in linhas:
+            if nome_item is None:
+                categorias.add(nome_categoria)
+            else:
+                totais[nome_categoria] = totais.get(nome_categoria, 0) + valores[posicao]
+        for nome_categoria, nome_item, valores in linhas:
+            if nome_item is None:
+                texto, classe, valor = nome_categoria, "tb_item", totais.get(nome_categoria, 0)
+            elif nome_item == nome_categoria:
+                # Categoria sem itens (Comercialização) ou página sem categorias (Processamento sem classificação): o site
+                # mostra apenas a linha tb_item, com o valor da própria categoria
+                if nome_categoria in categorias:
+                    continue
+                texto, classe, valor = nome_item, "tb_item", valores[posicao]
+            else:
+                texto, classe, valor = nome_item, "tb_subitem", valores[posicao]
+            tr.append(f'<tr>\n<td class="{classe}">\n  {html.escape(texto)}  </td>\n<td class="{classe}">\n  {formatar(valor)}  </td>\n</tr>')
+    tabela = ('<table class="tb_base tb_dados"><thead><tr><th>Produto</th><th>Quantidade</th></tr></thead><tbody>'
+              + "\n".join(tr) + '</tbody><tfoot class="tb_total"><tr><td>Total</td><td>-</td></tr></tfoot></table>')
+    return (CABECALHO + tabela + RODAPE).encode("utf-8")
@@ -0,0 +1,89 @@
+"""
+Política de retentativas das requisições ao site da Embrapa: espera exponencial com jitter e Retry-After.
+"""
+
+import random
+import threading
+from typing import Iterable, Optional, Tuple, Type
+import requests
+
+MAX_TENTATIVAS = 3
+ESPERA_INICIAL = 0.25
+ESPERA_MAXIMA = 4.0
+MULTIPLICADOR = 2.0
+PRAZO_TOTAL = 15.0
+STATUS_RETENTAVEIS = (429, 500, 502, 503, 504)
+EXCECOES_RETENTAVEIS = (requests.ConnectionError, requests.Timeout)
+
+class PoliticaRetentativas:
+    """
+    Quando e quanto esperar para repetir uma requisição que falhou.  Pode ser usada por várias threads ao mesmo tempo.
+
+    Atributos:
+        max_tentativas (int): Total de tentativas por requisição, incluindo a primeira (1: sem retentativas).
+        espera_inicial (float): Limite da espera sorteada, em segundos, antes da segunda tentativa.
+        espera_maxima (float): Limite da espera sorteada entre duas tentativas.
+        multiplicador (float): Fator de crescimento do limite da espera a cada tentativa.
+        prazo_total (float): Segundos, desde o início da primeira tentativa, após os quais não é feita nova tentativa.
+        status_retentaveis (frozenset): Status HTTP (de requests.HTTPError) que permitem nova tentativa.
+        excecoes_retentaveis (tuple): Exceções que permitem nova tentativa.
+    """
+    def __init__(self, max_tentativas: int = MAX_TENTATIVAS, espera_inicial: float = ESPERA_INICIAL,
+                 espera_maxima: float = ESPERA_MAXIMA, multiplicador: float = MULTIPLICADOR, prazo_total: float = PRAZO_TOTAL,
+                 status_retentaveis: Iterable[int] = STATUS_RETENTAVEIS,
+                 excecoes_retentaveis: Tuple[Type[BaseException], ...] = EXCECOES_RETENTAVEIS):
+        self.max_tentativas = max(max_tentativas, 1)
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.multiplicador = multiplicador
+        self.prazo_total = prazo_total
+        self.status_retentaveis = frozenset(status_retentaveis)
+        self.excecoes_retentaveis = tuple(excecoes_retentaveis)
+        self.aleatorio = random.Random()
+        self.trava = threading.Lock()
+        self.metricas = {"retentativas": 0, "recuperadas": 0, "esgotadas": 0}
+
+    def retentavel(self, erro: BaseException) -> bool:
+        if isinstance(erro, requests.HTTPError) and erro.response is not None:
+            return erro.response.status_code in self.status_retentaveis
+        return isinstance(erro, self.excecoes_retentaveis)
+
+    def esperaAntesDaProxima(self, tentativa: int, erro: BaseException, decorrido: float) -> Optional[float]:
+        """
+        Segundos a esperar antes da tentativa seguinte à tentativa (1, 2, ...) que falhou com o erro, decorridos os
+        segundos informados desde o início da primeira; None se não deve haver nova tentativa.
+        """
+        if tentativa >= self.max_tentativas or not self.retentavel(erro):
+            self.contar("esgotadas" if tentativa > 1 else None)
+            return None
+        with self.trava:
+            espera = self.aleatorio.uniform(0, min(self.espera_maxima, self.espera_inicial * self.multiplicador ** (tentativa - 1)))
+        retry_after = erro.response.headers.get("Retry-After", "") if isinstance(erro, requests.HTTPError) and erro.response is not None else ""
+        if retry_after.isdigit():
+            espera = max(espera, float(retry_after))
+        if decorrido + espera >= self.prazo_total:
+            self.contar("esgotadas")
+            return None
+        self.contar("retentativas")
+        return espera
+
+    def registrarSucesso(self, tentativa: int):
+        """
+        Registra o sucesso da requisição na tentativa informada (recuperada, se não foi a primeira).
+        """
+        if tentativa > 1:
+            self.contar("recuperadas")
+
+    def contar(self, metrica: Optional[str]):
+        if metrica:
+            with self.trava:
+                self.metricas[metrica] += 1
+
+    def obterMetricas(self) -> dict:
+        """
+        Retentativas feitas, requisições recuperadas e requisições que falharam mesmo após as retentativas.
+        """
+        with self.trava:
+            metricas = dict(self.metricas)
+        metricas.update(max_tentativas=self.max_tentativas, prazo_total=self.prazo_total)
+        return metricas
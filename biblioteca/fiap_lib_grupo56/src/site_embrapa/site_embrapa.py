@@ -1,8 +1,8 @@
-import csv
+import threading
+import time
 import requests
 from bs4 import BeautifulSoup
 from typing import List
-from importlib.resources import files, as_file
 from modelo_dados.producao import Categoria_prod, Produto_prod, ProdutividadeAnual
 from modelo_dados.producao import RepositorioCategorias_prod, RepositorioProdutos_prod, RepositorioProdutividadesAnuais
 from modelo_dados.processamento import EnumTipoUva_proc, Categoria_proc, Cultivar_proc, ProcessamentoAnual
@@ -11,6 +11,28 @@ from modelo_dados.comercializacao import Categoria_com, Produto_com, Comercializ
 from modelo_dados.comercializacao import RepositorioCategorias_com, RepositorioProdutos_com, RepositorioComercializacoesAnuais
 from modelo_dados.importacaoExportacao import EnumCategoria_im_ex, Pais, ImportacaoAnual, ExportacaoAnual
 from modelo_dados.importacaoExportacao import RepositorioPaises, RepositorioImportacoesAnuais, RepositorioExportacoesAnuais
+from modelo_dados.origemDados import EnumOrigemDados
+from site_embrapa import extrator_html, leitor_csv, snapshot
+from site_embrapa.cliente_http import ClienteHttp
+from site_embrapa.cache_html import CacheHtml
+from site_embrapa.armazenamento_sqlite import ArmazenamentoSqlite
+from site_embrapa.cache_negativo import CacheNegativo, TEMPO_VALIDADE_NEGATIVO, MOTIVO_PAGINA_VAZIA, MOTIVO_SEM_DADOS_CSV
+from site_embrapa.gerenciador_cache import GerenciadorCache, POLITICA_LRU
+from site_embrapa.agrupador_requisicoes import AgrupadorRequisicoes
+from site_embrapa.atualizador import AtualizadorPaginas, TEMPO_VALIDADE
+from site_embrapa.disjuntor import Disjuntor, DisjuntorAberto
+from site_embrapa.limitador import LimitadorRequisicoes
+from site_embrapa.retentativas import PoliticaRetentativas
+from site_embrapa.validacao_pagina import ValidadorPaginas, PaginaInvalida, PAGINA_QUEBRADA
+from site_embrapa.opcoes import OPCAO_PRODUCAO, OPCAO_PROCESSAMENTO, OPCAO_COMERCIALIZACAO, OPCAO_IMPORTACAO, OPCAO_EXPORTACAO
+from site_embrapa.opcoes import SUBOPCOES_PROCESSAMENTO, SUBOPCOES_IMPORTACAO, SUBOPCOES_EXPORTACAO
+from site_embrapa.opcoes import TIPOS_UVA_POR_SUBOPCAO, CATEGORIAS_IMPORTACAO_POR_SUBOPCAO, CATEGORIAS_EXPORTACAO_POR_SUBOPCAO
+
+# Falhas do webscraping que levam ao fallback dos arquivos .CSV: site fora do ar ou com erro (requests), disjuntor aberto,
+# página quebrada e falhas de disco do cache de páginas.  Outros erros são propagados.
+FALHAS_WEBSCRAPING = (requests.RequestException, DisjuntorAberto, PaginaInvalida, OSError)
+
+URL_SITE_EMBRAPA = "http://vitibrasil.cnpuv.embrapa.br/index.php"
 
 class SiteEmbrapa:
     """
@@ -18,9 +40,41 @@ class SiteEmbrapa:
     Também gerencia um tipo de cache dos dados para quando o site estiver fora do ar.
     
     """
-    def __init__(self):
+    def __init__(self, pasta_cache_html: str = None, tempo_validade: float = TEMPO_VALIDADE, url_site: str = URL_SITE_EMBRAPA,
+                 tempo_validade_negativo: float = TEMPO_VALIDADE_NEGATIVO, caminho_sqlite: str = None,
+                 limite_memoria: int = None, tempo_vida_memoria: float = None, politica_memoria: str = POLITICA_LRU):
+        """
+        pasta_cache_html: pasta do cache em disco das páginas obtidas do site (ver site_embrapa.cache_html).  Se omitida,
+        as páginas não são guardadas após o webscraping.
+        tempo_validade: segundos após o webscraping de uma página até que ela seja atualizada em segundo plano (ver
+        site_embrapa.atualizador).  None: as páginas em cache nunca vencem.
+        url_site: url base das páginas do site (p.ex. de um servidor local com páginas gravadas, para testes e benchmarks).
+        tempo_validade_negativo: segundos até que uma página sabidamente sem dados seja obtida do site novamente (ver
+        site_embrapa.cache_negativo).  None: nunca.
+        caminho_sqlite: arquivo do banco SQLite em que as páginas obtidas via webscraping são persistidas (ver
+        site_embrapa.armazenamento_sqlite), para sobreviverem a reinícios e serem compartilhadas entre processos.  Se
+        omitido, os dados ficam apenas em memória.
+        limite_memoria: bytes (estimados) que as páginas carregadas por ano podem ocupar nos repositórios; acima dele, as
+        páginas são descartadas conforme politica_memoria (site_embrapa.gerenciador_cache.POLITICA_LRU ou POLITICA_LFU).
+        tempo_vida_memoria: segundos, desde a carga, até que uma página carregada por ano seja descartada dos repositórios
+        (ver site_embrapa.gerenciador_cache).  None (padrão de ambos): as páginas ficam em memória até limpar o cache.
+        """
         # locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-        self.webscraping = WebscrapingSiteEmbrapa("http://vitibrasil.cnpuv.embrapa.br/index.php")
+        cache_html = CacheHtml(pasta_cache_html) if pasta_cache_html else None
+        self.webscraping = WebscrapingSiteEmbrapa(url_site, cache_html=cache_html)
+        # Webscrapings simultâneos da mesma página (opcao, subopcao, ano) são agrupados em um só
+        self.agrupador_requisicoes = AgrupadorRequisicoes()
+        # Serializa as alterações dos repositórios (cargas de páginas e de arquivos .CSV) feitas por threads diferentes
+        self.trava_repositorios = threading.RLock()
+        self.tempo_validade = tempo_validade
+        self.atualizador = AtualizadorPaginas(self.atualizaPaginaFromWebscraping)
+        # Páginas (opcao, subopcao, ano) sem dados, respondidas sem webscraping até vencerem
+        self.cache_negativo = CacheNegativo(tempo_validade_negativo)
+        self.armazenamento = ArmazenamentoSqlite(caminho_sqlite) if caminho_sqlite else None
+        # Páginas (opcao, subopcao, ano) carregadas por ano, descartadas por tempo de vida ou limite de memória
+        self.gerenciador_cache = GerenciadorCache(limite_memoria, tempo_vida_memoria, politica_memoria)
+        # Fallbacks para os arquivos .CSV, por tipo da falha do webscraping
+        self.fallbacks = {}
         self.inicializa_repositorios()
 
     def inicializa_repositorios(self):
@@ -50,276 +104,390 @@ class SiteEmbrapa:
 
 
 
+        # Sob a trava, para que uma atualização em segundo plano em andamento não recarregue a página nos novos repositórios
+        with self.trava_repositorios:
+            self.repositorio_categorias_prod = RepositorioCategorias_prod()
+            self.repositorio_produtos_prod = RepositorioProdutos_prod()
+            self.repositorio_produtividades = RepositorioProdutividadesAnuais()
+
+            self.repositorio_categorias_proc = RepositorioCategorias_proc()
+            self.repositorio_cultivares_proc = RepositorioCultivar_proc()
+            self.repositorio_processamentos = RepositorioProcessamentosAnuais()
+
+            self.repositorio_categorias_com = RepositorioCategorias_com()
+            self.repositorio_produtos_com = RepositorioProdutos_com()
+            self.repositorio_comercializacoes = RepositorioComercializacoesAnuais()
+
+            self.repositorio_paises = RepositorioPaises()
+            self.repositorio_importacoes = RepositorioImportacoesAnuais()
+            self.repositorio_exportacoes = RepositorioExportacoesAnuais()
+
+            # Por página (opcao, subopcao) cujo arquivo .CSV de fallback já foi carregado, os anos do arquivo carregados
+            self.anos_carregados_csv = {}
+            self.cache_negativo.limpar()
+            self.gerenciador_cache.limpar()
+            self.atualizador.descartarPendentes()
+        
+    def carregaRepositoriosFromArquivosCSV(self, mesclar: bool = False, paralelismo: str = None, max_workers: int = None):
+        """
+        Carrega todos os repositórios a partir dos arquivos .CSV.  Com mesclar=True os repositórios não são esvaziados antes:
+        os .CSV completam apenas os anos (por página do site) que ainda não possuem dados, p.ex. obtidos via webscraping.
+        Com paralelismo (leitor_csv.PARALELISMO_THREADS ou PARALELISMO_PROCESSOS) os arquivos são lidos em paralelo por um
+        pool de max_workers workers e o resultado é aplicado aos repositórios de uma só vez, ao final da leitura.
+        """
+        if paralelismo:
+            self.carregaRepositoriosFromConteudo(leitor_csv.ler_todas_linhas(paralelismo, max_workers), mesclar)
+            return
+        self.carregaRepoProdutividadeFromArquivoCSV(mesclar)
+        self.carregaRepoComercializacaoFromArquivoCSV(mesclar)
+        self.carregaRepoTodosProcessamentosFromArquivoCSV(mesclar)
+        self.carregaRepoTodasImportacoesFromArquivoCSV(mesclar)
+        self.carregaRepoTodasExportacoesFromArquivoCSV(mesclar)
+
+    def carregaRepositoriosFromSnapshot(self, caminho_snapshot: str = None, mesclar: bool = False):
+        """
+        Carrega todos os repositórios a partir do snapshot binário dos arquivos .CSV (ver site_embrapa.snapshot).
+        Se o snapshot não existir, for incompatível ou estiver desatualizado em relação aos .CSV, carrega diretamente dos
+        arquivos .CSV e regera o snapshot.  mesclar: ver carregaRepositoriosFromArquivosCSV.
+        """
+        self.carregaRepositoriosFromConteudo(snapshot.ler_ou_regerar_snapshot(caminho_snapshot), mesclar)
+
+    def carregaRepositoriosFromConteudo(self, conteudo: dict, mesclar: bool = False):
+        """
+        Aplica aos repositórios as linhas intermediárias de todas as páginas: {(opcao, subopcao): (anos, linhas)}, no formato
+        de site_embrapa.leitor_csv.  mesclar: ver carregaRepositoriosFromArquivosCSV.
+        """
+        if not mesclar:
+            self.inicializa_repositorios_prod()
+            self.inicializa_repositorios_com()
+            self.inicializa_repositorios_proc()
+            self.inicializa_repositorios_imp()
+            self.inicializa_repositorios_exp()
+        for (opcao, subopcao), (anos, linhas) in conteudo.items():
+            self.carregaRepoFromLinhas(opcao, subopcao, anos, linhas)
+
+    def carregaRepositoriosFromCacheHtml(self) -> int:
+        """
+        Carrega nos repositórios as páginas do site gravadas no cache em disco (ver site_embrapa.cache_html), sem acessar o
+        site.  Páginas que já possuem registros nos repositórios são mantidas e páginas quebradas (ver
+        site_embrapa.validacao_pagina) são removidas do cache.  Retorna a quantidade de páginas carregadas.
+        """
+        cache_html = self.webscraping.cache_html
+        if cache_html is None:
+            return 0
+        carregadas = 0
+        for opcao, subopcao, ano in cache_html.listar():
+            try:
+                with self.trava_repositorios:
+                    if len(self.buscarRegistrosDaPagina(opcao, subopcao, ano)) > 0 or self.paginaVazia(opcao, subopcao, ano):
+                        continue
+            except ValueError:
+                continue  # arquivo de uma página desconhecida
+            entrada = cache_html.ler(opcao, subopcao, ano)
+            if entrada is None:
+                continue
+            rows = self.webscraping.extrator(entrada.conteudo)
+            if self.webscraping.validador.classificar(opcao, subopcao, entrada.conteudo, rows)[0] == PAGINA_QUEBRADA:
+                cache_html.remover(opcao, subopcao, ano)  # gravada antes da validação das páginas
+                continue
+            # Momento em que o site confirmou o conteúdo pela última vez, para que a página vença na hora certa
+            self.carregaRepoFromPaginaWebscraping(opcao, subopcao, ano, rows, entrada.validado_em or entrada.gravado_em)
+            carregadas += 1
+        return carregadas
+
+    def carregaFallbackFromArquivoCSV(self, opcao: str, subopcao: str = None, ano: int = None):
+        """
+        Fallback do webscraping: carrega nos repositórios apenas o arquivo .CSV da página (opcao, subopcao) do site, uma única vez.
+        Depois disso, com o ano informado, carrega apenas o ano, se ele foi descartado da memória (ver
+        descartaPaginaDaMemoria).  Os registros já existentes nos repositórios são mantidos.  Usa o snapshot binário,
+        quando disponível, decodificado uma única vez por processo.
+        """
+        with self.trava_repositorios:
+            carregados = self.anos_carregados_csv.get((opcao, subopcao))
+            if carregados is not None and (ano is None or ano in carregados):
+                return
+            try:
+                anos, linhas = snapshot.ler_snapshot_em_cache()[(opcao, subopcao)]
+            except (snapshot.SnapshotInvalido, KeyError):
+                anos, linhas = leitor_csv.ler_linhas(opcao, subopcao)
+            if carregados is not None:
+                if ano not in anos:
+                    return
+                anos, linhas = leitor_csv.linhas_do_ano(anos, linhas, ano)
+            self.carregaRepoFromLinhas(opcao, subopcao, anos, linhas)
+
+    def carregaFallbackDaPagina(self, opcao: str, subopcao: str, ano: int, erro: Exception = None) -> list:
+        """
+        Fallback do webscraping da página (opcao, subopcao) do ano: carrega o arquivo .CSV da página (ver
+        carregaFallbackFromArquivoCSV) e retorna os registros do ano na página.  Se nem o .CSV tiver dados do ano, a página
+        é registrada no cache negativo.  erro: a falha do webscraping, contada nas métricas.
+        """
+        self.carregaFallbackFromArquivoCSV(opcao, subopcao, ano)
+        with self.trava_repositorios:
+            if erro is not None:
+                self.fallbacks[type(erro).__name__] = self.fallbacks.get(type(erro).__name__, 0) + 1
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+        if len(registros) == 0:
+            self.cache_negativo.registrar((opcao, subopcao, ano), MOTIVO_SEM_DADOS_CSV)
+        return registros
+
+    def carregaRepoFromLinhas(self, opcao: str, subopcao: str, anos: tuple, linhas: list):
+        """
+        Aplica aos repositórios as linhas intermediárias da página (opcao, subopcao) e registra os seus anos como carregados.
+        Os carregaRepo*FromLinhas carregam apenas os anos ainda sem registros nos repositórios (mescla com os dados existentes),
+        com a origem e o momento da carga informados (por padrão, arquivo .CSV e o momento atual).
+        """
+        with self.trava_repositorios:
+            if opcao == OPCAO_PRODUCAO:
+                self.carregaRepoProdutividadeFromLinhas(anos, linhas)
+            elif opcao == OPCAO_COMERCIALIZACAO:
+                self.carregaRepoComercializacaoFromLinhas(anos, linhas)
+            elif opcao == OPCAO_PROCESSAMENTO:
+                self.carregaRepoProcessamentoFromLinhas(anos, linhas, TIPOS_UVA_POR_SUBOPCAO[subopcao])
+            elif opcao == OPCAO_IMPORTACAO:
+                self.carregaRepoImportacaoFromLinhas(anos, linhas, CATEGORIAS_IMPORTACAO_POR_SUBOPCAO[subopcao])
+            elif opcao == OPCAO_EXPORTACAO:
+                self.carregaRepoExportacaoFromLinhas(anos, linhas, CATEGORIAS_EXPORTACAO_POR_SUBOPCAO[subopcao])
+            else:
+                raise ValueError(f"Opção [{opcao}] desconhecida.")
+            self.anos_carregados_csv.setdefault((opcao, subopcao), set()).update(anos)
+
+    def descartaPaginasCarregadasCSV(self, opcao: str):
+        self.anos_carregados_csv = {pagina: anos for pagina, anos in self.anos_carregados_csv.items() if pagina[0] != opcao}
+
+    def descartaPaginasDaOpcao(self, opcao: str):
+        """
+        Descarta as entradas do cache negativo e do gerenciador de memória das páginas da opção, cujos repositórios foram
+        recriados.
+        """
+        self.cache_negativo.descartarOpcao(opcao)
+        self.gerenciador_cache.descartarOpcao(opcao)
+        with self.trava_repositorios:
+            self.atualizador.descartarPendentes()
+
+    def inicializa_repositorios_prod(self):
         self.repositorio_categorias_prod = RepositorioCategorias_prod()
         self.repositorio_produtos_prod = RepositorioProdutos_prod()
         self.repositorio_produtividades = RepositorioProdutividadesAnuais()
+        self.descartaPaginasCarregadasCSV(OPCAO_PRODUCAO)
+        self.descartaPaginasDaOpcao(OPCAO_PRODUCAO)
 
-        self.repositorio_categorias_proc = RepositorioCategorias_proc()
-        self.repositorio_cultivares_proc = RepositorioCultivar_proc()
-        self.repositorio_processamentos = RepositorioProcessamentosAnuais()
-
+    def inicializa_repositorios_com(self):
         self.repositorio_categorias_com = RepositorioCategorias_com()
         self.repositorio_produtos_com = RepositorioProdutos_com()
         self.repositorio_comercializacoes = RepositorioComercializacoesAnuais()
+        self.descartaPaginasCarregadasCSV(OPCAO_COMERCIALIZACAO)
+        self.descartaPaginasDaOpcao(OPCAO_COMERCIALIZACAO)
 
-        self.repositorio_paises = RepositorioPaises()
-        self.repositorio_importacoes = RepositorioImportacoesAnuais()
-        self.repositorio_exportacoes = RepositorioExportacoesAnuais()
-        
-    def carregaRepositoriosFromArquivosCSV(self):
-        self.carregaRepoProdutividadeFromArquivoCSV()
-        self.carregaRepoComercializacaoFromArquivoCSV()
-        self.carregaRepoTodosProcessamentosFromArquivoCSV()
-        self.carregaRepoTodasImportacoesFromArquivoCSV()
-        self.carregaRepoTodasExportacoesFromArquivoCSV()
-
-    def carregaRepoTodosProcessamentosFromArquivoCSV(self):
+    def inicializa_repositorios_proc(self):
         self.repositorio_categorias_proc = RepositorioCategorias_proc()
         self.repositorio_cultivares_proc = RepositorioCultivar_proc()
         self.repositorio_processamentos = RepositorioProcessamentosAnuais()
-        self.carregaRepoProcessamentoFromArquivoCSV("processaviniferas.csv", EnumTipoUva_proc.VINIFERAS, ";")
-        self.carregaRepoProcessamentoFromArquivoCSV("processaamericanas.csv", EnumTipoUva_proc.AMERICANASEHIBRIDAS, "\t")
-        self.carregaRepoProcessamentoFromArquivoCSV("processamesa.csv", EnumTipoUva_proc.UVASDEMESA, "\t")
-        self.carregaRepoProcessamentoFromArquivoCSV("processasemclass.csv", EnumTipoUva_proc.SEMCLASSIFICACAO, "\t")
+        self.descartaPaginasCarregadasCSV(OPCAO_PROCESSAMENTO)
+        self.descartaPaginasDaOpcao(OPCAO_PROCESSAMENTO)
 
-    def carregaRepoTodasImportacoesFromArquivoCSV(self):
+    def inicializa_repositorios_imp(self):
         self.repositorio_importacoes = RepositorioImportacoesAnuais()
-        self.carregaRepoImportacaoFromArquivoCSV("impvinhos.csv", EnumCategoria_im_ex.VINHOSDEMESA, ";")
-        self.carregaRepoImportacaoFromArquivoCSV("impespumantes.csv", EnumCategoria_im_ex.ESPUMANTES, ";")
-        self.carregaRepoImportacaoFromArquivoCSV("impfrescas.csv", EnumCategoria_im_ex.UVASFRESCAS, ";")
-        self.carregaRepoImportacaoFromArquivoCSV("imppassas.csv", EnumCategoria_im_ex.UVASPASSAS, ";")
-        self.carregaRepoImportacaoFromArquivoCSV("impsuco.csv", EnumCategoria_im_ex.SUCODEUVA, ";")
+        self.descartaPaginasCarregadasCSV(OPCAO_IMPORTACAO)
+        self.descartaPaginasDaOpcao(OPCAO_IMPORTACAO)
 
-    def carregaRepoTodasExportacoesFromArquivoCSV(self):
+    def inicializa_repositorios_exp(self):
         self.repositorio_exportacoes = RepositorioExportacoesAnuais()
-        self.carregaRepoExportacaoFromArquivoCSV("expvinho.csv", EnumCategoria_im_ex.VINHOSDEMESA, ";")
-        self.carregaRepoExportacaoFromArquivoCSV("expespumantes.csv", EnumCategoria_im_ex.ESPUMANTES, ";")
-        self.carregaRepoExportacaoFromArquivoCSV("expuva.csv", EnumCategoria_im_ex.UVASFRESCAS, ";")
-        self.carregaRepoExportacaoFromArquivoCSV("expsuco.csv", EnumCategoria_im_ex.SUCODEUVA, ";")
+        self.descartaPaginasCarregadasCSV(OPCAO_EXPORTACAO)
+        self.descartaPaginasDaOpcao(OPCAO_EXPORTACAO)
 
+    def carregaRepoPaginasFromArquivoCSV(self, opcao: str):
+        for pagina in leitor_csv.ARQUIVOS_CSV:
+            if pagina[0] == opcao:
+                self.carregaRepoFromLinhas(*pagina, *leitor_csv.ler_linhas(*pagina))
+
+    def carregaRepoTodosProcessamentosFromArquivoCSV(self, mesclar: bool = False):
+        if not mesclar:
+            self.inicializa_repositorios_proc()
+        self.carregaRepoPaginasFromArquivoCSV(OPCAO_PROCESSAMENTO)
+
+    def carregaRepoTodasImportacoesFromArquivoCSV(self, mesclar: bool = False):
+        if not mesclar:
+            self.inicializa_repositorios_imp()
+        self.carregaRepoPaginasFromArquivoCSV(OPCAO_IMPORTACAO)
+
+    def carregaRepoTodasExportacoesFromArquivoCSV(self, mesclar: bool = False):
+        if not mesclar:
+            self.inicializa_repositorios_exp()
+        self.carregaRepoPaginasFromArquivoCSV(OPCAO_EXPORTACAO)
 
     def carregaRepoExportacaoFromArquivoCSV(self, arquivo_csv: str, categoria: EnumCategoria_im_ex, delimitador_arquivo: str):
-        with as_file(files("site_embrapa.arquivos_csv").joinpath(arquivo_csv)) as caminho_csv:
-            with open(caminho_csv, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file, delimiter = delimitador_arquivo)
-                
-                # Itera sobre cada linha do arquivo CSV
-                for linha in reader:
-                    nome_pais = linha.get("País")
-
-                    if not nome_pais:
-                        continue  # Pula linhas com dados incompletos
-
-                    pais = self.repositorio_paises.buscar_pais_por_nome(nome_pais)
-                    if not pais:
-                        pais = Pais(nome_pais)
-                        self.repositorio_paises.adicionar_pais(pais)
-                    col_quantidade = 0
-                    col_valor = 0
-                    for coluna, valor in linha.items():
-                        if coluna[:4].isdigit():  
-                            ano = int(coluna[:4])
-                            if coluna[4] == 'a':
-                                col_quantidade = valor
-                            elif coluna[4] == 'b':
-                                col_valor = valor
-                                exportacao = ExportacaoAnual(ano, col_valor, col_quantidade, categoria, pais)
-                                self.repositorio_exportacoes.adicionar_exportacao(exportacao)
+        anos, linhas = leitor_csv.ler_linhas_importacao_exportacao(arquivo_csv, delimitador_arquivo)
+        self.carregaRepoExportacaoFromLinhas(anos, linhas, categoria)
 
     def carregaRepoImportacaoFromArquivoCSV(self, arquivo_csv: str, categoria: EnumCategoria_im_ex, delimitador_arquivo: str):
-        with as_file(files("site_embrapa.arquivos_csv").joinpath(arquivo_csv)) as caminho_csv:
-            with open(caminho_csv, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file, delimiter = delimitador_arquivo)
-                
-                # Itera sobre cada linha do arquivo CSV
-                for linha in reader:
-                    nome_pais = linha.get("País")
-
-                    if not nome_pais:
-                        continue  # Pula linhas com dados incompletos
-
-                    pais = self.repositorio_paises.buscar_pais_por_nome(nome_pais)
-                    if not pais:
-                        pais = Pais(nome_pais)
-                        self.repositorio_paises.adicionar_pais(pais)
-                    col_quantidade = 0
-                    col_valor = 0
-                    for coluna, valor in linha.items():
-                        if coluna[:4].isdigit():  
-                            ano = int(coluna[:4])
-                            if coluna[4] == 'a':
-                                col_quantidade = valor
-                            elif coluna[4] == 'b':
-                                col_valor = valor
-                                importacao = ImportacaoAnual(ano, col_valor, col_quantidade, categoria, pais)
-                                self.repositorio_importacoes.adicionar_importacao(importacao)
-
+        anos, linhas = leitor_csv.ler_linhas_importacao_exportacao(arquivo_csv, delimitador_arquivo)
+        self.carregaRepoImportacaoFromLinhas(anos, linhas, categoria)
 
     def carregaRepoProcessamentoFromArquivoCSV(self, arquivo_csv: str, tipo_uva: EnumTipoUva_proc, delimitador_arquivo: str):
+        anos, linhas = leitor_csv.ler_linhas_processamento(arquivo_csv, delimitador_arquivo)
+        self.carregaRepoProcessamentoFromLinhas(anos, linhas, tipo_uva)
+
+    def carregaRepoProdutividadeFromArquivoCSV(self, mesclar: bool = False):
+        if not mesclar:
+            self.inicializa_repositorios_prod()
+        self.carregaRepoPaginasFromArquivoCSV(OPCAO_PRODUCAO)
+
+    def carregaRepoComercializacaoFromArquivoCSV(self, mesclar: bool = False):
+        if not mesclar:
+            self.inicializa_repositorios_com()
+        self.carregaRepoPaginasFromArquivoCSV(OPCAO_COMERCIALIZACAO)
+
+    def carregaRepoExportacaoFromLinhas(self, anos: tuple, linhas: list, categoria: EnumCategoria_im_ex,
+                                        origem: EnumOrigemDados = EnumOrigemDados.CSV, carregado_em: float = None):
+        """
+        Carrega as exportações de uma categoria a partir das linhas intermediárias (ver carregaRepoFromLinhas).
+        """
+        posicoes = leitor_csv.posicoes_anos_ausentes(anos, self.repositorio_exportacoes.listar_anosPorCategoria(categoria))
+        if not posicoes:
+            return
+        carregado_em = carregado_em if carregado_em is not None else time.time()
+        for nome_pais, quantidades, valores in linhas:
+            pais = self.repositorio_paises.buscar_pais_por_nome(nome_pais)
+            if not pais:
+                pais = Pais(nome_pais)
+                self.repositorio_paises.adicionar_pais(pais)
+            self.repositorio_exportacoes.adicionar_lote(ExportacaoAnual(anos[i], valores[i], quantidades[i], categoria, pais, origem, carregado_em) for i in posicoes)
+
+    def carregaRepoImportacaoFromLinhas(self, anos: tuple, linhas: list, categoria: EnumCategoria_im_ex,
+                                        origem: EnumOrigemDados = EnumOrigemDados.CSV, carregado_em: float = None):
+        """
+        Carrega as importações de uma categoria a partir das linhas intermediárias (ver carregaRepoFromLinhas).
+        """
+        posicoes = leitor_csv.posicoes_anos_ausentes(anos, self.repositorio_importacoes.listar_anosPorCategoria(categoria))
+        if not posicoes:
+            return
+        carregado_em = carregado_em if carregado_em is not None else time.time()
+        for nome_pais, quantidades, valores in linhas:
+            pais = self.repositorio_paises.buscar_pais_por_nome(nome_pais)
+            if not pais:
+                pais = Pais(nome_pais)
+                self.repositorio_paises.adicionar_pais(pais)
+            self.repositorio_importacoes.adicionar_lote(ImportacaoAnual(anos[i], valores[i], quantidades[i], categoria, pais, origem, carregado_em) for i in posicoes)
+
+    def carregaRepoProcessamentoFromLinhas(self, anos: tuple, linhas: list, tipo_uva: EnumTipoUva_proc,
+                                           origem: EnumOrigemDados = EnumOrigemDados.CSV, carregado_em: float = None):
+        """
+        Carrega os processamentos de um TipoUva a partir das linhas intermediárias (ver carregaRepoFromLinhas).
+        """
+        posicoes = leitor_csv.posicoes_anos_ausentes(anos, self.repositorio_processamentos.listar_anos_TipoUva(tipo_uva))
+        if not posicoes:
+            return
+        carregado_em = carregado_em if carregado_em is not None else time.time()
         categoria_atual = None
-        with as_file(files("site_embrapa.arquivos_csv").joinpath(arquivo_csv)) as caminho_csv:
-            with open(caminho_csv, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file, delimiter = delimitador_arquivo)
-                
-                # Itera sobre cada linha do arquivo CSV
-                for linha in reader:
-                    nome_categoria = linha.get("control")
-                    nome_cultivar = linha.get("cultivar")
-
-                    if not nome_categoria or not nome_cultivar:
-                        continue  # Pula linhas com dados incompletos
-                    
-                    if nome_categoria == nome_cultivar:
-                        # Verifica se a categoria já existe no repositório
-                        categoria_atual = self.repositorio_categorias_proc.buscar_categoria_por_nome(nome_categoria)
-                        if not categoria_atual:
-                            categoria_atual = Categoria_proc(nome_categoria)
-                            self.repositorio_categorias_proc.adicionar_categoria(categoria_atual)
-                    else:
-                        if nome_cultivar == "Sem classificação":
-                            categoria_atual = self.repositorio_categorias_proc.buscar_categoria_por_nome(nome_cultivar)
-                            if not categoria_atual:
-                                categoria_atual = Categoria_proc(nome_cultivar)
-                                self.repositorio_categorias_proc.adicionar_categoria(categoria_atual)
-                        # Verifica se o cultivar já existe no repositório
-                        cultivar = self.repositorio_cultivares_proc.buscar_cultivar_por_nome_categoria_tipo(nome_cultivar, categoria_atual, tipo_uva)
-                        if not cultivar:
-                            cultivar = Cultivar_proc(nome_cultivar, categoria_atual, tipo_uva)
-                            self.repositorio_cultivares_proc.adicionar_cultivar(cultivar)
-                        
-                        # Cria instâncias de ProdutividadeAnual para os anos disponíveis
-                        for coluna, valor in linha.items():
-                            if coluna.isdigit():  
-                                ano = int(coluna)
-                                processamento = ProcessamentoAnual(ano, valor, cultivar)
-                                self.repositorio_processamentos.adicionar_processamento(processamento)        
-
-
-    def carregaRepoProdutividadeFromArquivoCSV(self):
-        self.repositorio_categorias_prod = RepositorioCategorias_prod()
-        self.repositorio_produtos_prod = RepositorioProdutos_prod()
-        self.repositorio_produtividades = RepositorioProdutividadesAnuais()
+        for nome_categoria, nome_cultivar, valores in linhas:
+            # Verifica se a categoria já existe no repositório
+            if nome_categoria is None:
+                categoria_atual = None
+            elif categoria_atual is None or categoria_atual.nome != nome_categoria:
+                categoria_atual = self.repositorio_categorias_proc.buscar_categoria_por_nome(nome_categoria)
+                if not categoria_atual:
+                    categoria_atual = Categoria_proc(nome_categoria)
+                    self.repositorio_categorias_proc.adicionar_categoria(categoria_atual)
+            if nome_cultivar is None:
+                continue
+
+            # Verifica se o cultivar já existe no repositório
+            cultivar = self.repositorio_cultivares_proc.buscar_cultivar_por_nome_categoria_tipo(nome_cultivar, categoria_atual, tipo_uva)
+            if not cultivar:
+                cultivar = Cultivar_proc(nome_cultivar, categoria_atual, tipo_uva)
+                self.repositorio_cultivares_proc.adicionar_cultivar(cultivar)
+            self.repositorio_processamentos.adicionar_lote(ProcessamentoAnual(anos[i], valores[i], cultivar, origem, carregado_em) for i in posicoes)
+
+    def carregaRepoProdutividadeFromLinhas(self, anos: tuple, linhas: list,
+                                           origem: EnumOrigemDados = EnumOrigemDados.CSV, carregado_em: float = None):
+        """
+        Carrega as produtividades a partir das linhas intermediárias (ver carregaRepoFromLinhas).
+        """
+        posicoes = leitor_csv.posicoes_anos_ausentes(anos, self.repositorio_produtividades.listar_anos())
+        if not posicoes:
+            return
+        carregado_em = carregado_em if carregado_em is not None else time.time()
         categoria_atual = None
-        with as_file(files("site_embrapa.arquivos_csv").joinpath("producao.csv")) as caminho_csv:
-            with open(caminho_csv, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file, delimiter=';')
-                
-                # Itera sobre cada linha do arquivo CSV
-                for linha in reader:
-                    nome_categoria = linha.get("control")
-                    nome_produto = linha.get("produto")
-
-                    if not nome_categoria or not nome_produto:
-                        continue  # Pula linhas com dados incompletos
-                    
-                    if nome_categoria == nome_produto:
-                        # Verifica se a categoria já existe no repositório
-                        categoria_atual = self.repositorio_categorias_prod.buscar_categoria_por_nome(nome_categoria)
-                        if not categoria_atual:
-                            categoria_atual = Categoria_prod(nome_categoria)
-                            self.repositorio_categorias_prod.adicionar_categoria(categoria_atual)
-                    else:
-                        # Verifica se o produto já existe no repositório
-                        produto = self.repositorio_produtos_prod.buscar_produto_por_nome_categoria(nome_produto, categoria_atual)
-                        if not produto:
-                            produto = Produto_prod(nome_produto, categoria_atual)
-                            self.repositorio_produtos_prod.adicionar_produto(produto)
-                        
-                        # Cria instâncias de ProdutividadeAnual para os anos disponíveis
-                        for coluna, valor in linha.items():
-                            if coluna.isdigit():  
-                                ano = int(coluna)
-                                produtividade = ProdutividadeAnual(ano, valor, produto)
-                                self.repositorio_produtividades.adicionar_produtividade(produtividade)
-
-    def carregaRepoComercializacaoFromArquivoCSV(self):
-        self.repositorio_categorias_com = RepositorioCategorias_com()
-        self.repositorio_produtos_com = RepositorioProdutos_com()
-        self.repositorio_comercializacoes = RepositorioComercializacoesAnuais()
-
+        for nome_categoria, nome_produto, valores in linhas:
+            # Verifica se a categoria já existe no repositório
+            if nome_categoria is None:
+                categoria_atual = None
+            elif categoria_atual is None or categoria_atual.nome != nome_categoria:
+                categoria_atual = self.repositorio_categorias_prod.buscar_categoria_por_nome(nome_categoria)
+                if not categoria_atual:
+                    categoria_atual = Categoria_prod(nome_categoria)
+                    self.repositorio_categorias_prod.adicionar_categoria(categoria_atual)
+            if nome_produto is None:
+                continue
+
+            # Verifica se o produto já existe no repositório
+            produto = self.repositorio_produtos_prod.buscar_produto_por_nome_categoria(nome_produto, categoria_atual)
+            if not produto:
+                produto = Produto_prod(nome_produto, categoria_atual)
+                self.repositorio_produtos_prod.adicionar_produto(produto)
+            self.repositorio_produtividades.adicionar_lote(ProdutividadeAnual(anos[i], valores[i], produto, origem, carregado_em) for i in posicoes)
+
+    def carregaRepoComercializacaoFromLinhas(self, anos: tuple, linhas: list,
+                                             origem: EnumOrigemDados = EnumOrigemDados.CSV, carregado_em: float = None):
+        """
+        Carrega as comercializações a partir das linhas intermediárias (ver carregaRepoFromLinhas).
+        """
+        posicoes = leitor_csv.posicoes_anos_ausentes(anos, self.repositorio_comercializacoes.listar_anos())
+        if not posicoes:
+            return
+        carregado_em = carregado_em if carregado_em is not None else time.time()
         categoria_atual = None
-        ultima_linha_foi_categoria = False
-        with as_file(files("site_embrapa.arquivos_csv").joinpath("comercio.csv")) as caminho_csv:
-            with open(caminho_csv, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file, delimiter=';')
-                
-                # Itera sobre cada linha do arquivo CSV
-                for linha in reader:
-                    nome_categoria = linha.get("control").lstrip().rstrip()
-                    nome_produto = linha.get("Produto").lstrip().rstrip()
-
-                    if not nome_categoria or not nome_produto:
-                        continue  # Pula linhas com dados incompletos
-                    
-                    if nome_categoria == nome_produto:
-                        if ultima_linha_foi_categoria:
-                            produto = self.repositorio_produtos_com.buscar_produto_por_nome_categoria(categoria_atual.nome, categoria_atual)
-                            if not produto:
-                                produto = Produto_com(categoria_atual.nome, categoria_atual)
-                                self.repositorio_produtos_com.adicionar_produto(produto)
-                            # Cria instâncias de ProdutividadeAnual para os anos disponíveis
-                            for coluna, valor in linha_anterior.items():
-                                if coluna.isdigit():  
-                                    ano = int(coluna)
-                                    comercializacao = ComercializacaoAnual(ano, valor, produto)
-                                    self.repositorio_comercializacoes.adicionar_comercializacao(comercializacao)
-                        # Verifica se a categoria já existe no repositório
-                        categoria_atual = self.repositorio_categorias_com.buscar_categoria_por_nome(nome_categoria)
-                        if not categoria_atual:
-                            categoria_atual = Categoria_com(nome_categoria)
-                            self.repositorio_categorias_com.adicionar_categoria(categoria_atual)
-                        ultima_linha_foi_categoria = True
-                        linha_anterior = linha
-                    else:
-                        # Verifica se o produto já existe no repositório
-                        ultima_linha_foi_categoria = False
-                        produto = self.repositorio_produtos_com.buscar_produto_por_nome_categoria(nome_produto, categoria_atual)
-                        if not produto:
-                            produto = Produto_com(nome_produto, categoria_atual)
-                            self.repositorio_produtos_com.adicionar_produto(produto)
-                        
-                        # Cria instâncias de ProdutividadeAnual para os anos disponíveis
-                        for coluna, valor in linha.items():
-                            if coluna.isdigit():  
-                                ano = int(coluna)
-                                comercializacao = ComercializacaoAnual(ano, valor, produto)
-                                self.repositorio_comercializacoes.adicionar_comercializacao(comercializacao)
+        for nome_categoria, nome_produto, valores in linhas:
+            # Verifica se a categoria já existe no repositório
+            if nome_categoria is None:
+                categoria_atual = None
+            elif categoria_atual is None or categoria_atual.nome != nome_categoria:
+                categoria_atual = self.repositorio_categorias_com.buscar_categoria_por_nome(nome_categoria)
+                if not categoria_atual:
+                    categoria_atual = Categoria_com(nome_categoria)
+                    self.repositorio_categorias_com.adicionar_categoria(categoria_atual)
+            if nome_produto is None:
+                continue
+
+            # Verifica se o produto já existe no repositório
+            produto = self.repositorio_produtos_com.buscar_produto_por_nome_categoria(nome_produto, categoria_atual)
+            if not produto:
+                produto = Produto_com(nome_produto, categoria_atual)
+                self.repositorio_produtos_com.adicionar_produto(produto)
+            self.repositorio_comercializacoes.adicionar_lote(ComercializacaoAnual(anos[i], valores[i], produto, origem, carregado_em) for i in posicoes)
 
     def obterProducoesPorAno(self, ano: int) -> List[ProdutividadeAnual]:
         """
         Recupera do site da embrapa, toda a produção de um ano.  Se o site estiver offline, retornará a produção de cache obtido previamente.
         
         """
-        produtividadesEmCache = self.repositorio_produtividades.buscar_produtividadesPorAno(ano)
+        produtividadesEmCache = self.buscarRegistrosEmCache(OPCAO_PRODUCAO, None, ano)
         if len(produtividadesEmCache) == 0:
             try:
                 produtividadesEmCache = self.carregaRepoProdutividadePorAnoFromWebscraping(ano)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                produtividadesEmCache = self.repositorio_produtividades.buscar_produtividadesPorAno(ano)
-            finally:
-                return produtividadesEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                produtividadesEmCache = self.carregaFallbackDaPagina(OPCAO_PRODUCAO, None, ano, erro)
         return produtividadesEmCache
 
     def obterProducaoTotalDeCategoriaPorAno(self, nomeCategoria: str, ano: int) -> int:
         """
         Recupera do site da embrapa, toda da produção de uma categoria em um ano.  Se o site estiver offline, retornará a produção de cache obtido previamente.
+        Retorna 0 se a categoria não existir ou não houver dados do ano.
         
         """
-        produtividadesEmCache = self.repositorio_produtividades.buscar_produtividadesPorAno(ano)
+        produtividadesEmCache = self.buscarRegistrosEmCache(OPCAO_PRODUCAO, None, ano)
         if len(produtividadesEmCache) == 0:
             try:
                 produtividadesEmCache = self.carregaRepoProdutividadePorAnoFromWebscraping(ano)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                produtividadesEmCache = self.repositorio_produtividades.buscar_produtividadesPorAno(ano)
-            finally:
-                return produtividadesEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                produtividadesEmCache = self.carregaFallbackDaPagina(OPCAO_PRODUCAO, None, ano, erro)
         categoria = self.repositorio_categorias_prod.buscar_categoria_por_nome(nomeCategoria)
         if categoria == None:
             return 0
         
-        producao_total_categoria = self.repositorio_produtividades.buscarProdutividadeTotalDeCategoriaPorAno(categoria, ano)
+        with self.trava_repositorios:
+            producao_total_categoria = self.repositorio_produtividades.buscarProdutividadeTotalDeCategoriaPorAno(categoria, ano)
         return producao_total_categoria
 
     def obterProcessamentoPorAnoTipoUva(self, ano: int, tipo_uva: EnumTipoUva_proc) -> List[ProcessamentoAnual]:
@@ -327,37 +495,33 @@ class SiteEmbrapa:
         Recupera do site da embrapa, toda o processamento de um ano e tipo uva.  Se o site estiver offline, retornará o processamento de cache obtido previamente.
         
         """
-        processamentoEmCache = self.repositorio_processamentos.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)
+        processamentoEmCache = self.buscarRegistrosEmCache(OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[tipo_uva], ano)
         if len(processamentoEmCache) == 0:
             try:
                 processamentoEmCache = self.carregaRepoProcessamentoPorAnoTipoUvaFromWebscraping(ano, tipo_uva)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                processamentoEmCache = self.repositorio_processamentos.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)
-            finally:
-                return processamentoEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                processamentoEmCache = self.carregaFallbackDaPagina(OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[tipo_uva], ano, erro)
         return processamentoEmCache
 
     def obterProcessamentoTotalDeCategoriaPorAnoTipoUva(self, nomeCategoria: str, ano: int, tipo_uva: EnumTipoUva_proc) -> int:
         """
         Recupera do site da embrapa, toda da processamento de uma categoria em um ano, por TipoUva.  Se o site estiver offline, retornará o processamento de cache obtido previamente.
+        Retorna 0 se a categoria não existir ou não houver dados do ano.
         
         """
-        processamentoEmCache = self.repositorio_processamentos.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)
+        processamentoEmCache = self.buscarRegistrosEmCache(OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[tipo_uva], ano)
         if len(processamentoEmCache) == 0:
             try:
                 processamentoEmCache = self.carregaRepoProcessamentoPorAnoTipoUvaFromWebscraping(ano, tipo_uva)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                processamentoEmCache = self.repositorio_processamentos.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)
-            finally:
-                return processamentoEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                processamentoEmCache = self.carregaFallbackDaPagina(OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[tipo_uva], ano, erro)
 
         categoria = self.repositorio_categorias_proc.buscar_categoria_por_nome(nomeCategoria)
         if categoria == None:
             return 0
         
-        processamento_total_categoria = self.repositorio_processamentos.buscarProcessamentoTotalDeCategoriaPorAno_TipoUva(categoria, ano, tipo_uva)
+        with self.trava_repositorios:
+            processamento_total_categoria = self.repositorio_processamentos.buscarProcessamentoTotalDeCategoriaPorAno_TipoUva(categoria, ano, tipo_uva)
         return processamento_total_categoria
 
     def obterComercializacoesPorAno(self, ano: int) -> List[ComercializacaoAnual]:
@@ -365,34 +529,32 @@ class SiteEmbrapa:
         Recupera do site da embrapa, toda a comercialização de um ano.  Se o site estiver offline, retornará a produção de cache obtido previamente.
         
         """
-        comercializacoesEmCache = self.repositorio_comercializacoes.buscar_comercializacoesPorAno(ano)
+        comercializacoesEmCache = self.buscarRegistrosEmCache(OPCAO_COMERCIALIZACAO, None, ano)
         if len(comercializacoesEmCache) == 0:
             try:
                 comercializacoesEmCache = self.carregaRepoComercializacaoPorAnoFromWebscraping(ano)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                comercializacoesEmCache = self.repositorio_comercializacoes.buscar_comercializacoesPorAno(ano)
-            finally:
-                return comercializacoesEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                comercializacoesEmCache = self.carregaFallbackDaPagina(OPCAO_COMERCIALIZACAO, None, ano, erro)
         return comercializacoesEmCache
 
     def obterComercializacaoTotalDeCategoriaPorAno(self, nomeCategoria: str, ano: int) -> int:
         """
         Recupera do site da embrapa, toda da comercialização de uma categoria em um ano.  Se o site estiver offline, retornará a produção de cache obtido previamente.
+        Retorna 0 se a categoria não existir ou não houver dados do ano.
         
         """
-        comercializacoesEmCache = self.repositorio_comercializacoes.buscar_comercializacoesPorAno(ano)
+        comercializacoesEmCache = self.buscarRegistrosEmCache(OPCAO_COMERCIALIZACAO, None, ano)
         if len(comercializacoesEmCache) == 0:
             try:
                 comercializacoesEmCache = self.carregaRepoComercializacaoPorAnoFromWebscraping(ano)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                comercializacoesEmCache = self.repositorio_comercializacoes.buscar_comercializacoesPorAno(ano)
+            except FALHAS_WEBSCRAPING as erro:
+                comercializacoesEmCache = self.carregaFallbackDaPagina(OPCAO_COMERCIALIZACAO, None, ano, erro)
         categoria = self.repositorio_categorias_com.buscar_categoria_por_nome(nomeCategoria)
         if categoria == None:
             return 0
         
-        comercializacao_total_categoria = self.repositorio_comercializacoes.buscarComercializacaoTotalDeCategoriaPorAno(categoria, ano)
+        with self.trava_repositorios:
+            comercializacao_total_categoria = self.repositorio_comercializacoes.buscarComercializacaoTotalDeCategoriaPorAno(categoria, ano)
         return comercializacao_total_categoria
 
     def obterImportacaoPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ImportacaoAnual]:
@@ -400,15 +562,12 @@ class SiteEmbrapa:
         Recupera do site da embrapa, toda importacao de um ano e de uma categoria específica.  Se o site estiver offline, retornará o processamento de cache obtido previamente.
         
         """
-        importacaoEmCache = self.repositorio_importacoes.buscar_importacoesPorAnoCategoria(ano, categoria)
+        importacaoEmCache = self.buscarRegistrosEmCache(OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[categoria], ano)
         if len(importacaoEmCache) == 0:
             try:
                 importacaoEmCache = self.carregaRepoImportacaoPorAnoCategoriaFromWebscraping(ano, categoria)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                importacaoEmCache = self.repositorio_importacoes.buscar_importacoesPorAnoCategoria(ano, categoria)
-            finally:
-                return importacaoEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                importacaoEmCache = self.carregaFallbackDaPagina(OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[categoria], ano, erro)
         return importacaoEmCache
 
     def obterExportacaoPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ExportacaoAnual]:
@@ -418,65 +577,70 @@ class SiteEmbrapa:
         """
         if categoria == EnumCategoria_im_ex.UVASPASSAS:
             raise Exception(f"Categoria [{categoria} não existente para Exportações.]")
-        exportacaoEmCache = self.repositorio_exportacoes.buscar_exportacoesPorAnoCategoria(ano, categoria)
+        exportacaoEmCache = self.buscarRegistrosEmCache(OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[categoria], ano)
         if len(exportacaoEmCache) == 0:
             try:
                 exportacaoEmCache = self.carregaRepoExportacaoPorAnoCategoriaFromWebscraping(ano, categoria)
-            except Exception as erro:
-                self.carregaRepositoriosFromArquivosCSV()
-                exportacaoEmCache = self.repositorio_exportacoes.buscar_exportacoesPorAnoCategoria(ano, categoria)
-            finally:
-                return exportacaoEmCache
+            except FALHAS_WEBSCRAPING as erro:
+                exportacaoEmCache = self.carregaFallbackDaPagina(OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[categoria], ano, erro)
         return exportacaoEmCache
 
     def carregaRepoProdutividadePorAnoFromWebscraping(self, ano: int) -> List[ProdutividadeAnual]:
-        rows = self.webscraping.obterProducaoPorAno(ano)
+        return self.carregaPaginaFromWebscraping(OPCAO_PRODUCAO, None, ano)
+
+    def carregaRepoProdutividadePorAnoFromRows(self, ano: int, rows: list, carregado_em: float = None) -> List[ProdutividadeAnual]:
+        carregado_em = carregado_em if carregado_em is not None else time.time()
 
         categoriaAtual: Categoria_prod = None
         produtoAtual: Produto_prod = None
         produtividadeAnualAtual: ProdutividadeAnual = None
+        lote: List[ProdutividadeAnual] = []
 
         """
             Carrega self.repositorio_produtos_prod, self.repositorio_categorias_prod e self.repositorio_produtividades com os elementos vindos do webscraping
         """
         for row in rows:
-            # Encontra todas as células da linha
-            cells = row.find_all("td")
-            if len(cells) == 2:
-                texto_coluna_0 = cells[0].text.strip()
-                texto_coluna_1 = cells[1].text.strip()
-                if "tb_item" in cells[0]['class']:
+            # (classe da primeira célula, texto das células): ver site_embrapa.extrator_html
+            if len(row) == 3:
+                classe, texto_coluna_0, texto_coluna_1 = row
+                classes = classe.split()
+                if "tb_item" in classes:
                     nomeCategoria = texto_coluna_0
                     categoriaAtual = self.repositorio_categorias_prod.buscar_categoria_por_nome(nomeCategoria)
                     if categoriaAtual == None:
                         categoriaAtual = Categoria_prod(nomeCategoria)
                         self.repositorio_categorias_prod.adicionar_categoria(categoriaAtual)
-                elif "tb_subitem" in cells[0]['class']:
+                elif "tb_subitem" in classes:
                     nomeProduto = texto_coluna_0
                     produtoAtual = self.repositorio_produtos_prod.buscar_produto_por_nome_categoria(nomeProduto, categoriaAtual)
                     if produtoAtual == None:
                         produtoAtual = Produto_prod(nomeProduto, categoriaAtual)
                         self.repositorio_produtos_prod.adicionar_produto(produtoAtual)
-                    produtividadeAnualAtual = ProdutividadeAnual(ano, texto_coluna_1, produtoAtual)
-                    self.repositorio_produtividades.adicionar_produtividade(produtividadeAnualAtual)
+                    produtividadeAnualAtual = ProdutividadeAnual(ano, texto_coluna_1, produtoAtual, EnumOrigemDados.WEBSCRAPING, carregado_em)
+                    lote.append(produtividadeAnualAtual)
+        self.repositorio_produtividades.adicionar_lote(lote)
         return self.repositorio_produtividades.buscar_produtividadesPorAno(ano)
 
     def carregaRepoProcessamentoPorAnoTipoUvaFromWebscraping(self, ano: int, tipo_uva: EnumTipoUva_proc) -> List[ProcessamentoAnual]:
-        rows = self.webscraping.obterProcessamentoPorAno_TipoUva(ano, tipo_uva)
+        return self.carregaPaginaFromWebscraping(OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[tipo_uva], ano)
+
+    def carregaRepoProcessamentoPorAnoTipoUvaFromRows(self, ano: int, rows: list, tipo_uva: EnumTipoUva_proc, carregado_em: float = None) -> List[ProcessamentoAnual]:
+        carregado_em = carregado_em if carregado_em is not None else time.time()
 
         categoriaAtual: Categoria_proc = None
         cultivarAtual: Cultivar_proc = None
         processamentoAnualAtual: ProcessamentoAnual = None
+        lote: List[ProcessamentoAnual] = []
 
         """
             Carrega self.repositorio_produtos_proc, self.repositorio_categorias_proc e self.repositorio_processamentos com os elementos vindos do webscraping
         """
         for row in rows:
-            cells = row.find_all("td")
-            if(len(cells) == 2):
-                texto_coluna_0 = cells[0].text.strip()
-                texto_coluna_1 = cells[1].text.strip()
-                if "tb_item" in cells[0]['class']:
+            # (classe da primeira célula, texto das células): ver site_embrapa.extrator_html
+            if len(row) == 3:
+                classe, texto_coluna_0, texto_coluna_1 = row
+                classes = classe.split()
+                if "tb_item" in classes:
                     nomeCategoria = texto_coluna_0
                     categoriaAtual = self.repositorio_categorias_proc.buscar_categoria_por_nome(nomeCategoria)
                     if categoriaAtual == None:
@@ -490,35 +654,40 @@ class SiteEmbrapa:
                         if cultivarAtual == None:
                             cultivarAtual = Cultivar_proc(nomeCultivar, categoriaAtual, tipo_uva)
                             self.repositorio_cultivares_proc.adicionar_cultivar(cultivarAtual)
-                        processamentoAnualAtual = ProcessamentoAnual(ano, texto_coluna_1, cultivarAtual)
-                        self.repositorio_processamentos.adicionar_processamento(processamentoAnualAtual)
-                elif "tb_subitem" in cells[0]['class']:
+                        processamentoAnualAtual = ProcessamentoAnual(ano, texto_coluna_1, cultivarAtual, EnumOrigemDados.WEBSCRAPING, carregado_em)
+                        lote.append(processamentoAnualAtual)
+                elif "tb_subitem" in classes:
                     nomeCultivar = texto_coluna_0
                     cultivarAtual = self.repositorio_cultivares_proc.buscar_cultivar_por_nome_categoria_tipo(nomeCultivar, categoriaAtual, tipo_uva)
                     if cultivarAtual == None:
                         cultivarAtual = Cultivar_proc(nomeCultivar, categoriaAtual, tipo_uva)
                         self.repositorio_cultivares_proc.adicionar_cultivar(cultivarAtual)
-                    processamentoAnualAtual = ProcessamentoAnual(ano, texto_coluna_1, cultivarAtual)
-                    self.repositorio_processamentos.adicionar_processamento(processamentoAnualAtual)
+                    processamentoAnualAtual = ProcessamentoAnual(ano, texto_coluna_1, cultivarAtual, EnumOrigemDados.WEBSCRAPING, carregado_em)
+                    lote.append(processamentoAnualAtual)
+        self.repositorio_processamentos.adicionar_lote(lote)
         return self.repositorio_processamentos.buscar_processamentosPorAno_TipoUva(ano, tipo_uva)
 
     def carregaRepoComercializacaoPorAnoFromWebscraping(self, ano: int) -> List[ProdutividadeAnual]:
-        rows = self.webscraping.obterComercializacaoPorAno(ano)
+        return self.carregaPaginaFromWebscraping(OPCAO_COMERCIALIZACAO, None, ano)
+
+    def carregaRepoComercializacaoPorAnoFromRows(self, ano: int, rows: list, carregado_em: float = None) -> List[ProdutividadeAnual]:
+        carregado_em = carregado_em if carregado_em is not None else time.time()
 
         categoriaAtual: Categoria_prod = None
         produtoAtual: Produto_prod = None
         comercializacaoAnualAtual: ComercializacaoAnual = None
         ultima_tag_foi_categoria: bool = False
+        lote: List[ComercializacaoAnual] = []
 
         """
             Carrega self.repositorio_produtos_com, self.repositorio_categorias_com e self.repositorio_comercializacoes com os elementos vindos do webscraping
         """
         for row in rows:
-            cells = row.find_all("td")
-            if len(cells) == 2:
-                texto_coluna_0 = cells[0].text.strip()
-                texto_coluna_1 = cells[1].text.strip()
-                if "tb_item" in cells[0]['class']:
+            # (classe da primeira célula, texto das células): ver site_embrapa.extrator_html
+            if len(row) == 3:
+                classe, texto_coluna_0, texto_coluna_1 = row
+                classes = classe.split()
+                if "tb_item" in classes:
                     if ultima_tag_foi_categoria == True:
                         # variáveis nomeCategoria e categoriaAtual estão com valores da linha anterior(linha de categoria que não tem produtos listados abaixo)
                         nomeProduto = nomeCategoria 
@@ -526,8 +695,8 @@ class SiteEmbrapa:
                         if produtoAtual == None:
                             produtoAtual = Produto_com(nomeProduto, categoriaAtual)
                             self.repositorio_produtos_com.adicionar_produto(produtoAtual)
-                        comercializacaoAnualAtual = ComercializacaoAnual(ano, quantidadeCategoria, produtoAtual) # quantidadeCategoria foi setado na linha de categoria anterior.  No loop anterior do for.
-                        self.repositorio_comercializacoes.adicionar_comercializacao(comercializacaoAnualAtual)
+                        comercializacaoAnualAtual = ComercializacaoAnual(ano, quantidadeCategoria, produtoAtual, EnumOrigemDados.WEBSCRAPING, carregado_em) # quantidadeCategoria foi setado na linha de categoria anterior.  No loop anterior do for.
+                        lote.append(comercializacaoAnualAtual)
                     # processa os dados da linha atual (tag_tr) do tbody do site.  Linha da categoria atual
                     nomeCategoria = texto_coluna_0
                     quantidadeCategoria = texto_coluna_1
@@ -536,172 +705,456 @@ class SiteEmbrapa:
                         categoriaAtual = Categoria_com(nomeCategoria)
                         self.repositorio_categorias_com.adicionar_categoria(categoriaAtual)
                     ultima_tag_foi_categoria = True
-                elif "tb_subitem" in cells[0]['class']:
+                elif "tb_subitem" in classes:
                     nomeProduto = texto_coluna_0
                     produtoAtual = self.repositorio_produtos_com.buscar_produto_por_nome_categoria(nomeProduto, categoriaAtual)
                     if produtoAtual == None:
                         produtoAtual = Produto_com(nomeProduto, categoriaAtual)
                         self.repositorio_produtos_com.adicionar_produto(produtoAtual)
-                    comercializacaoAnualAtual = ComercializacaoAnual(ano, texto_coluna_1, produtoAtual)
-                    self.repositorio_comercializacoes.adicionar_comercializacao(comercializacaoAnualAtual)
+                    comercializacaoAnualAtual = ComercializacaoAnual(ano, texto_coluna_1, produtoAtual, EnumOrigemDados.WEBSCRAPING, carregado_em)
+                    lote.append(comercializacaoAnualAtual)
                     ultima_tag_foi_categoria = False
+        self.repositorio_comercializacoes.adicionar_lote(lote)
         return self.repositorio_comercializacoes.buscar_comercializacoesPorAno(ano)
 
     def carregaRepoImportacaoPorAnoCategoriaFromWebscraping(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ImportacaoAnual]:
-        rows = self.webscraping.obterImportacaoPorAno_categoria(ano, categoria)
+        return self.carregaPaginaFromWebscraping(OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[categoria], ano)
+
+    def carregaRepoImportacaoPorAnoCategoriaFromRows(self, ano: int, rows: list, categoria: EnumCategoria_im_ex, carregado_em: float = None) -> List[ImportacaoAnual]:
+        carregado_em = carregado_em if carregado_em is not None else time.time()
 
         paisAtual: Pais = None
         importacaoAnualAtual: ImportacaoAnual = None
+        lote: List[ImportacaoAnual] = []
 
         """
             Carrega self.repositorio_importacoes, self.repositorio_categorias_im_ex e self.repositorio_paises com os elementos vindos do webscraping
         """
         for row in rows:
-            cells = row.find_all("td")
-            if(len(cells) == 3):
-                nomePais = cells[0].text.strip()
-                quantidadeAtual =cells[1].text.strip()
-                valorAtual = cells[2].text.strip()
+            # (classe da primeira célula, texto das células): ver site_embrapa.extrator_html
+            if len(row) == 4:
+                _, nomePais, quantidadeAtual, valorAtual = row
                 paisAtual = self.repositorio_paises.buscar_pais_por_nome(nomePais)
                 if paisAtual == None:
                     paisAtual = Pais(nomePais)
                     self.repositorio_paises.adicionar_pais(paisAtual)
-                importacaoAnualAtual = ImportacaoAnual(ano, valorAtual, quantidadeAtual, categoria, paisAtual)
-                self.repositorio_importacoes.adicionar_importacao(importacaoAnualAtual)
+                importacaoAnualAtual = ImportacaoAnual(ano, valorAtual, quantidadeAtual, categoria, paisAtual, EnumOrigemDados.WEBSCRAPING, carregado_em)
+                lote.append(importacaoAnualAtual)
+        self.repositorio_importacoes.adicionar_lote(lote)
         return self.repositorio_importacoes.buscar_importacoesPorAnoCategoria(ano, categoria)
 
     def carregaRepoExportacaoPorAnoCategoriaFromWebscraping(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ExportacaoAnual]:
-        rows = self.webscraping.obterExportacaoPorAno_categoria(ano, categoria)
+        return self.carregaPaginaFromWebscraping(OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[categoria], ano)
+
+    def carregaRepoExportacaoPorAnoCategoriaFromRows(self, ano: int, rows: list, categoria: EnumCategoria_im_ex, carregado_em: float = None) -> List[ExportacaoAnual]:
+        carregado_em = carregado_em if carregado_em is not None else time.time()
 
         paisAtual: Pais = None
         exportacaoAnualAtual: ExportacaoAnual = None
+        lote: List[ExportacaoAnual] = []
 
         """
             Carrega self.repositorio_importacoes, self.repositorio_categorias_im_ex e self.repositorio_paises com os elementos vindos do webscraping
         """
         for row in rows:
-            cells = row.find_all("td")
-            if(len(cells) == 3):
-                nomePais = cells[0].text.strip()
-                quantidadeAtual =cells[1].text.strip()
-                valorAtual = cells[2].text.strip()
+            # (classe da primeira célula, texto das células): ver site_embrapa.extrator_html
+            if len(row) == 4:
+                _, nomePais, quantidadeAtual, valorAtual = row
                 paisAtual = self.repositorio_paises.buscar_pais_por_nome(nomePais)
                 if paisAtual == None:
                     paisAtual = Pais(nomePais)
                     self.repositorio_paises.adicionar_pais(paisAtual)
-                exportacaoAnualAtual = ExportacaoAnual(ano, valorAtual, quantidadeAtual, categoria, paisAtual)
-                self.repositorio_exportacoes.adicionar_exportacao(exportacaoAnualAtual)
+                exportacaoAnualAtual = ExportacaoAnual(ano, valorAtual, quantidadeAtual, categoria, paisAtual, EnumOrigemDados.WEBSCRAPING, carregado_em)
+                lote.append(exportacaoAnualAtual)
+        self.repositorio_exportacoes.adicionar_lote(lote)
         return self.repositorio_exportacoes.buscar_exportacoesPorAnoCategoria(ano, categoria)
 
+    def carregaPaginaFromWebscraping(self, opcao: str, subopcao: str, ano: int) -> list:
+        """
+        Obtém via webscraping a página (opcao, subopcao) do ano, carrega as suas linhas nos repositórios e retorna os registros
+        do ano na página.  Chamadas simultâneas da mesma página são agrupadas: apenas uma faz o webscraping e as demais recebem
+        o seu resultado (ou a sua exceção).
+        """
+        return self.agrupador_requisicoes.executar((opcao, subopcao, ano), self.carregaPaginaFromWebscrapingSemAgrupar, opcao, subopcao, ano)
+
+    def carregaPaginaFromWebscrapingSemAgrupar(self, opcao: str, subopcao: str, ano: int) -> list:
+        with self.trava_repositorios:
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+        if len(registros) > 0:
+            return registros  # carregada por outra thread antes do início desta carga
+        if self.paginaVazia(opcao, subopcao, ano):
+            return registros  # sabidamente sem dados (cache negativo)
+        registros = self.carregaPaginaFromArmazenamento(opcao, subopcao, ano)
+        if len(registros) > 0:
+            return registros  # persistida por este ou por outro processo
+        rows = self.webscraping.obterPagina(opcao, subopcao, ano)
+        return self.carregaRepoFromPaginaWebscraping(opcao, subopcao, ano, rows)
+
+    def atualizaPaginaFromWebscraping(self, opcao: str, subopcao: str, ano: int, geracao: int = None) -> bool:
+        """
+        Obtém novamente do site a página (opcao, subopcao) do ano e substitui, de uma só vez, os registros do ano na página
+        pelos novos.  Se a página vier vazia, os registros atuais são mantidos (e retorna False, se houver registros); se vier
+        quebrada, levanta PaginaInvalida.  geracao: a do atualizador no agendamento; se os repositórios foram esvaziados
+        desde então, a página obtida é descartada (e retorna False).
+        """
+        rows = self.webscraping.obterPagina(opcao, subopcao, ano)
+        with self.trava_repositorios:
+            if geracao is not None and not self.atualizador.geracaoAtual(geracao):
+                return False
+            if len(rows) == 0:
+                if len(self.buscarRegistrosDaPagina(opcao, subopcao, ano)) > 0:
+                    return False
+                self.carregaRepoFromPaginaWebscraping(opcao, subopcao, ano, rows)
+                return True
+            self.removeRegistrosDaPagina(opcao, subopcao, ano)
+            self.carregaRepoFromPaginaWebscraping(opcao, subopcao, ano, rows)
+        return True
+
+    def removeRegistrosDaPagina(self, opcao: str, subopcao: str, ano: int):
+        """
+        Remove dos repositórios os registros do ano na página (opcao, subopcao).
+        """
+        with self.trava_repositorios:
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+            if opcao == OPCAO_PRODUCAO:
+                self.repositorio_produtividades.remover_lote(registros)
+            elif opcao == OPCAO_COMERCIALIZACAO:
+                self.repositorio_comercializacoes.remover_lote(registros)
+            elif opcao == OPCAO_PROCESSAMENTO:
+                self.repositorio_processamentos.remover_lote(registros)
+            elif opcao == OPCAO_IMPORTACAO:
+                self.repositorio_importacoes.remover_lote(registros)
+            else:
+                self.repositorio_exportacoes.remover_lote(registros)
+
+    def carregaRepoFromPaginaWebscraping(self, opcao: str, subopcao: str, ano: int, rows: list, carregado_em: float = None) -> list:
+        """
+        Carrega nos repositórios as linhas da tabela obtidas via webscraping da página (opcao, subopcao) do ano e retorna os
+        registros do ano na página.  Se a página já tiver registros nos repositórios (carregada por outra thread), as linhas
+        são descartadas e são retornados os registros existentes.  Uma página sem linhas (ano sem dados) é registrada no cache
+        negativo, para não ser obtida do site novamente até a entrada vencer.  Com o armazenamento persistente, os registros
+        carregados são gravados nele em segundo plano.  A página é registrada no gerenciador de memória (ver
+        registraPaginaNaMemoria).  carregado_em: momento em que as linhas foram obtidas do site (por padrão, o atual).  Levanta
+        ValueError para opção ou subopção desconhecida.
+        """
+        with self.trava_repositorios:
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+            if len(registros) > 0:
+                return registros
+            if len(rows) == 0:
+                self.cache_negativo.registrar((opcao, subopcao, ano), MOTIVO_PAGINA_VAZIA)
+                return registros
+            self.cache_negativo.remover((opcao, subopcao, ano))
+            if opcao == OPCAO_PRODUCAO:
+                registros = self.carregaRepoProdutividadePorAnoFromRows(ano, rows, carregado_em=carregado_em)
+            elif opcao == OPCAO_COMERCIALIZACAO:
+                registros = self.carregaRepoComercializacaoPorAnoFromRows(ano, rows, carregado_em=carregado_em)
+            elif opcao == OPCAO_PROCESSAMENTO:
+                registros = self.carregaRepoProcessamentoPorAnoTipoUvaFromRows(ano, rows, TIPOS_UVA_POR_SUBOPCAO[subopcao], carregado_em)
+            elif opcao == OPCAO_IMPORTACAO:
+                registros = self.carregaRepoImportacaoPorAnoCategoriaFromRows(ano, rows, CATEGORIAS_IMPORTACAO_POR_SUBOPCAO[subopcao], carregado_em)
+            else:
+                registros = self.carregaRepoExportacaoPorAnoCategoriaFromRows(ano, rows, CATEGORIAS_EXPORTACAO_POR_SUBOPCAO[subopcao], carregado_em)
+            self.registraPaginaNaMemoria(opcao, subopcao, ano, registros)
+            if self.armazenamento is not None and len(registros) > 0:
+                self.armazenamento.agendarGravacao((opcao, subopcao, ano), registros[0].origem.value, registros[0].carregado_em,
+                                                   self.serializaRegistros(opcao, registros))
+            return registros
+
+    def serializaRegistros(self, opcao: str, registros: list) -> list:
+        """
+        Registros da página como tuplas (categoria, item, pais, quantidade, valor) do armazenamento persistente.
+        """
+        if opcao in (OPCAO_IMPORTACAO, OPCAO_EXPORTACAO):
+            return [(None, None, registro.pais.nome, registro.quantidade, registro.valor) for registro in registros]
+        itens = [registro.cultivar if opcao == OPCAO_PROCESSAMENTO else registro.produto for registro in registros]
+        return [(item.categoria.nome if item.categoria else None, item.nome, None, registro.quantidade, None)
+                for item, registro in zip(itens, registros)]
+
+    def carregaPaginaFromArmazenamento(self, opcao: str, subopcao: str, ano: int) -> list:
+        """
+        Read-through do armazenamento persistente: carrega nos repositórios a página (opcao, subopcao) do ano gravada no
+        banco, com a origem e o momento da carga originais, e retorna os registros do ano na página (lista vazia se não
+        houver armazenamento ou a página não estiver gravada).  Se a página estiver vencida, agenda a sua atualização.
+        """
+        if self.armazenamento is None:
+            return []
+        persistida = self.armazenamento.lerPagina(opcao, subopcao, ano)
+        if persistida is None or len(persistida.registros) == 0:
+            return []
+        anos = (ano,)
+        origem = EnumOrigemDados(persistida.origem)
+        with self.trava_repositorios:
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+            if len(registros) > 0:
+                return registros
+            if opcao in (OPCAO_IMPORTACAO, OPCAO_EXPORTACAO):
+                linhas = [(pais, (quantidade,), (valor,)) for _, _, pais, quantidade, valor in persistida.registros]
+            else:
+                linhas = [(categoria, item, (quantidade,)) for categoria, item, _, quantidade, _ in persistida.registros]
+            if opcao == OPCAO_PRODUCAO:
+                self.carregaRepoProdutividadeFromLinhas(anos, linhas, origem, persistida.carregado_em)
+            elif opcao == OPCAO_COMERCIALIZACAO:
+                self.carregaRepoComercializacaoFromLinhas(anos, linhas, origem, persistida.carregado_em)
+            elif opcao == OPCAO_PROCESSAMENTO:
+                self.carregaRepoProcessamentoFromLinhas(anos, linhas, TIPOS_UVA_POR_SUBOPCAO[subopcao], origem, persistida.carregado_em)
+            elif opcao == OPCAO_IMPORTACAO:
+                self.carregaRepoImportacaoFromLinhas(anos, linhas, CATEGORIAS_IMPORTACAO_POR_SUBOPCAO[subopcao], origem, persistida.carregado_em)
+            else:
+                self.carregaRepoExportacaoFromLinhas(anos, linhas, CATEGORIAS_EXPORTACAO_POR_SUBOPCAO[subopcao], origem, persistida.carregado_em)
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+            self.registraPaginaNaMemoria(opcao, subopcao, ano, registros)
+        if len(registros) > 0 and self.paginaVencida(registros):
+            self.atualizador.agendar((opcao, subopcao, ano))
+        return registros
+
+    def buscarRegistrosEmCache(self, opcao: str, subopcao: str, ano: int) -> list:
+        """
+        Registros da página (opcao, subopcao) do ano existentes nos repositórios, lidos sob a trava dos repositórios (sem ver
+        uma atualização pela metade).  Se a página estiver vencida, agenda a sua atualização em segundo plano e retorna os
+        registros atuais.  Se o seu tempo de vida na memória tiver terminado (ver site_embrapa.gerenciador_cache), a página
+        é descartada e retorna a lista vazia, para que seja obtida novamente.
+        """
+        with self.trava_repositorios:
+            registros = self.buscarRegistrosDaPagina(opcao, subopcao, ano)
+            if len(registros) > 0 and not self.gerenciador_cache.acessar((opcao, subopcao, ano)):
+                self.descartaPaginaDaMemoria(opcao, subopcao, ano)
+                return []
+        if len(registros) > 0 and self.paginaVencida(registros):
+            self.atualizador.agendar((opcao, subopcao, ano))
+        return registros
+
+    def registraPaginaNaMemoria(self, opcao: str, subopcao: str, ano: int, registros: list):
+        """
+        Registra no gerenciador de memória a página (opcao, subopcao) do ano, recém-carregada com os registros informados, e
+        descarta dos repositórios as páginas que ele indicar (vencidas ou acima do limite de memória).
+        """
+        if len(registros) == 0:
+            return
+        with self.trava_repositorios:
+            for pagina in self.gerenciador_cache.registrar((opcao, subopcao, ano), len(registros)):
+                self.descartaPaginaDaMemoria(*pagina)
+
+    def descartaPaginaDaMemoria(self, opcao: str, subopcao: str, ano: int):
+        """
+        Descarta de uma só vez os registros do ano na página (opcao, subopcao) dos repositórios e dos seus índices.  O ano
+        volta a poder ser carregado do arquivo .CSV da página pelo fallback, se o site estiver fora do ar; os demais anos
+        descartados continuam sendo obtidos do site.
+        """
+        with self.trava_repositorios:
+            self.removeRegistrosDaPagina(opcao, subopcao, ano)
+            self.anos_carregados_csv.get((opcao, subopcao), set()).discard(ano)
+
+    def paginaVazia(self, opcao: str, subopcao: str, ano: int) -> bool:
+        """
+        Indica se a página (opcao, subopcao) do ano está no cache negativo, como sabidamente sem dados (ver
+        site_embrapa.cache_negativo).
+        """
+        return self.cache_negativo.contem((opcao, subopcao, ano))
+
+    def obterIdadePagina(self, registros: list) -> float:
+        """
+        Segundos desde o webscraping da página dos registros informados, ou None se eles não vieram do webscraping (p.ex.
+        carregados dos arquivos .CSV, que não vencem).
+        """
+        registro = registros[0]
+        if registro.origem != EnumOrigemDados.WEBSCRAPING or registro.carregado_em is None:
+            return None
+        return time.time() - registro.carregado_em
+
+    def paginaVencida(self, registros: list) -> bool:
+        if self.tempo_validade is None:
+            return False
+        idade = self.obterIdadePagina(registros)
+        return idade is not None and idade > self.tempo_validade
+
+    def buscarRegistrosDaPagina(self, opcao: str, subopcao: str, ano: int) -> list:
+        """
+        Registros já existentes nos repositórios (cache) para a página (opcao, subopcao) do ano.  Levanta ValueError para
+        opção ou subopção desconhecida.
+        """
+        if opcao == OPCAO_PRODUCAO:
+            return self.repositorio_produtividades.buscar_produtividadesPorAno(ano)
+        if opcao == OPCAO_COMERCIALIZACAO:
+            return self.repositorio_comercializacoes.buscar_comercializacoesPorAno(ano)
+        if opcao == OPCAO_PROCESSAMENTO and subopcao in TIPOS_UVA_POR_SUBOPCAO:
+            return self.repositorio_processamentos.buscar_processamentosPorAno_TipoUva(ano, TIPOS_UVA_POR_SUBOPCAO[subopcao])
+        if opcao == OPCAO_IMPORTACAO and subopcao in CATEGORIAS_IMPORTACAO_POR_SUBOPCAO:
+            return self.repositorio_importacoes.buscar_importacoesPorAnoCategoria(ano, CATEGORIAS_IMPORTACAO_POR_SUBOPCAO[subopcao])
+        if opcao == OPCAO_EXPORTACAO and subopcao in CATEGORIAS_EXPORTACAO_POR_SUBOPCAO:
+            return self.repositorio_exportacoes.buscar_exportacoesPorAnoCategoria(ano, CATEGORIAS_EXPORTACAO_POR_SUBOPCAO[subopcao])
+        raise ValueError(f"Página [{opcao}, {subopcao}] desconhecida.")
+
+    def obterMetricas(self) -> dict:
+        """
+        Métricas de funcionamento do webscraping e dos caches, uma entrada por componente (ver o obterMetricas de cada um).
+        """
+        metricas = {"http": self.webscraping.cliente_http.obterMetricas(), "disjuntor": self.webscraping.disjuntor.obterMetricas(),
+                    "limitador": self.webscraping.limitador.obterMetricas(), "retentativas": self.webscraping.retentativas.obterMetricas(),
+                    "validacao": self.webscraping.validador.obterMetricas(), "cache_negativo": self.cache_negativo.obterMetricas(),
+                    "memoria": self.gerenciador_cache.obterMetricas(), "agrupamento": self.agrupador_requisicoes.obterMetricas(),
+                    "atualizacao": dict(self.atualizador.obterMetricas(), tempo_validade=self.tempo_validade)}
+        with self.trava_repositorios:
+            metricas["fallback_csv"] = dict(self.fallbacks)
+        if self.webscraping.cache_html is not None:
+            metricas["cache_html"] = self.webscraping.cache_html.obterMetricas()
+        if self.armazenamento is not None:
+            metricas["armazenamento"] = self.armazenamento.obterMetricas()
+        return metricas
+
 class WebscrapingSiteEmbrapa:
     """
     Realiza o webscraping na página especifica do site, de acordo com o método utilizado. (Producao, Processamento etc...)
+    As páginas são obtidas pelo cliente_http, que mantém o pool de conexões com o site e aplica os timeouts, e as linhas da
+    tabela de dados são extraídas pelo extrator (função ou nome de site_embrapa.extrator_html.EXTRATORES; por padrão, o mais
+    rápido disponível).  Com cache_html, as páginas obtidas são guardadas em disco e revalidadas com GETs condicionais.
+    Falhas seguidas do site abrem o disjuntor (ver site_embrapa.disjuntor): enquanto aberto, as páginas não são pedidas ao
+    site e obterPagina levanta DisjuntorAberto imediatamente.  O limitador (ver site_embrapa.limitador) controla a taxa de
+    requisições ao site, atendendo as consultas interativas antes das de segundo plano.  Falhas passageiras são repetidas
+    conforme a política de retentativas (ver site_embrapa.retentativas) antes de contarem como falha.  As páginas obtidas
+    são validadas (ver site_embrapa.validacao_pagina): páginas quebradas não são guardadas no cache, contam como falha para
+    o disjuntor e levantam PaginaInvalida.
 
     """
-    def __init__(self, urlBase: str):
+    def __init__(self, urlBase: str, cliente_http: ClienteHttp = None, extrator = None, cache_html: CacheHtml = None,
+                 disjuntor: Disjuntor = None, limitador: LimitadorRequisicoes = None, retentativas: PoliticaRetentativas = None,
+                 validador: ValidadorPaginas = None):
         self.UrlBase = urlBase
+        self.cliente_http = cliente_http or ClienteHttp()
+        self.disjuntor = disjuntor or Disjuntor()
+        self.limitador = limitador or LimitadorRequisicoes()
+        self.retentativas = retentativas or PoliticaRetentativas()
+        self.validador = validador or ValidadorPaginas()
+        self.extrator = extrator if callable(extrator) else extrator_html.obter_extrator(extrator)
+        self.cache_html = cache_html
 
     def obterProducaoPorAno(self, ano: int) -> list:
         """
-        Realiza o Webscraping no site da embrapa.  Retornalista de elementos das tags_tr_do_tbody.
+        Realiza o Webscraping no site da embrapa.  Retorna as linhas da tabela de dados (ver site_embrapa.extrator_html).
 
         """
-        url = f"{self.UrlBase}?ano={ano}&opcao=opt_02"
-        cssSelector = "table.tb_base.tb_dados tbody tr"
-
-        retorno = self.obterElementosTR(url, cssSelector)
-
-        return retorno
+        return self.obterPagina(OPCAO_PRODUCAO, None, ano)
 
     def obterProcessamentoPorAno_TipoUva(self, ano: int, tipo_uva: EnumTipoUva_proc) -> list:
         """
-        Realiza o Webscraping no site da embrapa.  Retornalista de elementos das tags_tr_do_tbody.
+        Realiza o Webscraping no site da embrapa.  Retorna as linhas da tabela de dados (ver site_embrapa.extrator_html).
 
         """
-        if tipo_uva == EnumTipoUva_proc.VINIFERAS:
-            subopcao_tipouva = "subopt_01"
-        elif tipo_uva == EnumTipoUva_proc.AMERICANASEHIBRIDAS:
-            subopcao_tipouva = "subopt_02"
-        elif tipo_uva == EnumTipoUva_proc.UVASDEMESA:
-            subopcao_tipouva = "subopt_03"
-        elif tipo_uva == EnumTipoUva_proc.SEMCLASSIFICACAO:
-            subopcao_tipouva = "subopt_04"
-        else:
-            subopcao_tipouva = "subopt_04"
+        subopcao_tipouva = SUBOPCOES_PROCESSAMENTO.get(tipo_uva, "subopt_04")
 
-        url = f"{self.UrlBase}?ano={ano}&opcao=opt_03&subopcao={subopcao_tipouva}" 
-        cssSelector = "table.tb_base.tb_dados tbody tr"
-
-        retorno = self.obterElementosTR(url, cssSelector)
-
-        return retorno
+        return self.obterPagina(OPCAO_PROCESSAMENTO, subopcao_tipouva, ano)
 
     def obterComercializacaoPorAno(self, ano: int) -> list:
         """
-        Realiza o Webscraping no site da embrapa.  Retornalista de elementos das tags_tr_do_tbody.
+        Realiza o Webscraping no site da embrapa.  Retorna as linhas da tabela de dados (ver site_embrapa.extrator_html).
 
         """
-        url = f"{self.UrlBase}?ano={ano}&opcao=opt_04" 
-        cssSelector = "table.tb_base.tb_dados tbody tr"
-
-        retorno = self.obterElementosTR(url, cssSelector)
-
-        return retorno
+        return self.obterPagina(OPCAO_COMERCIALIZACAO, None, ano)
 
     def obterImportacaoPorAno_categoria(self, ano: int, categoria: EnumCategoria_im_ex) -> list:
         """
-        Realiza o Webscraping no site da embrapa.  Retornalista de elementos das tags_tr_do_tbody.
+        Realiza o Webscraping no site da embrapa.  Retorna as linhas da tabela de dados (ver site_embrapa.extrator_html).
 
         """
-        if categoria == EnumCategoria_im_ex.VINHOSDEMESA:
-            subopcao_categoria = "subopt_01"
-        elif categoria == EnumCategoria_im_ex.ESPUMANTES:
-            subopcao_categoria = "subopt_02"
-        elif categoria == EnumCategoria_im_ex.UVASFRESCAS:
-            subopcao_categoria = "subopt_03"
-        elif categoria == EnumCategoria_im_ex.UVASPASSAS:
-            subopcao_categoria = "subopt_04"
-        elif categoria == EnumCategoria_im_ex.SUCODEUVA:
-            subopcao_categoria = "subopt_05"
-        else:
-            subopcao_categoria = "subopt_99"
+        subopcao_categoria = SUBOPCOES_IMPORTACAO.get(categoria, "subopt_99")
 
-        url = f"{self.UrlBase}?ano={ano}&opcao=opt_05&subopcao={subopcao_categoria}" 
-        cssSelector = "table.tb_base.tb_dados tbody tr"
-
-        retorno = self.obterElementosTR(url, cssSelector)
-
-        return retorno
+        return self.obterPagina(OPCAO_IMPORTACAO, subopcao_categoria, ano)
 
     def obterExportacaoPorAno_categoria(self, ano: int, categoria: EnumCategoria_im_ex) -> list:
         """
-        Realiza o Webscraping no site da embrapa.  Retornalista de elementos das tags_tr_do_tbody.
+        Realiza o Webscraping no site da embrapa.  Retorna as linhas da tabela de dados (ver site_embrapa.extrator_html).
 
         """
-        if categoria == EnumCategoria_im_ex.VINHOSDEMESA:
-            subopcao_categoria = "subopt_01"
-        elif categoria == EnumCategoria_im_ex.ESPUMANTES:
-            subopcao_categoria = "subopt_02"
-        elif categoria == EnumCategoria_im_ex.UVASFRESCAS:
-            subopcao_categoria = "subopt_03"
-        elif categoria == EnumCategoria_im_ex.SUCODEUVA:
-            subopcao_categoria = "subopt_04"
-        else:
-            subopcao_categoria = "subopt_99"
+        subopcao_categoria = SUBOPCOES_EXPORTACAO.get(categoria, "subopt_99")
 
-        url = f"{self.UrlBase}?ano={ano}&opcao=opt_06&subopcao={subopcao_categoria}" 
-        cssSelector = "table.tb_base.tb_dados tbody tr"
+        return self.obterPagina(OPCAO_EXPORTACAO, subopcao_categoria, ano)
+
+    def urlPagina(self, opcao: str, subopcao: str, ano: int) -> str:
+        """
+        Url da página (opcao, subopcao) do site para o ano.  subopcao None para páginas sem subopções (Produção e Comercialização).
+        """
+        if subopcao is None:
+            return f"{self.UrlBase}?ano={ano}&opcao={opcao}"
+        return f"{self.UrlBase}?ano={ano}&opcao={opcao}&subopcao={subopcao}"
 
-        retorno = self.obterElementosTR(url, cssSelector)
+    def obterPagina(self, opcao: str, subopcao: str, ano: int) -> list:
+        """
+        Realiza o Webscraping da página (opcao, subopcao) do site para o ano.  Retorna as linhas da tabela de dados, como
+        tuplas (classe, texto_coluna_0, texto_coluna_1[, texto_coluna_2]) - ver site_embrapa.extrator_html; lista vazia
+        para um ano sem dados no site.  Com cache_html, a página em cache é revalidada com um GET condicional e, se o site
+        responder 304 (não modificada), é usado o conteúdo do cache; páginas novas válidas são gravadas no cache.
+        Falhas de conexão, timeouts, erros 5xx e respostas 429 (limite de requisições excedido) que persistirem após as
+        retentativas contam como uma falha para o disjuntor; as respostas 5xx e 429 levantam requests.HTTPError.  Páginas
+        quebradas, inclusive as que o extrator não consegue ler, também contam como falha e levantam PaginaInvalida.  Toda
+        requisição permitida pelo disjuntor termina registrando sucesso ou falha (senão a requisição de teste deixaria o
+        disjuntor semiaberto para sempre).
+        """
+        url = self.urlPagina(opcao, subopcao, ano)
+        entrada = self.cache_html.ler(opcao, subopcao, ano) if self.cache_html else None
+        self.disjuntor.verificar()
+        try:
+            response = self.obterRespostaComRetentativas(url, entrada.cabecalhosCondicionais() if entrada else None)
+            revalidada = entrada is not None and response.status_code == 304
+            if revalidada:
+                rows = self.extrair(opcao, subopcao, ano, entrada.conteudo)
+            else:
+                rows = self.extrair(opcao, subopcao, ano, response.content)
+                self.validador.validar(opcao, subopcao, ano, response.content, rows)
+        except Exception:
+            self.disjuntor.registrarFalha()
+            raise
+        self.disjuntor.registrarSucesso()
+        if revalidada:
+            self.cache_html.registrarRevalidacao(entrada)
+            return rows
+        if self.cache_html is not None and response.status_code == 200:
+            self.cache_html.gravar(opcao, subopcao, ano, response.content, url,
+                                   response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return rows
 
-        return retorno
+    def extrair(self, opcao: str, subopcao: str, ano: int, conteudo: bytes) -> list:
+        """
+        Linhas da tabela de dados extraídas do conteúdo da página.  Levanta PaginaInvalida se o extrator falhar.
+        """
+        try:
+            return self.extrator(conteudo)
+        except Exception as erro:
+            raise PaginaInvalida((opcao, subopcao, ano), f"falha na extração ({type(erro).__name__}: {erro})") from erro
+
+    def obterRespostaComRetentativas(self, url: str, cabecalhos: dict = None) -> requests.Response:
+        """
+        GET da url pelo cliente_http, repetido conforme a política de retentativas.  Cada tentativa aguarda a sua vez no
+        limitador de taxa e o seu timeout é limitado ao que resta do prazo total das retentativas, contado a partir da
+        primeira tentativa.  Levanta a exceção da última tentativa.
+        """
+        inicio = None
+        tentativa = 1
+        while True:
+            self.limitador.aguardar()
+            if inicio is None:
+                inicio = time.monotonic()
+            prazo_restante = self.retentativas.prazo_total - (time.monotonic() - inicio)
+            try:
+                if prazo_restante <= 0:
+                    raise requests.Timeout(f"Prazo total de {self.retentativas.prazo_total}s das retentativas esgotado.")
+                response = self.cliente_http.get(url, cabecalhos, prazo_restante)
+                if response.status_code >= 500 or response.status_code == 429:
+                    response.raise_for_status()
+                self.retentativas.registrarSucesso(tentativa)
+                return response
+            except Exception as erro:
+                espera = self.retentativas.esperaAntesDaProxima(tentativa, erro, time.monotonic() - inicio)
+                if espera is None:
+                    raise
+            time.sleep(espera)
+            tentativa += 1
 
     def obterElementosTR(self, url: str, cssSelector: str) -> list:
         """
         Abre a página da url e obtem lista de WebElement
 
         """
-        response = requests.get(url)
+        response = self.obterRespostaComRetentativas(url)
         soup = BeautifulSoup(response.content, "html.parser")
         rows = soup.select(cssSelector)
 
@@ -0,0 +1,132 @@
+"""
+Fachada assíncrona (asyncio) do SiteEmbrapa, para obter várias páginas (opcao, subopcao, ano) do site ao mesmo tempo.
+"""
+
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+from modelo_dados.producao import ProdutividadeAnual
+from modelo_dados.processamento import EnumTipoUva_proc, ProcessamentoAnual
+from modelo_dados.comercializacao import ComercializacaoAnual
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex, ImportacaoAnual, ExportacaoAnual
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.opcoes import OPCAO_PRODUCAO, OPCAO_PROCESSAMENTO, OPCAO_COMERCIALIZACAO, OPCAO_IMPORTACAO, OPCAO_EXPORTACAO
+from site_embrapa.opcoes import SUBOPCOES_PROCESSAMENTO, SUBOPCOES_IMPORTACAO, SUBOPCOES_EXPORTACAO, PAGINAS_SITE
+
+MAX_CONCORRENCIA = 8
+
+# (opcao, subopcao, ano)
+PaginaAno = Tuple[str, Optional[str], int]
+
+class SiteEmbrapaAsync:
+    """
+    Versão assíncrona dos métodos de consulta do SiteEmbrapa, que compartilha com ele os repositórios (cache) e o webscraping.
+
+    Atributos:
+        site (SiteEmbrapa): SiteEmbrapa cujos repositórios são carregados.
+        max_concorrencia (int): Quantidade máxima de páginas sendo baixadas ao mesmo tempo.
+    """
+    def __init__(self, site: SiteEmbrapa = None, max_concorrencia: int = MAX_CONCORRENCIA):
+        self.site = site or SiteEmbrapa()
+        self.max_concorrencia = max_concorrencia
+        self.semaforo_loop = None
+        self.loop_semaforo = None
+
+    def semaforo(self) -> asyncio.Semaphore:
+        """
+        Semáforo compartilhado pelas chamadas no event loop corrente (um asyncio.Semaphore só pode ser usado em um event loop).
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop_semaforo is not loop:
+            self.semaforo_loop = asyncio.Semaphore(self.max_concorrencia)
+            self.loop_semaforo = loop
+        return self.semaforo_loop
+
+    async def obterPagina(self, opcao: str, subopcao: str, ano: int) -> list:
+        """
+        Obtém via webscraping a página (opcao, subopcao) do ano e a carrega nos repositórios (ver
+        SiteEmbrapa.carregaPaginaFromWebscraping): cargas simultâneas da mesma página, síncronas ou assíncronas, são
+        agrupadas em uma única requisição ao site.  Retorna os registros do ano na página.
+        """
+        async with self.semaforo():
+            return await asyncio.to_thread(self.site.carregaPaginaFromWebscraping, opcao, subopcao, ano)
+
+    async def obterPaginas(self, paginas: List[PaginaAno]) -> list:
+        """
+        Obtém via webscraping as páginas ao mesmo tempo e as carrega nos repositórios.  Retorna, na ordem das páginas, os
+        registros de cada uma ou a exceção que impediu a sua carga.
+        """
+        return await asyncio.gather(*(self.obterPagina(*pagina) for pagina in paginas), return_exceptions=True)
+
+    async def carregaPaginas(self, paginas: Iterable[PaginaAno]) -> Dict[PaginaAno, list]:
+        """
+        Baixa ao mesmo tempo as páginas (opcao, subopcao, ano) que ainda não possuem registros (ver paginasPendentes) e as
+        carrega nos repositórios, com o fallback dos arquivos .CSV para as que falharem, como os métodos obter* do
+        SiteEmbrapa.  Retorna os registros de cada página.
+        """
+        paginas = list(dict.fromkeys(paginas))
+        pendentes = await asyncio.to_thread(self.paginasPendentes, paginas)
+        resultados = await self.obterPaginas(pendentes)
+        for resultado in resultados:
+            if isinstance(resultado, BaseException) and not isinstance(resultado, Exception):
+                raise resultado  # cancelamento
+        return await asyncio.to_thread(self.carregaResultados, paginas, pendentes, resultados)
+
+    def paginasPendentes(self, paginas: List[PaginaAno]) -> List[PaginaAno]:
+        """
+        Páginas sem registros nos repositórios, fora do cache negativo e ausentes do armazenamento persistente, que é lido
+        antes (read-through).  Executado fora do event loop, como toda leitura em disco e carga nos repositórios.
+        """
+        pendentes = [pagina for pagina in paginas
+                     if len(self.site.buscarRegistrosEmCache(*pagina)) == 0 and not self.site.paginaVazia(*pagina)]
+        return [pagina for pagina in pendentes if len(self.site.carregaPaginaFromArmazenamento(*pagina)) == 0]
+
+    def carregaResultados(self, paginas: List[PaginaAno], pendentes: List[PaginaAno], resultados: list) -> Dict[PaginaAno, list]:
+        """
+        Carrega o arquivo .CSV das páginas pendentes cujo webscraping falhou (resultado é a exceção), informando a falha ao
+        fallback, e retorna os registros de cada página.
+        """
+        for pagina, resultado in zip(pendentes, resultados):
+            if isinstance(resultado, Exception):
+                self.site.carregaFallbackDaPagina(*pagina, resultado)
+        with self.site.trava_repositorios:
+            return {pagina: self.site.buscarRegistrosDaPagina(*pagina) for pagina in paginas}
+
+    @staticmethod
+    def motivoDaFalha(resultado) -> Optional[str]:
+        """
+        Motivo da falha do webscraping de uma página (resultado é a exceção, ver obterPaginas), ou None se ela foi carregada.
+        """
+        if isinstance(resultado, Exception):
+            return f"{type(resultado).__name__}: {resultado}"
+        return None
+
+    async def carregaAno(self, ano: int) -> Dict[PaginaAno, list]:
+        """
+        Carrega todas as páginas do site (Produção, Processamento, Comercialização, Importação e Exportação) do ano.
+        """
+        return await self.carregaPaginas((opcao, subopcao, ano) for opcao, subopcao in PAGINAS_SITE)
+
+    async def carregaAnos(self, anos: Iterable[int]) -> Dict[PaginaAno, list]:
+        """
+        Carrega todas as páginas do site dos anos informados.
+        """
+        return await self.carregaPaginas((opcao, subopcao, ano) for ano in anos for opcao, subopcao in PAGINAS_SITE)
+
+    async def obterRegistrosDaPagina(self, opcao: str, subopcao: str, ano: int) -> list:
+        pagina = (opcao, subopcao, ano)
+        return (await self.carregaPaginas([pagina]))[pagina]
+
+    async def obterProducoesPorAno(self, ano: int) -> List[ProdutividadeAnual]:
+        return await self.obterRegistrosDaPagina(OPCAO_PRODUCAO, None, ano)
+
+    async def obterProcessamentoPorAnoTipoUva(self, ano: int, tipo_uva: EnumTipoUva_proc) -> List[ProcessamentoAnual]:
+        return await self.obterRegistrosDaPagina(OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO[tipo_uva], ano)
+
+    async def obterComercializacoesPorAno(self, ano: int) -> List[ComercializacaoAnual]:
+        return await self.obterRegistrosDaPagina(OPCAO_COMERCIALIZACAO, None, ano)
+
+    async def obterImportacaoPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ImportacaoAnual]:
+        return await self.obterRegistrosDaPagina(OPCAO_IMPORTACAO, SUBOPCOES_IMPORTACAO[categoria], ano)
+
+    async def obterExportacaoPorAnoCategoria(self, ano: int, categoria: EnumCategoria_im_ex) -> List[ExportacaoAnual]:
+        return await self.obterRegistrosDaPagina(OPCAO_EXPORTACAO, SUBOPCOES_EXPORTACAO[categoria], ano)
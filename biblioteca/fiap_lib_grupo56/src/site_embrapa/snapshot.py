@@ -0,0 +1,153 @@
+"""
+Snapshot binário (marshal + zlib) das linhas intermediárias dos arquivos .CSV da Embrapa.
+
+Formato: ASSINATURA_SNAPSHOT | versão (uint16) | versão do marshal (uint16) | resumo dos .CSV | zlib(marshal(conteúdo)).
+Um snapshot com outro resumo é recusado e regerado pela carga completa; para regerá-lo: python gerar_snapshot.py
+"""
+
+import hashlib
+import marshal
+import os
+import struct
+import threading
+import zlib
+from importlib.resources import files, as_file
+from site_embrapa import leitor_csv
+
+ARQUIVO_SNAPSHOT = "repositorios.snapshot"
+ASSINATURA_SNAPSHOT = b"VITIBRASIL"
+VERSAO_SNAPSHOT = 3
+TAMANHO_RESUMO = 16
+
+# Conteúdo decodificado dos snapshots já lidos pelo processo: {caminho: (assinatura dos arquivos, conteúdo)}
+_snapshots_lidos = {}
+_trava_snapshots_lidos = threading.Lock()
+
+class SnapshotInvalido(Exception):
+    """
+    O snapshot não existe, está corrompido ou foi gerado em uma versão de formato (ou de marshal) incompatível.
+    """
+
+class SnapshotDesatualizado(SnapshotInvalido):
+    """
+    O snapshot foi gerado a partir de arquivos .CSV diferentes dos empacotados.
+    """
+
+def resumo_csv() -> bytes:
+    """
+    Resumo (blake2b) do nome e do conteúdo de todos os arquivos .CSV empacotados.
+    """
+    resumo = hashlib.blake2b(digest_size=TAMANHO_RESUMO)
+    pasta_csv = files("site_embrapa.arquivos_csv")
+    for arquivo_csv, _ in sorted(leitor_csv.ARQUIVOS_CSV.values()):
+        conteudo = pasta_csv.joinpath(arquivo_csv).read_bytes()
+        resumo.update(arquivo_csv.encode() + struct.pack("<Q", len(conteudo)))
+        resumo.update(conteudo)
+    return resumo.digest()
+
+def gerar_conteudo() -> dict:
+    """
+    Lê todos os arquivos .CSV e monta o conteúdo do snapshot: {(opcao, subopcao): (anos, linhas)}.
+    """
+    return leitor_csv.ler_todas_linhas()
+
+def serializar(conteudo: dict, resumo: bytes) -> bytes:
+    cabecalho = ASSINATURA_SNAPSHOT + struct.pack("<HH", VERSAO_SNAPSHOT, marshal.version) + resumo
+    return cabecalho + zlib.compress(marshal.dumps(conteudo), 9)
+
+def desserializar(dados: bytes, resumo: bytes = None) -> dict:
+    """
+    Conteúdo do snapshot.  Se o resumo dos .CSV for informado, levanta SnapshotDesatualizado quando o do snapshot difere.
+    """
+    tamanho_cabecalho = len(ASSINATURA_SNAPSHOT) + 4 + TAMANHO_RESUMO
+    if not dados.startswith(ASSINATURA_SNAPSHOT) or len(dados) < tamanho_cabecalho:
+        raise SnapshotInvalido("Arquivo não é um snapshot dos repositórios.")
+    versao, versao_marshal = struct.unpack_from("<HH", dados, len(ASSINATURA_SNAPSHOT))
+    if versao != VERSAO_SNAPSHOT or versao_marshal != marshal.version:
+        raise SnapshotInvalido(f"Snapshot na versão {versao} (marshal {versao_marshal}); esperado {VERSAO_SNAPSHOT} (marshal {marshal.version}).")
+    if resumo is not None and dados[tamanho_cabecalho - TAMANHO_RESUMO:tamanho_cabecalho] != resumo:
+        raise SnapshotDesatualizado("Snapshot gerado a partir de outros arquivos .CSV.")
+    try:
+        return marshal.loads(zlib.decompress(dados[tamanho_cabecalho:]))
+    except (ValueError, EOFError, TypeError, zlib.error) as erro:
+        raise SnapshotInvalido(f"Snapshot corrompido: {erro}") from erro
+
+def caminho_padrao() -> str:
+    """
+    Caminho do snapshot empacotado, ao lado dos arquivos .CSV.
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "arquivos_csv", ARQUIVO_SNAPSHOT)
+
+def gravar_snapshot(caminho: str = None, conteudo: dict = None) -> str:
+    """
+    Grava o snapshot do conteúdo informado (por padrão, gerado a partir dos .CSV) no caminho informado (por padrão, junto
+    aos .CSV).  Retorna o caminho gravado.
+    """
+    caminho = caminho or caminho_padrao()
+    dados = serializar(conteudo if conteudo is not None else gerar_conteudo(), resumo_csv())
+    with open(caminho, mode='wb') as file:
+        file.write(dados)
+    return caminho
+
+def ler_snapshot(caminho: str = None) -> dict:
+    """
+    Lê o snapshot informado ou, se omitido, o empacotado com a biblioteca.  Levanta SnapshotInvalido se não for possível
+    usá-lo e SnapshotDesatualizado se os .CSV foram alterados desde a sua geração.
+    """
+    try:
+        if caminho:
+            with open(caminho, mode='rb') as file:
+                dados = file.read()
+        else:
+            with as_file(files("site_embrapa.arquivos_csv").joinpath(ARQUIVO_SNAPSHOT)) as caminho_snapshot:
+                with open(caminho_snapshot, mode='rb') as file:
+                    dados = file.read()
+        return desserializar(dados, resumo_csv())
+    except OSError as erro:
+        raise SnapshotInvalido(f"Snapshot indisponível: {erro}") from erro
+
+def ler_ou_regerar_snapshot(caminho: str = None) -> dict:
+    """
+    Lê o snapshot (ver ler_snapshot).  Se não for possível usá-lo, gera o conteúdo a partir dos .CSV e tenta regravar o
+    snapshot, para as cargas seguintes; em um sistema de arquivos somente leitura o conteúdo é apenas retornado.
+    """
+    try:
+        return ler_snapshot(caminho)
+    except SnapshotInvalido:
+        conteudo = gerar_conteudo()
+    try:
+        gravar_snapshot(caminho, conteudo)
+    except OSError:
+        pass
+    return conteudo
+
+def assinatura_arquivos(caminho: str) -> tuple:
+    """
+    Momento da última alteração e tamanho de cada arquivo .CSV empacotado e do snapshot informado.
+    """
+    pasta_csv = os.path.dirname(caminho_padrao())
+    caminhos = [os.path.join(pasta_csv, arquivo_csv) for arquivo_csv, _ in sorted(leitor_csv.ARQUIVOS_CSV.values())]
+    assinatura = []
+    for caminho_arquivo in caminhos + [caminho]:
+        estado = os.stat(caminho_arquivo)
+        assinatura.append((estado.st_mtime_ns, estado.st_size))
+    return tuple(assinatura)
+
+def ler_snapshot_em_cache(caminho: str = None) -> dict:
+    """
+    Como ler_snapshot, mas decodifica o snapshot (e calcula o resumo dos .CSV) uma única vez por processo: as leituras
+    seguintes retornam o mesmo conteúdo, até que um dos .CSV ou o snapshot seja alterado.  O conteúdo retornado é
+    compartilhado e não deve ser modificado.
+    """
+    caminho = caminho or caminho_padrao()
+    try:
+        assinatura = assinatura_arquivos(caminho)
+    except OSError as erro:
+        raise SnapshotInvalido(f"Snapshot indisponível: {erro}") from erro
+    with _trava_snapshots_lidos:
+        lido = _snapshots_lidos.get(caminho)
+        if lido is not None and lido[0] == assinatura:
+            return lido[1]
+        conteudo = ler_snapshot(caminho)
+        _snapshots_lidos[caminho] = (assinatura, conteudo)
+        return conteudo
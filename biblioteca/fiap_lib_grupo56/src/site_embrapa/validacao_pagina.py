@@ -0,0 +1,112 @@
+"""
+Validação das páginas obtidas do site da Embrapa: "ok", "vazia" ou "quebrada", antes do cache e dos repositórios.
+"""
+
+import threading
+from typing import Optional, Tuple, Union
+from site_embrapa import leitor_csv
+from site_embrapa.extrator_html import FIM_TABELA, trechos_tabela_dados
+from site_embrapa.opcoes import OPCAO_IMPORTACAO, OPCAO_EXPORTACAO
+
+PAGINA_OK = "ok"
+PAGINA_VAZIA = "vazia"
+PAGINA_QUEBRADA = "quebrada"
+CLASSIFICACOES = (PAGINA_OK, PAGINA_VAZIA, PAGINA_QUEBRADA)
+
+# Fração das linhas do arquivo .CSV da página abaixo da qual a página é considerada quebrada (resposta parcial)
+FRACAO_MINIMA_LINHAS = 0.5
+
+# Células (td) por linha: Importação e Exportação (país, quantidade, valor); demais (produto/cultivar/categoria, quantidade)
+CELULAS_IMPORTACAO_EXPORTACAO = 3
+CELULAS_CATEGORIZADAS = 2
+# Classes da primeira célula das linhas de Produção, Processamento e Comercialização (categoria ou item da categoria)
+CLASSES_LINHA_CATEGORIZADA = {"tb_item", "tb_subitem"}
+
+class PaginaInvalida(Exception):
+    """
+    Página obtida do site sem uma tabela de dados utilizável (página de manutenção, resposta incompleta ou layout alterado).
+
+    Atributos:
+        pagina (tuple): Página (opcao, subopcao, ano) do site.
+        motivo (str): Descrição do problema encontrado.
+    """
+    def __init__(self, pagina: tuple, motivo: str):
+        super().__init__(f"Página {pagina} inválida: {motivo}.")
+        self.pagina = pagina
+        self.motivo = motivo
+
+class ValidadorPaginas:
+    """
+    Classifica as páginas obtidas do site e conta as classificações.  Pode ser usado por várias threads ao mesmo tempo.
+
+    Atributos:
+        fracao_minima_linhas (float): Fração das linhas do arquivo .CSV da página que uma página com dados deve ter.
+    """
+    def __init__(self, fracao_minima_linhas: float = FRACAO_MINIMA_LINHAS):
+        self.fracao_minima_linhas = fracao_minima_linhas
+        self.trava = threading.Lock()
+        self.linhas_minimas = {}
+        self.metricas = {classificacao: 0 for classificacao in CLASSIFICACOES}
+        self.ultimo_motivo = None
+
+    def linhasMinimas(self, opcao: str, subopcao: str) -> int:
+        """
+        Quantidade mínima de linhas de uma página com dados, calculada (uma vez) a partir do seu arquivo .CSV.
+        """
+        with self.trava:
+            minimo = self.linhas_minimas.get((opcao, subopcao))
+        if minimo is None:
+            try:
+                _, linhas = leitor_csv.ler_linhas(opcao, subopcao)
+                minimo = max(1, int(len(linhas) * self.fracao_minima_linhas))
+            except (KeyError, OSError):
+                minimo = 1  # página sem arquivo .CSV de referência
+            with self.trava:
+                self.linhas_minimas[(opcao, subopcao)] = minimo
+        return minimo
+
+    def classificar(self, opcao: str, subopcao: str, conteudo: Union[bytes, str], linhas: list) -> Tuple[str, Optional[str]]:
+        """
+        Classificação da página (opcao, subopcao) cujo HTML é conteudo e cujas linhas extraídas (ver
+        site_embrapa.extrator_html) são linhas: (classificação, motivo), com motivo None se a página não estiver quebrada.
+        """
+        # As tags são ASCII: latin-1 localiza a tabela sem decodificar a página pelo charset
+        html = conteudo.decode("latin-1") if isinstance(conteudo, bytes) else conteudo
+        trechos = trechos_tabela_dados(html)
+        if not trechos:
+            return PAGINA_QUEBRADA, "tabela de dados ausente"
+        if FIM_TABELA.search(trechos[-1]) is None:
+            return PAGINA_QUEBRADA, "tabela de dados incompleta"
+        if len(linhas) == 0:
+            return PAGINA_VAZIA, None
+        celulas = CELULAS_IMPORTACAO_EXPORTACAO if opcao in (OPCAO_IMPORTACAO, OPCAO_EXPORTACAO) else CELULAS_CATEGORIZADAS
+        for linha in linhas:
+            if len(linha) - 1 != celulas:
+                return PAGINA_QUEBRADA, f"linha com {len(linha) - 1} células, esperadas {celulas}"
+            if celulas == CELULAS_CATEGORIZADAS and CLASSES_LINHA_CATEGORIZADA.isdisjoint(linha[0].split()):
+                return PAGINA_QUEBRADA, f"linha [{linha[1]}] sem a classe tb_item ou tb_subitem"
+        minimo = self.linhasMinimas(opcao, subopcao)
+        if len(linhas) < minimo:
+            return PAGINA_QUEBRADA, f"{len(linhas)} linhas, esperadas ao menos {minimo}"
+        return PAGINA_OK, None
+
+    def validar(self, opcao: str, subopcao: str, ano: int, conteudo: Union[bytes, str], linhas: list) -> str:
+        """
+        Classifica a página (opcao, subopcao) do ano e conta a classificação.  Retorna PAGINA_OK ou PAGINA_VAZIA; levanta
+        PaginaInvalida se a página estiver quebrada.
+        """
+        classificacao, motivo = self.classificar(opcao, subopcao, conteudo, linhas)
+        with self.trava:
+            self.metricas[classificacao] += 1
+            if motivo is not None:
+                self.ultimo_motivo = f"{(opcao, subopcao, ano)}: {motivo}"
+        if classificacao == PAGINA_QUEBRADA:
+            raise PaginaInvalida((opcao, subopcao, ano), motivo)
+        return classificacao
+
+    def obterMetricas(self) -> dict:
+        """
+        Páginas obtidas do site por classificação e o motivo da última página quebrada.
+        """
+        with self.trava:
+            return dict(self.metricas, ultimo_motivo=self.ultimo_motivo)
@@ -0,0 +1,73 @@
+"""
+Substitutos da rede e esperas usados pelos testes.
+"""
+
+import html
+import threading
+import time
+import requests
+from site_embrapa import leitor_csv
+from site_embrapa.site_embrapa import WebscrapingSiteEmbrapa
+from site_embrapa.cliente_http import ClienteHttp
+from site_embrapa.disjuntor import Disjuntor
+from site_embrapa.limitador import LimitadorRequisicoes
+from site_embrapa.retentativas import PoliticaRetentativas
+from site_embrapa.opcoes import OPCAO_EXPORTACAO
+
+PAGINA_SEM_DADOS = b'<html><body><table class="tb_base tb_dados"><tbody></tbody></table></body></html>'
+
+def pagina_de_exportacao(subopcao: str, ano: int) -> bytes:
+    """
+    Página de Exportação do ano com a tabela de dados (país, quantidade, valor) montada a partir do seu arquivo .CSV.
+    """
+    anos, linhas = leitor_csv.ler_linhas(OPCAO_EXPORTACAO, subopcao)
+    posicao = anos.index(ano)
+    tr = "".join(f"<tr><td>{html.escape(pais)}</td><td>{quantidades[posicao]}</td><td>{valores[posicao]}</td></tr>"
+                 for pais, quantidades, valores in linhas)
+    return f'<html><body><table class="tb_base tb_dados"><tbody>{tr}</tbody></table></body></html>'.encode("utf-8")
+
+def resposta(status_code: int, conteudo: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = conteudo
+    return response
+
+class ClienteFalso(ClienteHttp):
+    """
+    Responde, em ordem, com as respostas ou exceções informadas, sem acessar a rede, e guarda a url e o timeout de cada
+    GET.  Com liberacao, cada GET espera o evento ser sinalizado antes de responder.
+    """
+    def __init__(self, *respostas, liberacao: threading.Event = None):
+        super().__init__()
+        self.respostas = list(respostas)
+        self.liberacao = liberacao
+        self.urls = []
+        self.timeouts = []
+
+    def get(self, url: str, cabecalhos: dict = None, timeout: float = None) -> requests.Response:
+        with self.trava_metricas:
+            self.urls.append(url)
+            self.timeouts.append(timeout)
+            proxima = self.respostas.pop(0)
+        if self.liberacao is not None:
+            self.liberacao.wait()
+        if isinstance(proxima, Exception):
+            raise proxima
+        return proxima
+
+def webscraping_falso(cliente: ClienteHttp, disjuntor: Disjuntor = None, extrator=None) -> WebscrapingSiteEmbrapa:
+    """
+    Webscraping pelo cliente informado, sem espera no limitador de taxa e sem retentativas.
+    """
+    return WebscrapingSiteEmbrapa("http://site.invalido/index.php", cliente_http=cliente, extrator=extrator,
+                                  disjuntor=disjuntor, limitador=LimitadorRequisicoes(1000, 100),
+                                  retentativas=PoliticaRetentativas(max_tentativas=1))
+
+def aguardar_ate(condicao, prazo: float = 5.0):
+    """
+    Espera, por até prazo segundos, que condicao() seja verdadeira.
+    """
+    limite = time.monotonic() + prazo
+    while not condicao():
+        assert time.monotonic() < limite, "condição não atingida no prazo"
+        time.sleep(0.001)
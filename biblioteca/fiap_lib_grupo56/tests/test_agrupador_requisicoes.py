@@ -0,0 +1,104 @@
+import threading
+import pytest
+from site_embrapa import SiteEmbrapa
+from site_embrapa.agrupador_requisicoes import AgrupadorRequisicoes
+from site_embrapa.opcoes import OPCAO_PRODUCAO
+from falsos import ClienteFalso, PAGINA_SEM_DADOS, aguardar_ate, resposta, webscraping_falso
+
+CHAMADAS_SIMULTANEAS = 8
+
+def executar_em_threads(quantidade: int, alvo) -> list:
+    resultados = [None] * quantidade
+    def executar(indice):
+        try:
+            resultados[indice] = alvo()
+        except Exception as erro:
+            resultados[indice] = erro
+    threads = [threading.Thread(target=executar, args=(indice,)) for indice in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    return threads, resultados
+
+def test_chamadas_simultaneas_executam_uma_carga():
+    agrupador = AgrupadorRequisicoes()
+    liberacao = threading.Event()
+    execucoes = []
+    def carga():
+        execucoes.append(1)
+        liberacao.wait()
+        return ["registro"]
+    threads, resultados = executar_em_threads(CHAMADAS_SIMULTANEAS, lambda: agrupador.executar("pagina", carga))
+    aguardar_ate(lambda: agrupador.obterMetricas()["agrupadas"] == CHAMADAS_SIMULTANEAS - 1)
+    liberacao.set()
+    for thread in threads:
+        thread.join()
+    assert len(execucoes) == 1
+    assert all(resultado is resultados[0] for resultado in resultados)
+    assert agrupador.obterMetricas() == {"executadas": 1, "agrupadas": CHAMADAS_SIMULTANEAS - 1, "em_andamento": 0}
+
+def test_excecao_da_carga_chega_a_todas_as_chamadas():
+    agrupador = AgrupadorRequisicoes()
+    liberacao = threading.Event()
+    def carga():
+        liberacao.wait()
+        raise ConnectionError("site fora do ar")
+    threads, resultados = executar_em_threads(CHAMADAS_SIMULTANEAS, lambda: agrupador.executar("pagina", carga))
+    aguardar_ate(lambda: agrupador.obterMetricas()["agrupadas"] == CHAMADAS_SIMULTANEAS - 1)
+    liberacao.set()
+    for thread in threads:
+        thread.join()
+    assert all(isinstance(resultado, ConnectionError) for resultado in resultados)
+
+class Interrupcao(BaseException):
+    pass
+
+def test_carga_interrompida_e_executada_novamente_pelas_chamadas_agrupadas():
+    agrupador = AgrupadorRequisicoes()
+    liberacao = threading.Event()
+    execucoes = []
+    def carga():
+        execucoes.append(1)
+        if len(execucoes) == 1:
+            liberacao.wait()
+            raise Interrupcao()
+        return ["registro"]
+    interrompidas = []
+    def interromper():
+        try:
+            agrupador.executar("pagina", carga)
+        except Interrupcao as interrupcao:
+            interrompidas.append(interrupcao)
+    primeira = threading.Thread(target=interromper)
+    primeira.start()
+    aguardar_ate(lambda: len(execucoes) == 1)
+    threads, resultados = executar_em_threads(1, lambda: agrupador.executar("pagina", carga))
+    aguardar_ate(lambda: agrupador.obterMetricas()["agrupadas"] == 1)
+    liberacao.set()
+    for thread in [primeira] + threads:
+        thread.join()
+    assert len(interrompidas) == 1
+    assert resultados == [["registro"]]
+    assert agrupador.obterMetricas() == {"executadas": 2, "agrupadas": 1, "em_andamento": 0}
+
+def test_chaves_diferentes_e_chamadas_seguidas_nao_sao_agrupadas():
+    agrupador = AgrupadorRequisicoes()
+    assert agrupador.executar("a", lambda: 1) == 1
+    assert agrupador.executar("a", lambda: 2) == 2
+    assert agrupador.executar("b", lambda: 3) == 3
+    assert agrupador.obterMetricas()["executadas"] == 3
+    with pytest.raises(ValueError):
+        agrupador.executar("a", int, "x")
+    assert agrupador.obterMetricas()["em_andamento"] == 0
+
+def test_consultas_simultaneas_da_mesma_pagina_fazem_um_webscraping():
+    liberacao = threading.Event()
+    cliente = ClienteFalso(resposta(200, PAGINA_SEM_DADOS), liberacao=liberacao)
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(cliente)
+    threads, resultados = executar_em_threads(CHAMADAS_SIMULTANEAS, lambda: site.obterProducoesPorAno(2020))
+    aguardar_ate(lambda: site.agrupador_requisicoes.obterMetricas()["agrupadas"] == CHAMADAS_SIMULTANEAS - 1)
+    liberacao.set()
+    for thread in threads:
+        thread.join()
+    assert cliente.urls == [site.webscraping.urlPagina(OPCAO_PRODUCAO, None, 2020)]
+    assert resultados == [[]] * CHAMADAS_SIMULTANEAS
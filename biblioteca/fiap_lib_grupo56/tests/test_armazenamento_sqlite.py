@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+import pytest
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.armazenamento_sqlite import ArmazenamentoSqlite
+from site_embrapa.opcoes import OPCAO_EXPORTACAO, OPCAO_PRODUCAO
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
+from modelo_dados.origemDados import EnumOrigemDados
+from falsos import ClienteFalso, pagina_de_exportacao, resposta, webscraping_falso
+
+PRODUCAO_2020 = (OPCAO_PRODUCAO, None, 2020)
+REGISTROS = [("VINHO DE MESA", "Tinto", None, 100, None), ("VINHO DE MESA", "Branco", None, 50, None)]
+
+def aguardar_gravacoes(armazenamento: ArmazenamentoSqlite, prazo: float = 5.0):
+    """
+    armazenamento.aguardar() com prazo: falha o teste em vez de travá-lo se a fila nunca for concluída.
+    """
+    thread = threading.Thread(target=armazenamento.aguardar, daemon=True)
+    thread.start()
+    thread.join(prazo)
+    assert not thread.is_alive(), "fila de gravação não concluída"
+
+def test_gravacao_em_segundo_plano_sobrevive_ao_reinicio(tmp_path):
+    caminho = str(tmp_path / "paginas.db")
+    armazenamento = ArmazenamentoSqlite(caminho)
+    assert armazenamento.lerPagina(*PRODUCAO_2020) is None
+    armazenamento.agendarGravacao(PRODUCAO_2020, EnumOrigemDados.WEBSCRAPING.value, 1234.5, REGISTROS)
+    aguardar_gravacoes(armazenamento)
+    # Outra instância (novo processo) lê a página gravada
+    persistida = ArmazenamentoSqlite(caminho).lerPagina(*PRODUCAO_2020)
+    assert persistida.pagina == PRODUCAO_2020
+    assert (persistida.origem, persistida.carregado_em) == (EnumOrigemDados.WEBSCRAPING.value, 1234.5)
+    assert persistida.registros == REGISTROS
+    assert armazenamento.listar() == [PRODUCAO_2020]
+
+def test_falha_na_gravacao_nao_trava_a_fila(tmp_path):
+    armazenamento = ArmazenamentoSqlite(str(tmp_path / "paginas.db"), lote_maximo=1)
+    armazenamento.agendarGravacao((OPCAO_PRODUCAO, None, 2019), EnumOrigemDados.WEBSCRAPING.value, 1.0, None)  # TypeError
+    aguardar_gravacoes(armazenamento)
+    armazenamento.agendarGravacao(PRODUCAO_2020, EnumOrigemDados.WEBSCRAPING.value, 1.0, REGISTROS)
+    aguardar_gravacoes(armazenamento)
+    metricas = armazenamento.obterMetricas()
+    assert (metricas["falhas_gravacao"], metricas["paginas_gravadas"], metricas["pendentes"]) == (1, 1, 0)
+    assert armazenamento.listar() == [PRODUCAO_2020]
+
+def test_falha_ao_remover_desfaz_a_transacao(tmp_path):
+    caminho = str(tmp_path / "paginas.db")
+    armazenamento = ArmazenamentoSqlite(caminho)
+    armazenamento.agendarGravacao(PRODUCAO_2020, EnumOrigemDados.WEBSCRAPING.value, 1.0, REGISTROS)
+    aguardar_gravacoes(armazenamento)
+    outra_conexao = sqlite3.connect(caminho, isolation_level=None)
+    outra_conexao.execute("DROP TABLE paginas")
+    outra_conexao.close()
+    with pytest.raises(sqlite3.OperationalError):
+        armazenamento.remover(*PRODUCAO_2020)
+    assert not armazenamento.conexao().in_transaction
+    # O DELETE dos registros foi desfeito
+    assert armazenamento.conexao().execute("SELECT COUNT(*) FROM registros").fetchone()[0] == len(REGISTROS)
+
+def test_pagina_persistida_e_lida_sem_acessar_o_site_apos_reinicio(tmp_path):
+    caminho = str(tmp_path / "paginas.db")
+    site = SiteEmbrapa(caminho_sqlite=caminho)
+    site.webscraping = webscraping_falso(ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2020))))
+    exportacoes = site.obterExportacaoPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA)
+    aguardar_gravacoes(site.armazenamento)
+    reiniciado = SiteEmbrapa(caminho_sqlite=caminho)
+    cliente = ClienteFalso()
+    reiniciado.webscraping = webscraping_falso(cliente)
+    lidas = reiniciado.obterExportacaoPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA)
+    assert cliente.urls == []
+    assert sorted((e.pais.nome, e.quantidade, e.valor) for e in lidas) == sorted((e.pais.nome, e.quantidade, e.valor) for e in exportacoes)
+    assert {e.carregado_em for e in lidas} == {exportacoes[0].carregado_em}
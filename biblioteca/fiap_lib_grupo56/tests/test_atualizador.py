@@ -0,0 +1,42 @@
+import threading
+import time
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.cache_html import CacheHtml
+from site_embrapa.opcoes import OPCAO_EXPORTACAO
+from falsos import ClienteFalso, aguardar_ate, pagina_de_exportacao, resposta, webscraping_falso
+
+VINHOS_DE_MESA = (OPCAO_EXPORTACAO, "subopt_01", 2020)
+ESPUMANTES = (OPCAO_EXPORTACAO, "subopt_02", 2020)
+
+def test_pagina_do_cache_em_disco_mantem_o_momento_da_ultima_validacao(tmp_path):
+    cache = CacheHtml(str(tmp_path))
+    entrada = cache.gravar(*VINHOS_DE_MESA, pagina_de_exportacao("subopt_01", 2020))
+    entrada.validado_em = time.time() - 2 * 60 * 60
+    cache.gravarMetadados(cache.caminhoBase(*VINHOS_DE_MESA), entrada)
+    site = SiteEmbrapa(tempo_validade=60 * 60)
+    site.webscraping = webscraping_falso(ClienteFalso())
+    site.webscraping.cache_html = cache
+    assert site.carregaRepositoriosFromCacheHtml() == 1
+    registros = site.buscarRegistrosDaPagina(*VINHOS_DE_MESA)
+    assert len(registros) > 0
+    assert {registro.carregado_em for registro in registros} == {entrada.validado_em}
+    assert site.paginaVencida(registros)
+
+def test_atualizacoes_agendadas_antes_de_esvaziar_os_repositorios_sao_descartadas():
+    liberacao = threading.Event()
+    cliente = ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2020)), liberacao=liberacao)
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(cliente)
+    site.atualizador.agendar(VINHOS_DE_MESA)
+    site.atualizador.agendar(ESPUMANTES)
+    aguardar_ate(lambda: len(cliente.urls) == 1)
+    # A primeira está em atualização e a segunda na fila
+    site.inicializa_repositorios()
+    liberacao.set()
+    site.atualizador.aguardar()
+    assert site.buscarRegistrosDaPagina(*VINHOS_DE_MESA) == []
+    assert len(cliente.urls) == 1
+    metricas = site.atualizador.obterMetricas()
+    assert metricas["descartadas"] == 2
+    assert metricas["atualizadas"] == 0
+    assert metricas["pendentes"] == 0
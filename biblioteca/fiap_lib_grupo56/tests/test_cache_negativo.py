@@ -0,0 +1,70 @@
+import requests
+from site_embrapa import cache_negativo
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.cache_negativo import CacheNegativo, MOTIVO_PAGINA_VAZIA, MOTIVO_SEM_DADOS_CSV
+from site_embrapa.opcoes import OPCAO_PRODUCAO, OPCAO_COMERCIALIZACAO
+from falsos import ClienteFalso, PAGINA_SEM_DADOS, resposta, webscraping_falso
+
+PRODUCAO_2020 = (OPCAO_PRODUCAO, None, 2020)
+
+class Relogio:
+    """
+    Substitui o módulo time no cache negativo: o tempo só avança quando o teste manda.
+    """
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self) -> float:
+        return self.agora
+
+def test_entrada_vence_apos_o_tempo_de_validade(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_negativo, "time", relogio)
+    cache = CacheNegativo(tempo_validade=60)
+    cache.registrar(PRODUCAO_2020, MOTIVO_PAGINA_VAZIA)
+    relogio.agora += 60
+    assert cache.contem(PRODUCAO_2020)
+    relogio.agora += 1
+    assert not cache.contem(PRODUCAO_2020)
+    assert not cache.contem(PRODUCAO_2020)
+    metricas = cache.obterMetricas()
+    assert (metricas["acertos"], metricas["vencidas"], metricas["entradas"]) == (1, 1, 0)
+
+def test_sem_tempo_de_validade_a_entrada_nao_vence(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_negativo, "time", relogio)
+    cache = CacheNegativo(tempo_validade=None)
+    cache.registrar(PRODUCAO_2020, MOTIVO_PAGINA_VAZIA)
+    relogio.agora += 10 ** 9
+    assert cache.contem(PRODUCAO_2020)
+
+def test_descartar_opcao_mantem_as_demais_opcoes():
+    cache = CacheNegativo()
+    cache.registrar(PRODUCAO_2020, MOTIVO_PAGINA_VAZIA)
+    cache.registrar((OPCAO_COMERCIALIZACAO, None, 2020), MOTIVO_PAGINA_VAZIA)
+    cache.descartarOpcao(OPCAO_PRODUCAO)
+    assert not cache.contem(PRODUCAO_2020)
+    assert cache.contem((OPCAO_COMERCIALIZACAO, None, 2020))
+
+def test_pagina_vazia_so_e_obtida_novamente_depois_de_vencer(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_negativo, "time", relogio)
+    cliente = ClienteFalso(resposta(200, PAGINA_SEM_DADOS), resposta(200, PAGINA_SEM_DADOS))
+    site = SiteEmbrapa(tempo_validade_negativo=60)
+    site.webscraping = webscraping_falso(cliente)
+    assert site.obterProducoesPorAno(2020) == []
+    assert site.obterProducoesPorAno(2020) == []
+    assert len(cliente.urls) == 1
+    relogio.agora += 61
+    assert site.obterProducoesPorAno(2020) == []
+    assert len(cliente.urls) == 2
+    assert site.cache_negativo.obterMetricas()[MOTIVO_PAGINA_VAZIA] == 1
+
+def test_ano_sem_dados_no_arquivo_csv_entra_no_cache_negativo():
+    cliente = ClienteFalso(requests.ConnectionError())
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(cliente)
+    assert site.obterProducoesPorAno(1900) == []
+    assert site.obterProducoesPorAno(1900) == []
+    assert len(cliente.urls) == 1
+    assert site.cache_negativo.obterMetricas()[MOTIVO_SEM_DADOS_CSV] == 1
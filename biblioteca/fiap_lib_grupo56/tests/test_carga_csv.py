@@ -0,0 +1,44 @@
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.opcoes import OPCAO_EXPORTACAO
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
+from modelo_dados.origemDados import EnumOrigemDados
+from falsos import ClienteFalso, pagina_de_exportacao, resposta, webscraping_falso
+
+def contar_registros(site: SiteEmbrapa) -> tuple:
+    return (len(site.repositorio_produtividades.listar_produtividades()),
+            len(site.repositorio_comercializacoes.listar_comercializacoes()),
+            len(site.repositorio_processamentos.listar_processamentos()),
+            len(site.repositorio_importacoes.listar_importacoes()),
+            len(site.repositorio_exportacoes.listar_exportacoes()))
+
+def test_recarga_dos_arquivos_csv_mantem_todos_os_registros():
+    site = SiteEmbrapa()
+    site.carregaRepositoriosFromArquivosCSV()
+    primeira = contar_registros(site)
+    assert primeira == (2538, 3024, 11178, 10638, 26784)
+    site.carregaRepositoriosFromArquivosCSV()
+    assert contar_registros(site) == primeira
+    site.carregaRepositoriosFromSnapshot()
+    assert contar_registros(site) == primeira
+
+def test_recarga_das_importacoes_mantem_as_exportacoes_dos_paises():
+    site = SiteEmbrapa()
+    site.carregaRepositoriosFromArquivosCSV()
+    argentina = site.repositorio_paises.buscar_pais_por_nome("Argentina")
+    exportacoes = [e for e in site.repositorio_exportacoes.listar_exportacoes() if e.pais is argentina]
+    site.carregaRepoTodasImportacoesFromArquivoCSV()
+    assert len([e for e in site.repositorio_exportacoes.listar_exportacoes() if e.pais is argentina]) == len(exportacoes) > 0
+    assert len(site.repositorio_importacoes.listar_importacoes()) == 10638
+    assert any(i.pais is argentina for i in site.repositorio_importacoes.listar_importacoes())
+
+def test_carga_mesclada_dos_arquivos_csv_mantem_a_pagina_obtida_via_webscraping():
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2020))))
+    obtidas = site.obterExportacaoPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA)
+    assert {e.origem for e in obtidas} == {EnumOrigemDados.WEBSCRAPING}
+    site.carregaRepositoriosFromArquivosCSV(mesclar=True)
+    assert contar_registros(site) == (2538, 3024, 11178, 10638, 26784)
+    assert {e.origem for e in site.buscarRegistrosDaPagina(OPCAO_EXPORTACAO, "subopt_01", 2020)} == {EnumOrigemDados.WEBSCRAPING}
+    assert {e.origem for e in site.buscarRegistrosDaPagina(OPCAO_EXPORTACAO, "subopt_01", 2019)} == {EnumOrigemDados.CSV}
+    site.carregaRepositoriosFromArquivosCSV()
+    assert {e.origem for e in site.buscarRegistrosDaPagina(OPCAO_EXPORTACAO, "subopt_01", 2020)} == {EnumOrigemDados.CSV}
@@ -0,0 +1,95 @@
+import requests
+from site_embrapa import gerenciador_cache
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.gerenciador_cache import GerenciadorCache, POLITICA_LFU
+from site_embrapa.opcoes import OPCAO_EXPORTACAO
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
+from modelo_dados.origemDados import EnumOrigemDados
+from falsos import ClienteFalso, pagina_de_exportacao, resposta, webscraping_falso
+
+A, B, C, D = ((OPCAO_EXPORTACAO, "subopt_01", ano) for ano in (2020, 2021, 2022, 2023))
+
+class Relogio:
+    """
+    Substitui o módulo time no gerenciador: o tempo só avança quando o teste manda.
+    """
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self) -> float:
+        return self.agora
+
+def test_lru_descarta_a_pagina_usada_ha_mais_tempo():
+    gerenciador = GerenciadorCache(limite_bytes=2 * 10, bytes_por_registro=1)
+    assert gerenciador.registrar(A, 10) == []
+    assert gerenciador.registrar(B, 10) == []
+    assert gerenciador.acessar(A)
+    assert gerenciador.registrar(C, 10) == [B]
+    assert gerenciador.obterMetricas()["bytes_estimados"] == 20
+
+def test_lfu_descarta_a_menos_acessada_e_no_empate_a_usada_ha_mais_tempo():
+    gerenciador = GerenciadorCache(limite_bytes=3 * 10, politica=POLITICA_LFU, bytes_por_registro=1)
+    for pagina in (A, B, C):
+        gerenciador.registrar(pagina, 10)
+    for pagina in (C, C, B, A):
+        gerenciador.acessar(pagina)
+    # A e B têm um acesso cada; B foi usada há mais tempo
+    assert gerenciador.registrar(D, 10) == [B]
+    # D, recém-registrada, ainda não teve acessos
+    assert gerenciador.registrar(B, 10) == [D]
+
+def test_pagina_vencida_e_descartada_no_acesso(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(gerenciador_cache, "time", relogio)
+    gerenciador = GerenciadorCache(tempo_vida=60, bytes_por_registro=1)
+    gerenciador.registrar(A, 10)
+    relogio.agora += 60
+    assert gerenciador.acessar(A)
+    relogio.agora += 1
+    assert not gerenciador.acessar(A)
+    metricas = gerenciador.obterMetricas()
+    assert (metricas["vencidas"], metricas["entradas"], metricas["bytes_estimados"]) == (1, 0, 0)
+    # Página não acompanhada (p.ex. carregada do .CSV): não vence
+    assert gerenciador.acessar(A)
+
+def test_registrar_descarta_as_paginas_vencidas(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(gerenciador_cache, "time", relogio)
+    gerenciador = GerenciadorCache(tempo_vida=60, bytes_por_registro=1)
+    gerenciador.registrar(A, 10)
+    relogio.agora += 30
+    gerenciador.registrar(B, 10)
+    relogio.agora += 31
+    assert gerenciador.registrar(C, 10) == [A]
+
+def test_fallback_recarrega_do_csv_apenas_o_ano_descartado():
+    cliente = ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2020)), resposta(200, pagina_de_exportacao("subopt_01", 2021)),
+                           requests.ConnectionError(), requests.ConnectionError(), requests.ConnectionError())
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(cliente)
+    for ano in (2020, 2021):
+        site.obterExportacaoPorAnoCategoria(ano, EnumCategoria_im_ex.VINHOSDEMESA)
+    # Site fora do ar: o .CSV completa os demais anos
+    assert {e.origem for e in site.obterExportacaoPorAnoCategoria(2019, EnumCategoria_im_ex.VINHOSDEMESA)} == {EnumOrigemDados.CSV}
+    site.descartaPaginaDaMemoria(*A)
+    site.descartaPaginaDaMemoria(*B)
+    assert {e.origem for e in site.obterExportacaoPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA)} == {EnumOrigemDados.CSV}
+    # O outro ano descartado não volta pelo .CSV: continua a ser obtido do site
+    assert site.buscarRegistrosDaPagina(*B) == []
+    assert len(site.obterExportacaoPorAnoCategoria(2021, EnumCategoria_im_ex.VINHOSDEMESA)) > 0
+    assert len(cliente.urls) == 5
+
+def test_memoria_estimada_das_paginas_usa_os_bytes_por_registro():
+    cliente = ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2020)), resposta(200, pagina_de_exportacao("subopt_01", 2021)))
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(cliente)
+    site.gerenciador_cache = GerenciadorCache(bytes_por_registro=100)
+    registros = [len(site.obterExportacaoPorAnoCategoria(ano, EnumCategoria_im_ex.VINHOSDEMESA)) for ano in (2020, 2021)]
+    assert site.gerenciador_cache.obterMetricas()["bytes_estimados"] == 100 * sum(registros)
+    # Limite que só comporta a página mais recente: a primeira é descartada dos repositórios
+    site.gerenciador_cache.limite_bytes = 100 * registros[1]
+    site.descartaPaginaDaMemoria(*B)
+    site.webscraping = webscraping_falso(ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2021))))
+    site.obterExportacaoPorAnoCategoria(2021, EnumCategoria_im_ex.VINHOSDEMESA)
+    assert site.buscarRegistrosDaPagina(*A) == []
+    assert site.gerenciador_cache.obterMetricas()["bytes_estimados"] == 100 * registros[1]
@@ -0,0 +1,32 @@
+from site_embrapa import leitor_csv
+from site_embrapa.opcoes import OPCAO_PRODUCAO, OPCAO_EXPORTACAO
+
+def test_valor_inteiro_descarta_caracteres_nao_numericos():
+    assert leitor_csv.valor_inteiro("1234") == 1234
+    assert leitor_csv.valor_inteiro("1.234") == 1234
+    assert leitor_csv.valor_inteiro("") == 0
+    assert leitor_csv.valor_inteiro("*") == 0
+
+def test_posicoes_anos_ausentes():
+    assert leitor_csv.posicoes_anos_ausentes((2019, 2020, 2021), {2020}) == [0, 2]
+    assert leitor_csv.posicoes_anos_ausentes((2019, 2020), {2019, 2020}) == []
+
+def test_linhas_do_ano_mantem_um_valor_por_serie():
+    anos = (2019, 2020, 2021)
+    linhas = [("Argentina", (1, 2, 3), (10, 20, 30))]
+    assert leitor_csv.linhas_do_ano(anos, linhas, 2020) == ((2020,), [("Argentina", (2,), (20,))])
+
+def test_ler_linhas_da_producao():
+    anos, linhas = leitor_csv.ler_linhas(OPCAO_PRODUCAO)
+    assert anos[0] == 1970 and anos == tuple(sorted(anos))
+    categoria, produto, valores = linhas[0]
+    assert (categoria, produto, valores) == ("VINHO DE MESA", None, ())
+    assert all(len(valores) == len(anos) for _, produto, valores in linhas if produto is not None)
+
+def test_ler_linhas_de_exportacao_com_quantidade_e_valor_por_ano():
+    anos, linhas = leitor_csv.ler_linhas(OPCAO_EXPORTACAO, "subopt_01")
+    pais, quantidades, valores = linhas[0]
+    assert isinstance(pais, str) and len(quantidades) == len(valores) == len(anos)
+
+def test_leitura_com_threads_igual_a_sequencial():
+    assert leitor_csv.ler_todas_linhas(leitor_csv.PARALELISMO_THREADS, 4) == leitor_csv.ler_todas_linhas()
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+from site_embrapa.limitador import LimitadorRequisicoes, segundo_plano, prioridade_atual
+from site_embrapa.limitador import PRIORIDADE_INTERATIVA, PRIORIDADE_SEGUNDO_PLANO
+from falsos import aguardar_ate
+
+def em_espera(limitador: LimitadorRequisicoes, prioridade: str) -> int:
+    return limitador.obterMetricas()[prioridade]["em_espera"]
+
+def iniciar_requisicao(limitador: LimitadorRequisicoes, prioridade: str, nome: str, ordem: list) -> threading.Thread:
+    def requisitar():
+        limitador.aguardar(prioridade)
+        ordem.append(nome)
+    thread = threading.Thread(target=requisitar)
+    thread.start()
+    return thread
+
+def test_rajada_sem_espera_e_depois_na_taxa():
+    limitador = LimitadorRequisicoes(requisicoes_por_segundo=20, rajada=3)
+    inicio = time.monotonic()
+    for _ in range(3):
+        limitador.aguardar()
+    assert time.monotonic() - inicio < 0.05
+    for _ in range(2):
+        limitador.aguardar()
+    assert time.monotonic() - inicio >= 0.09
+
+def test_interativas_sao_atendidas_antes_das_de_segundo_plano():
+    limitador = LimitadorRequisicoes(requisicoes_por_segundo=10, rajada=1)
+    limitador.aguardar()  # esgota o balde: as próximas requisições esperam na fila
+    ordem = []
+    threads = [iniciar_requisicao(limitador, PRIORIDADE_SEGUNDO_PLANO, "segundo_plano_1", ordem)]
+    aguardar_ate(lambda: em_espera(limitador, PRIORIDADE_SEGUNDO_PLANO) == 1)
+    threads.append(iniciar_requisicao(limitador, PRIORIDADE_SEGUNDO_PLANO, "segundo_plano_2", ordem))
+    aguardar_ate(lambda: em_espera(limitador, PRIORIDADE_SEGUNDO_PLANO) == 2)
+    threads.append(iniciar_requisicao(limitador, PRIORIDADE_INTERATIVA, "interativa", ordem))
+    aguardar_ate(lambda: em_espera(limitador, PRIORIDADE_INTERATIVA) == 1)
+    for thread in threads:
+        thread.join()
+    assert ordem == ["interativa", "segundo_plano_1", "segundo_plano_2"]
+    metricas = limitador.obterMetricas()
+    assert metricas[PRIORIDADE_INTERATIVA]["atendidas"] == 2
+    assert metricas[PRIORIDADE_SEGUNDO_PLANO]["atendidas"] == 2
+
+def test_segundo_plano_vale_para_o_contexto_e_para_asyncio_to_thread():
+    assert prioridade_atual.get() == PRIORIDADE_INTERATIVA
+    async def prioridade_na_thread():
+        with segundo_plano():
+            return await asyncio.to_thread(prioridade_atual.get)
+    assert asyncio.run(prioridade_na_thread()) == PRIORIDADE_SEGUNDO_PLANO
+    assert prioridade_atual.get() == PRIORIDADE_INTERATIVA
+
+def test_requisicao_sem_prioridade_usa_a_do_contexto():
+    limitador = LimitadorRequisicoes(requisicoes_por_segundo=1000, rajada=10)
+    with segundo_plano():
+        limitador.aguardar()
+    limitador.aguardar()
+    metricas = limitador.obterMetricas()
+    assert metricas[PRIORIDADE_SEGUNDO_PLANO]["atendidas"] == 1
+    assert metricas[PRIORIDADE_INTERATIVA]["atendidas"] == 1
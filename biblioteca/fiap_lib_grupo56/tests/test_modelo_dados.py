@@ -0,0 +1,104 @@
+from modelo_dados.producao import Categoria_prod, Produto_prod, ProdutividadeAnual, RepositorioProdutos_prod, RepositorioProdutividadesAnuais
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex, ExportacaoAnual, Pais, RepositorioExportacoesAnuais, RepositorioPaises
+from modelo_dados.origemDados import EnumOrigemDados
+from modelo_dados.seriesAnuais import ANO_INICIAL, ANO_FINAL, TabelaSeriesAnuais
+
+def test_busca_de_produto_por_nome_e_categoria():
+    vinho, suco = Categoria_prod("VINHO DE MESA"), Categoria_prod("SUCO")
+    tinto_vinho, tinto_suco = Produto_prod("Tinto", vinho), Produto_prod("Tinto", suco)
+    repositorio = RepositorioProdutos_prod()
+    repositorio.adicionar_produto(tinto_vinho)
+    repositorio.adicionar_produto(tinto_suco)
+    assert repositorio.buscar_produto_por_nome_categoria("Tinto", suco) is tinto_suco
+    assert repositorio.buscar_produto_por_nome_categoria("Branco", suco) is None
+    repositorio.remover_produto(tinto_suco)
+    assert repositorio.buscar_produto_por_nome_categoria("Tinto", suco) is None
+    assert repositorio.listar_produtos() == [tinto_vinho]
+
+def test_lote_de_produtos_descarta_nome_e_categoria_repetidos():
+    vinho = Categoria_prod("VINHO DE MESA")
+    tinto, repetido, branco = Produto_prod("Tinto", vinho), Produto_prod("Tinto", vinho), Produto_prod("Branco", vinho)
+    repositorio = RepositorioProdutos_prod()
+    assert repositorio.adicionar_lote([tinto, repetido, branco]) == [tinto, branco]
+    assert repositorio.adicionar_lote([Produto_prod("Branco", vinho)]) == []
+    assert repositorio.listar_produtos() == [tinto, branco]
+
+def test_categoria_guarda_cada_produto_uma_unica_vez():
+    vinho = Categoria_prod("VINHO DE MESA")
+    tinto = Produto_prod("Tinto", vinho)
+    vinho.adicionar_produto(tinto)
+    assert list(vinho.produtos) == [tinto]
+
+def test_busca_de_pais_por_nome():
+    repositorio = RepositorioPaises()
+    argentina = Pais("Argentina")
+    assert repositorio.adicionar_lote([argentina, Pais("Argentina")]) == [argentina]
+    assert repositorio.buscar_pais_por_nome("Argentina") is argentina
+    assert repositorio.buscar_pais_por_nome("Chile") is None
+
+def test_lote_de_produtividades_descarta_produto_e_ano_repetidos():
+    tinto = Produto_prod("Tinto", Categoria_prod("VINHO DE MESA"))
+    repositorio = RepositorioProdutividadesAnuais()
+    aceitos = repositorio.adicionar_lote([ProdutividadeAnual(2020, 10, tinto), ProdutividadeAnual(2020, 99, tinto), ProdutividadeAnual(2021, 20, tinto)])
+    assert [(p.ano, p.quantidade) for p in aceitos] == [(2020, 10), (2021, 20)]
+    assert repositorio.adicionar_lote([ProdutividadeAnual(2021, 99, tinto)]) == []
+    assert repositorio.buscar_produtividade(tinto, 2020).quantidade == 10
+    assert repositorio.buscar_serieProdutividade(tinto) == {2020: 10, 2021: 20}
+
+def test_registros_montados_mantem_produto_origem_e_momento_da_carga():
+    tinto = Produto_prod("Tinto", Categoria_prod("VINHO DE MESA"))
+    repositorio = RepositorioProdutividadesAnuais()
+    repositorio.adicionar_produtividade(ProdutividadeAnual(2020, 10, tinto, EnumOrigemDados.WEBSCRAPING, 123.5))
+    repositorio.adicionar_produtividade(ProdutividadeAnual(2021, 20, tinto))
+    produtividade = repositorio.buscar_produtividadesPorAno(2020)[0]
+    assert (produtividade.produto, produtividade.origem, produtividade.carregado_em) == (tinto, EnumOrigemDados.WEBSCRAPING, 123.5)
+    produtividade = repositorio.buscar_produtividade(tinto, 2021)
+    assert (produtividade.origem, produtividade.carregado_em) == (None, None)
+
+def test_totais_da_categoria_por_ano_decada_e_geral_acompanham_a_remocao():
+    vinho = Categoria_prod("VINHO DE MESA")
+    tinto, branco = Produto_prod("Tinto", vinho), Produto_prod("Branco", vinho)
+    repositorio = RepositorioProdutividadesAnuais()
+    repositorio.adicionar_lote([ProdutividadeAnual(1999, 5, tinto), ProdutividadeAnual(2000, 10, tinto), ProdutividadeAnual(2000, 7, branco),
+                                ProdutividadeAnual(2009, 3, branco)])
+    assert repositorio.buscarProdutividadeTotalDeCategoriaPorAno(vinho, 2000) == 17
+    assert repositorio.buscarProdutividadeTotalDeCategoriaPorDecada(vinho, 2000) == 20
+    assert repositorio.buscarProdutividadeTotalDeCategoria(vinho) == 25
+    assert repositorio.buscarProdutividadeTotalDeCategoriaPorPeriodo(vinho, 1999, 2001) == {1999: 5, 2000: 17, 2001: 0}
+    repositorio.remover_lote(repositorio.buscar_produtividadesPorAno(2000))
+    assert repositorio.buscarProdutividadeTotalDeCategoriaPorAno(vinho, 2000) == 0
+    assert repositorio.buscarProdutividadeTotalDeCategoriaPorDecada(vinho, 2000) == 3
+    assert repositorio.buscarProdutividadeTotalDeCategoria(vinho) == 8
+    assert repositorio.buscar_produtividadesPorAno(2000) == []
+    assert repositorio.listar_anos() == {1999, 2009}
+
+def test_exportacoes_por_categoria_e_totais_de_valor():
+    argentina, chile = Pais("Argentina"), Pais("Chile")
+    repositorio = RepositorioExportacoesAnuais()
+    repositorio.adicionar_lote([ExportacaoAnual(2020, 100, 10, EnumCategoria_im_ex.VINHOSDEMESA, argentina),
+                                ExportacaoAnual(2020, 50, 5, EnumCategoria_im_ex.VINHOSDEMESA, chile),
+                                ExportacaoAnual(2020, 7, 1, EnumCategoria_im_ex.SUCODEUVA, argentina)])
+    exportacoes = repositorio.buscar_exportacoesPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA)
+    assert [(e.pais, e.valor, e.quantidade) for e in exportacoes] == [(argentina, 100, 10), (chile, 50, 5)]
+    assert repositorio.buscarExportacaoTotalPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA) == 15
+    assert repositorio.buscarExportacaoTotalPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA, "valor") == 150
+    assert repositorio.buscar_exportacao(EnumCategoria_im_ex.SUCODEUVA, 2020, argentina).valor == 7
+    assert len(repositorio.buscar_exportacoesPorAno(2020)) == 3
+
+def test_tabela_fatia_o_ano_e_amplia_as_colunas_para_anos_fora_do_intervalo():
+    tabela = TabelaSeriesAnuais()
+    assert tabela.registrar("a", 2000, (1,))
+    assert tabela.registrar("b", 2000, (2,))
+    assert not tabela.registrar("a", 2000, (9,))
+    assert tabela.registrar("a", ANO_FINAL + 2, (3,), EnumOrigemDados.CSV)
+    assert tabela.registrar("b", ANO_INICIAL - 1, (4,))
+    assert [(entidade, valores) for entidade, _, valores, _, _ in tabela.celulas_do_ano(2000)] == [("a", (1,)), ("b", (2,))]
+    assert tabela.serie("a") == {2000: 1, ANO_FINAL + 2: 3}
+    assert tabela.celula("a", ANO_FINAL + 2)[3] == EnumOrigemDados.CSV
+    assert len(tabela) == 4
+    assert tabela.remover("b", 2000) == (2,)
+    assert tabela.remover("b", 2000) is None
+    assert tabela.listar_anos() == {ANO_INICIAL - 1, 2000, ANO_FINAL + 2}
+
+def test_nomes_sao_internados():
+    assert Produto_prod("".join(["Tin", "to"])).nome is Produto_prod("Tinto").nome
@@ -0,0 +1,44 @@
+import pytest
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.validacao_pagina import PAGINA_OK
+from site_embrapa.opcoes import PAGINAS_SITE, OPCAO_PROCESSAMENTO, SUBOPCOES_PROCESSAMENTO
+from site_embrapa.paginas_sinteticas import pagina_sintetica
+from modelo_dados.processamento import EnumTipoUva_proc
+
+def resumo(registro) -> tuple:
+    """
+    Nomes (sem os espaços das bordas, que o extrator remove) e números do registro.
+    """
+    partes = []
+    for atributo in ("produto", "cultivar", "pais"):
+        dono = getattr(registro, atributo, None)
+        if dono is not None:
+            categoria = getattr(dono, "categoria", None)
+            partes += [dono.nome.strip(), categoria.nome.strip() if categoria is not None else None]
+    for atributo in ("quantidade", "valor"):
+        if hasattr(registro, atributo):
+            partes.append(int(getattr(registro, atributo) or 0))
+    return tuple(partes)
+
+@pytest.mark.parametrize("opcao, subopcao", PAGINAS_SITE)
+def test_pagina_sintetica_equivale_ao_arquivo_csv(opcao, subopcao):
+    pelo_csv = SiteEmbrapa()
+    pelo_csv.carregaFallbackFromArquivoCSV(opcao, subopcao)
+    pelo_html = SiteEmbrapa()
+    conteudo = pagina_sintetica(opcao, subopcao, 2020)
+    rows = pelo_html.webscraping.extrator(conteudo)
+    assert pelo_html.webscraping.validador.classificar(opcao, subopcao, conteudo, rows)[0] == PAGINA_OK
+    pelo_html.carregaRepoFromPaginaWebscraping(opcao, subopcao, 2020, rows)
+    esperados = sorted(map(resumo, pelo_csv.buscarRegistrosDaPagina(opcao, subopcao, 2020)), key=str)
+    assert sorted(map(resumo, pelo_html.buscarRegistrosDaPagina(opcao, subopcao, 2020)), key=str) == esperados
+
+def test_pagina_sintetica_sem_categorias_permite_o_total_da_categoria():
+    site = SiteEmbrapa()
+    subopcao = SUBOPCOES_PROCESSAMENTO[EnumTipoUva_proc.SEMCLASSIFICACAO]
+    conteudo = pagina_sintetica(OPCAO_PROCESSAMENTO, subopcao, 2020)
+    site.carregaRepoFromPaginaWebscraping(OPCAO_PROCESSAMENTO, subopcao, 2020, site.webscraping.extrator(conteudo))
+    pelo_csv = SiteEmbrapa()
+    pelo_csv.carregaFallbackFromArquivoCSV(OPCAO_PROCESSAMENTO, subopcao)
+    total = site.obterProcessamentoTotalDeCategoriaPorAnoTipoUva("Sem classificação", 2020, EnumTipoUva_proc.SEMCLASSIFICACAO)
+    assert total > 0
+    assert total == pelo_csv.obterProcessamentoTotalDeCategoriaPorAnoTipoUva("Sem classificação", 2020, EnumTipoUva_proc.SEMCLASSIFICACAO)
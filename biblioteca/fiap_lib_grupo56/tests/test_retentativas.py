@@ -0,0 +1,86 @@
+import pytest
+import requests
+from site_embrapa.site_embrapa import WebscrapingSiteEmbrapa
+from site_embrapa.cliente_http import ClienteHttp
+from site_embrapa.disjuntor import Disjuntor
+from site_embrapa.limitador import LimitadorRequisicoes
+from site_embrapa.retentativas import PoliticaRetentativas
+from site_embrapa.opcoes import OPCAO_PRODUCAO
+from falsos import ClienteFalso, PAGINA_SEM_DADOS, resposta
+
+def erro_http(status_code: int, cabecalhos: dict = None) -> requests.HTTPError:
+    response = resposta(status_code)
+    response.headers.update(cabecalhos or {})
+    return requests.HTTPError(response=response)
+
+def webscraping_com_retentativas(cliente: ClienteFalso, disjuntor: Disjuntor = None) -> WebscrapingSiteEmbrapa:
+    retentativas = PoliticaRetentativas(max_tentativas=3, espera_inicial=0.001, espera_maxima=0.001)
+    return WebscrapingSiteEmbrapa("http://site.invalido/index.php", cliente_http=cliente, disjuntor=disjuntor,
+                                  limitador=LimitadorRequisicoes(1000, 100), retentativas=retentativas)
+
+def test_erro_temporario_e_recuperado_por_nova_tentativa():
+    disjuntor = Disjuntor(limite_falhas=1)
+    cliente = ClienteFalso(resposta(503), requests.ConnectionError(), resposta(200, PAGINA_SEM_DADOS))
+    scraping = webscraping_com_retentativas(cliente, disjuntor)
+    assert scraping.obterPagina(OPCAO_PRODUCAO, None, 2020) == []
+    assert len(cliente.urls) == 3
+    assert disjuntor.falhas_seguidas == 0
+    metricas = scraping.retentativas.obterMetricas()
+    assert (metricas["retentativas"], metricas["recuperadas"], metricas["esgotadas"]) == (2, 1, 0)
+
+def test_tentativas_esgotadas_contam_uma_falha_no_disjuntor():
+    disjuntor = Disjuntor(limite_falhas=5)
+    cliente = ClienteFalso(requests.Timeout(), requests.Timeout(), requests.Timeout())
+    scraping = webscraping_com_retentativas(cliente, disjuntor)
+    with pytest.raises(requests.Timeout):
+        scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    assert len(cliente.urls) == 3
+    assert disjuntor.falhas_seguidas == 1
+    assert scraping.retentativas.obterMetricas()["esgotadas"] == 1
+
+def test_erro_nao_retentavel_nao_e_repetido():
+    cliente = ClienteFalso(ValueError("resposta ilegível"))
+    scraping = webscraping_com_retentativas(cliente)
+    with pytest.raises(ValueError):
+        scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    assert len(cliente.urls) == 1
+    politica = PoliticaRetentativas()
+    assert politica.esperaAntesDaProxima(1, erro_http(404), 0.0) is None
+    assert politica.obterMetricas()["retentativas"] == 0
+
+def test_espera_exponencial_limitada_pela_espera_maxima():
+    politica = PoliticaRetentativas(max_tentativas=10, espera_inicial=1.0, espera_maxima=3.0, multiplicador=2.0, prazo_total=100)
+    for tentativa, limite in ((1, 1.0), (2, 2.0), (3, 3.0), (6, 3.0)):
+        esperas = [politica.esperaAntesDaProxima(tentativa, requests.ConnectionError(), 0.0) for _ in range(200)]
+        assert all(0 <= espera <= limite for espera in esperas)
+        assert max(esperas) > limite / 2  # jitter: sorteada em todo o intervalo
+
+def test_retry_after_e_prazo_total():
+    politica = PoliticaRetentativas(espera_inicial=0.001, prazo_total=10.0)
+    assert politica.esperaAntesDaProxima(1, erro_http(429, {"Retry-After": "2"}), 0.0) >= 2.0
+    # A espera terminaria depois do prazo total: não há nova tentativa
+    assert politica.esperaAntesDaProxima(1, erro_http(429, {"Retry-After": "2"}), 9.0) is None
+    assert politica.obterMetricas()["esgotadas"] == 1
+
+def test_timeout_de_cada_tentativa_limitado_ao_prazo_restante():
+    cliente = ClienteFalso(requests.ConnectionError(), resposta(200, PAGINA_SEM_DADOS))
+    retentativas = PoliticaRetentativas(max_tentativas=2, espera_inicial=0.05, espera_maxima=0.05, prazo_total=10.0)
+    retentativas.aleatorio.uniform = lambda inicio, fim: fim
+    scraping = WebscrapingSiteEmbrapa("http://site.invalido/index.php", cliente_http=cliente,
+                                      limitador=LimitadorRequisicoes(1000, 100), retentativas=retentativas)
+    assert scraping.obterPagina(OPCAO_PRODUCAO, None, 2020) == []
+    primeira, segunda = cliente.timeouts
+    assert 9.9 < primeira <= 10.0
+    assert segunda <= primeira - 0.05
+
+def test_cliente_http_reduz_os_timeouts_ao_prazo_informado():
+    cliente = ClienteHttp(timeout_conexao=5.0, timeout_leitura=30.0)
+    timeouts = []
+    def get(url, headers=None, timeout=None):
+        timeouts.append(timeout)
+        return resposta(200)
+    cliente.sessao().get = get
+    cliente.get("http://site.invalido/index.php")
+    cliente.get("http://site.invalido/index.php", timeout=12.0)
+    cliente.get("http://site.invalido/index.php", timeout=2.0)
+    assert timeouts == [(5.0, 30.0), (5.0, 12.0), (2.0, 2.0)]
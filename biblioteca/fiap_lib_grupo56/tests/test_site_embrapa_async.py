@@ -0,0 +1,38 @@
+import asyncio
+import threading
+import requests
+from site_embrapa import SiteEmbrapa
+from site_embrapa.site_embrapa_async import SiteEmbrapaAsync
+from site_embrapa.opcoes import OPCAO_EXPORTACAO
+from modelo_dados.origemDados import EnumOrigemDados
+from falsos import ClienteFalso, aguardar_ate, pagina_de_exportacao, resposta, webscraping_falso
+
+VINHOS_DE_MESA = (OPCAO_EXPORTACAO, "subopt_01", 2020)
+
+def test_carga_assincrona_e_sincrona_da_mesma_pagina_fazem_um_webscraping():
+    liberacao = threading.Event()
+    cliente = ClienteFalso(resposta(200, pagina_de_exportacao("subopt_01", 2020)), liberacao=liberacao)
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(cliente)
+    resultados = []
+    sincrona = threading.Thread(target=lambda: resultados.append(site.carregaPaginaFromWebscraping(*VINHOS_DE_MESA)))
+    sincrona.start()
+    aguardar_ate(lambda: len(cliente.urls) == 1)
+    async def carregar():
+        tarefa = asyncio.create_task(SiteEmbrapaAsync(site).carregaPaginas([VINHOS_DE_MESA]))
+        try:
+            await asyncio.to_thread(aguardar_ate, lambda: site.agrupador_requisicoes.obterMetricas()["agrupadas"] == 1)
+        finally:
+            liberacao.set()
+        return await tarefa
+    registros = asyncio.run(carregar())[VINHOS_DE_MESA]
+    sincrona.join()
+    assert len(cliente.urls) == 1
+    assert len(registros) == len(resultados[0]) > 0
+
+def test_falha_do_webscraping_assincrono_chega_ao_fallback():
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(ClienteFalso(requests.ConnectionError()))
+    registros = asyncio.run(SiteEmbrapaAsync(site).carregaPaginas([VINHOS_DE_MESA]))[VINHOS_DE_MESA]
+    assert {registro.origem for registro in registros} == {EnumOrigemDados.CSV}
+    assert site.fallbacks == {"ConnectionError": 1}
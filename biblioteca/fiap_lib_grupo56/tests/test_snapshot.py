@@ -0,0 +1,68 @@
+import os
+import shutil
+import pytest
+from site_embrapa import snapshot
+from site_embrapa.opcoes import OPCAO_PRODUCAO
+
+def copiar_snapshot(tmp_path) -> str:
+    caminho = str(tmp_path / snapshot.ARQUIVO_SNAPSHOT)
+    shutil.copyfile(snapshot.caminho_padrao(), caminho)
+    return caminho
+
+def contar_resumos(monkeypatch) -> list:
+    chamadas = []
+    resumo_csv = snapshot.resumo_csv
+    def contar():
+        chamadas.append(1)
+        return resumo_csv()
+    monkeypatch.setattr(snapshot, "resumo_csv", contar)
+    return chamadas
+
+def test_snapshot_em_cache_e_decodificado_uma_unica_vez(tmp_path, monkeypatch):
+    caminho = copiar_snapshot(tmp_path)
+    chamadas = contar_resumos(monkeypatch)
+    conteudo = snapshot.ler_snapshot_em_cache(caminho)
+    assert snapshot.ler_snapshot_em_cache(caminho) is conteudo
+    assert len(chamadas) == 1
+    assert (OPCAO_PRODUCAO, None) in conteudo
+
+def test_snapshot_em_cache_e_lido_novamente_quando_alterado(tmp_path, monkeypatch):
+    caminho = copiar_snapshot(tmp_path)
+    chamadas = contar_resumos(monkeypatch)
+    conteudo = snapshot.ler_snapshot_em_cache(caminho)
+    estado = os.stat(caminho)
+    os.utime(caminho, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+    assert snapshot.ler_snapshot_em_cache(caminho) is not conteudo
+    assert len(chamadas) == 2
+
+def test_snapshot_em_cache_inexistente_e_invalido(tmp_path):
+    with pytest.raises(snapshot.SnapshotInvalido):
+        snapshot.ler_snapshot_em_cache(str(tmp_path / "inexistente.snapshot"))
+
+def test_snapshot_serializado_e_lido_de_volta(tmp_path):
+    conteudo = {(OPCAO_PRODUCAO, None): ((2020,), [("VINHO DE MESA", "Tinto", (10,))])}
+    caminho = snapshot.gravar_snapshot(str(tmp_path / snapshot.ARQUIVO_SNAPSHOT), conteudo)
+    assert snapshot.ler_snapshot(caminho) == conteudo
+
+def test_snapshot_empacotado_corresponde_aos_arquivos_csv():
+    assert snapshot.ler_snapshot() == snapshot.gerar_conteudo()
+
+def test_snapshot_de_outros_arquivos_csv_e_desatualizado():
+    dados = snapshot.serializar({}, bytes(snapshot.TAMANHO_RESUMO))
+    with pytest.raises(snapshot.SnapshotDesatualizado):
+        snapshot.desserializar(dados, snapshot.resumo_csv())
+    assert snapshot.desserializar(dados) == {}
+
+def test_snapshot_corrompido_e_invalido():
+    dados = snapshot.serializar({}, snapshot.resumo_csv())
+    with pytest.raises(snapshot.SnapshotInvalido):
+        snapshot.desserializar(b"outro arquivo")
+    with pytest.raises(snapshot.SnapshotInvalido):
+        snapshot.desserializar(dados[:-4] + b"xxxx")
+
+def test_snapshot_invalido_e_regerado_a_partir_dos_arquivos_csv(tmp_path):
+    caminho = tmp_path / snapshot.ARQUIVO_SNAPSHOT
+    caminho.write_bytes(b"outro arquivo")
+    conteudo = snapshot.ler_ou_regerar_snapshot(str(caminho))
+    assert conteudo == snapshot.gerar_conteudo()
+    assert snapshot.ler_snapshot(str(caminho)) == conteudo
@@ -0,0 +1,61 @@
+import pytest
+from site_embrapa.site_embrapa import SiteEmbrapa
+from site_embrapa.cache_html import CacheHtml
+from site_embrapa.disjuntor import Disjuntor
+from site_embrapa.validacao_pagina import ValidadorPaginas, PaginaInvalida, PAGINA_OK, PAGINA_VAZIA, PAGINA_QUEBRADA
+from site_embrapa.opcoes import OPCAO_PRODUCAO, OPCAO_EXPORTACAO
+from modelo_dados.importacaoExportacao import EnumCategoria_im_ex
+from modelo_dados.origemDados import EnumOrigemDados
+from falsos import ClienteFalso, PAGINA_SEM_DADOS, pagina_de_exportacao, resposta, webscraping_falso
+
+PAGINA_DE_MANUTENCAO = b"<html><body><h1>Site em manuten\xc3\xa7\xc3\xa3o</h1></body></html>"
+
+def tabela(tr: str, fechada: bool = True) -> bytes:
+    return f'<html><body><table class="tb_base tb_dados"><tbody>{tr}</tbody>{"</table>" if fechada else ""}'.encode("utf-8")
+
+def classificar(opcao: str, subopcao: str, conteudo: bytes) -> str:
+    validador = ValidadorPaginas()
+    linhas = webscraping_falso(ClienteFalso()).extrator(conteudo)
+    return validador.classificar(opcao, subopcao, conteudo, linhas)
+
+def test_classificacao_das_paginas():
+    completa = pagina_de_exportacao("subopt_01", 2020)
+    assert classificar(OPCAO_EXPORTACAO, "subopt_01", completa) == (PAGINA_OK, None)
+    assert classificar(OPCAO_PRODUCAO, None, PAGINA_SEM_DADOS) == (PAGINA_VAZIA, None)
+    assert classificar(OPCAO_PRODUCAO, None, PAGINA_DE_MANUTENCAO) == (PAGINA_QUEBRADA, "tabela de dados ausente")
+    # Resposta truncada no meio da tabela
+    assert classificar(OPCAO_EXPORTACAO, "subopt_01", completa[:len(completa) // 2]) == (PAGINA_QUEBRADA, "tabela de dados incompleta")
+
+def test_linhas_fora_do_layout_ou_insuficientes_quebram_a_pagina():
+    # Layout alterado: uma célula a mais, ou linhas sem as classes de categoria e item
+    classificacao, motivo = classificar(OPCAO_PRODUCAO, None, tabela('<tr><td class="tb_item">VINHO</td><td>1</td><td>2</td></tr>'))
+    assert classificacao == PAGINA_QUEBRADA and "3 células" in motivo
+    classificacao, motivo = classificar(OPCAO_PRODUCAO, None, tabela("<tr><td>VINHO</td><td>1</td></tr>"))
+    assert classificacao == PAGINA_QUEBRADA and "tb_item ou tb_subitem" in motivo
+    # Resposta parcial: bem menos linhas que o arquivo .CSV da página
+    classificacao, motivo = classificar(OPCAO_PRODUCAO, None, tabela('<tr><td class="tb_item">VINHO</td><td>1</td></tr>'))
+    assert classificacao == PAGINA_QUEBRADA and motivo.startswith("1 linhas")
+
+def test_pagina_quebrada_nao_e_gravada_no_cache_e_conta_falha_no_disjuntor(tmp_path):
+    disjuntor = Disjuntor(limite_falhas=5)
+    scraping = webscraping_falso(ClienteFalso(resposta(200, PAGINA_DE_MANUTENCAO), resposta(200, PAGINA_SEM_DADOS)), disjuntor)
+    scraping.cache_html = CacheHtml(str(tmp_path))
+    with pytest.raises(PaginaInvalida):
+        scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    assert scraping.cache_html.listar() == []
+    assert disjuntor.falhas_seguidas == 1
+    # Página vazia (ano sem dados) é válida e vai para o cache
+    assert scraping.obterPagina(OPCAO_PRODUCAO, None, 2021) == []
+    assert scraping.cache_html.listar() == [(OPCAO_PRODUCAO, None, 2021)]
+    assert disjuntor.falhas_seguidas == 0
+    metricas = scraping.validador.obterMetricas()
+    assert (metricas[PAGINA_QUEBRADA], metricas[PAGINA_VAZIA]) == (1, 1)
+    assert "tabela de dados ausente" in metricas["ultimo_motivo"]
+
+def test_pagina_quebrada_usa_o_fallback_do_arquivo_csv():
+    site = SiteEmbrapa()
+    site.webscraping = webscraping_falso(ClienteFalso(resposta(200, PAGINA_DE_MANUTENCAO)))
+    exportacoes = site.obterExportacaoPorAnoCategoria(2020, EnumCategoria_im_ex.VINHOSDEMESA)
+    assert len(exportacoes) > 0
+    assert {exportacao.origem for exportacao in exportacoes} == {EnumOrigemDados.CSV}
+    assert site.obterMetricas()["fallback_csv"] == {"PaginaInvalida": 1}
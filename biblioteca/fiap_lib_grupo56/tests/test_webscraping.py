@@ -0,0 +1,39 @@
+import pytest
+import requests
+from site_embrapa.disjuntor import Disjuntor, DisjuntorAberto, ESTADO_ABERTO, ESTADO_FECHADO
+from site_embrapa.validacao_pagina import PaginaInvalida
+from site_embrapa.opcoes import OPCAO_PRODUCAO
+from falsos import ClienteFalso, PAGINA_SEM_DADOS, resposta, webscraping_falso
+
+def test_pagina_sem_dados():
+    scraping = webscraping_falso(ClienteFalso(resposta(200, PAGINA_SEM_DADOS)), Disjuntor())
+    assert scraping.obterPagina(OPCAO_PRODUCAO, None, 2020) == []
+
+def test_disjuntor_abre_apos_falhas_seguidas():
+    disjuntor = Disjuntor(limite_falhas=2, intervalo_teste=60)
+    scraping = webscraping_falso(ClienteFalso(requests.ConnectionError(), requests.ConnectionError()), disjuntor)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    with pytest.raises(DisjuntorAberto):
+        scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    assert disjuntor.estado == ESTADO_ABERTO
+
+def test_extrator_com_falha_na_requisicao_de_teste_reabre_o_disjuntor():
+    def extrator(conteudo):
+        if conteudo != PAGINA_SEM_DADOS:
+            raise UnicodeDecodeError("utf-8", conteudo, 0, 1, "byte inválido")
+        return []
+    disjuntor = Disjuntor(limite_falhas=1, intervalo_teste=0)
+    cliente = ClienteFalso(requests.ConnectionError(), resposta(200, b"\xff"), resposta(200, PAGINA_SEM_DADOS))
+    scraping = webscraping_falso(cliente, disjuntor, extrator)
+    with pytest.raises(requests.ConnectionError):
+        scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    assert disjuntor.estado == ESTADO_ABERTO
+    # Requisição de teste (disjuntor semiaberto): a falha do extrator volta a abrir o disjuntor
+    with pytest.raises(PaginaInvalida):
+        scraping.obterPagina(OPCAO_PRODUCAO, None, 2020)
+    assert disjuntor.estado == ESTADO_ABERTO
+    # Nova requisição de teste, agora com sucesso
+    assert scraping.obterPagina(OPCAO_PRODUCAO, None, 2020) == []
+    assert disjuntor.estado == ESTADO_FECHADO